@@ -1,27 +1,107 @@
 """
 Database configuration for SQLite
 """
+import hashlib
 import os
-from sqlalchemy import create_engine
+import time
+from typing import Dict, Optional
+
+from fastapi import Request
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, declarative_base
 
 # Default to SQLite if no env var is provided
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./marketplace.db")
+# Optional read-only replica for safe GET endpoints (see get_read_db)
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL")
+# After a client commits, its reads stay on the primary this long (replica lag budget)
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+
+
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    # SQLite ignores FOREIGN KEY clauses (incl. ON DELETE CASCADE) unless enabled per connection
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+def _create_engine(url: str):
+    # Only need check_same_thread for SQLite
+    if url.startswith("sqlite"):
+        sqlite_engine = create_engine(url, connect_args={"check_same_thread": False})
+        event.listen(sqlite_engine, "connect", _enable_sqlite_foreign_keys)
+        return sqlite_engine
+    return create_engine(url)
+
 
-# Only need check_same_thread for SQLite
-if DATABASE_URL.startswith("sqlite"):
-    engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
-else:
-    engine = create_engine(DATABASE_URL)
+engine = _create_engine(DATABASE_URL)
+read_engine = _create_engine(DATABASE_READ_URL) if DATABASE_READ_URL else engine
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 
 Base = declarative_base()
 
+# Client key -> time until which that client's reads go to the primary.
+# Kept per process: with several workers a client may still hit a stale
+# replica on another worker, at most for the replica's lag.
+_primary_until: Dict[str, float] = {}
+
+
+def _client_key(request: Request) -> Optional[str]:
+    """Requests carrying the same Authorization header belong to one client"""
+    authorization = request.headers.get("authorization")
+    if not authorization:
+        return None
+    return hashlib.sha256(authorization.encode()).hexdigest()
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _stick_to_primary(session):
+    key = session.info.get("client_key")
+    if key:
+        now = time.time()
+        if len(_primary_until) > 10000:
+            for stale in [k for k, until in _primary_until.items() if until < now]:
+                del _primary_until[stale]
+        _primary_until[key] = now + READ_YOUR_WRITES_SECONDS
+
 
-def get_db():
-    """Dependency to get database session"""
+def read_session_factory(request: Request) -> sessionmaker:
+    """
+    Session factory for a read-only request: the replica, unless none is
+    configured or this client committed a write within READ_YOUR_WRITES_SECONDS
+    """
+    if read_engine is engine:
+        return SessionLocal
+    key = _client_key(request)
+    if key and _primary_until.get(key, 0) > time.time():
+        return SessionLocal
+    return ReadSessionLocal
+
+
+def primary_session(request: Request):
+    """Primary session for this client outside a dependency (e.g. a streamed import job); caller closes it"""
     db = SessionLocal()
+    db.info["client_key"] = _client_key(request)
+    return db
+
+
+def get_db(request: Request):
+    """Dependency to get database session (primary)"""
+    db = primary_session(request)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_read_db(request: Request):
+    """
+    Dependency for safe GET endpoints that never write: routed to
+    DATABASE_READ_URL when set, with read-your-writes stickiness
+    """
+    db = read_session_factory(request)()
     try:
         yield db
     finally:
@@ -1,10 +1,14 @@
 """
 FastAPI Main Application
 """
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from .database import Base, engine
+from .scheduler import start_scheduler, stop_scheduler
+from .services.catalog_search_service import CatalogSearchService
 from .routers import (
     auth_router,
     materials_router,
@@ -21,18 +25,33 @@ from .routers import (
     ads_router,
     decision_router,
     extra_costs_router,
-    imports_router
+    imports_router,
+    exports_router,
+    analytics_router,
+    dashboard_router,
+    rankings_router
 )
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
+CatalogSearchService.install_on_startup(engine)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Nightly re-grading runs alongside the API"""
+    start_scheduler()
+    yield
+    stop_scheduler()
+
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Marketplace Tool API",
     description="API untuk HPP, Pricing, Ads Analysis, Reverse Pricing, dan Grading",
     version="1.0.0",
-    root_path="/api"
+    root_path="/api",
+    lifespan=lifespan
 )
 
 # CORS middleware for frontend
@@ -66,6 +85,10 @@ app.include_router(ads_router)
 app.include_router(decision_router)
 app.include_router(extra_costs_router)
 app.include_router(imports_router)
+app.include_router(exports_router)
+app.include_router(analytics_router)
+app.include_router(dashboard_router)
+app.include_router(rankings_router)
 
 
 @app.get("/")
@@ -12,10 +12,15 @@ from .discount import Discount
 from .marketplace_cost_type import MarketplaceCostType
 from .store_product_marketplace_cost import StoreProductMarketplaceCost
 from .ad import Ad
+from .ad_keyword import AdTerm, AdKeywordFact
 from .product_extra_cost import ProductExtraCost
 from .store_performance import StorePerformance, SalesReport
 
 from .product_performance import ProductPerformance
+from .report_archive import ReportArchive
+from .price_history import MaterialPriceHistory, ProductExtraCostHistory
+from .listing_economics import ListingEconomics
+from .grade_snapshot import GradeSnapshot
 
 __all__ = [
     "User",
@@ -29,8 +34,15 @@ __all__ = [
     "MarketplaceCostType",
     "StoreProductMarketplaceCost",
     "Ad",
+    "AdTerm",
+    "AdKeywordFact",
     "ProductExtraCost",
     "StorePerformance",
     "ProductPerformance",
-    "SalesReport"
+    "SalesReport",
+    "ReportArchive",
+    "MaterialPriceHistory",
+    "ProductExtraCostHistory",
+    "ListingEconomics",
+    "GradeSnapshot"
 ]
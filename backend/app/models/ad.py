@@ -1,9 +1,26 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, ForeignKeyConstraint
+from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey, ForeignKeyConstraint, Index, and_, func, true
 from sqlalchemy.orm import relationship
 from ..database import Base
 
 
-class Ad(Base):
+class AdPeriodMixin:
+    """Report period columns start_date / end_date with the overlap filter"""
+
+    @classmethod
+    def overlapping(cls, date_from=None, date_to=None):
+        """
+        Filter condition: ad period overlaps [date_from, date_to] (both inclusive, either optional).
+        Ads without a period never match a bounded window.
+        """
+        conditions = []
+        if date_to:
+            conditions.append(cls.start_date <= date_to)
+        if date_from:
+            conditions.append(func.coalesce(cls.end_date, cls.start_date) >= date_from)
+        return and_(true(), *conditions)
+
+
+class Ad(AdPeriodMixin, Base):
     __tablename__ = "ads"
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
@@ -23,15 +40,21 @@ class Ad(Base):
     items_sold = Column(Integer, default=0)
     
     # Metadata
-    start_date = Column(String, nullable=True) # Stored as YYYY-MM-DD
-    end_date = Column(String, nullable=True)   # Stored as YYYY-MM-DD
+    start_date = Column(Date, nullable=True)  # Report period
+    end_date = Column(Date, nullable=True)
     
     total_sales = Column(Integer, nullable=True, default=0)  # Total sales (organic + ads) for TACoS
+    report_id = Column(Integer, ForeignKey('sales_reports.id'), nullable=True, index=True)  # Source import (SalesReport)
 
     __table_args__ = (
-        ForeignKeyConstraint(['store_id', 'user_id'], ['stores.id', 'stores.user_id']),
-        ForeignKeyConstraint(['product_id', 'user_id'], ['products.id', 'products.user_id']),
+        ForeignKeyConstraint(['store_id', 'user_id'], ['stores.id', 'stores.user_id'], ondelete='CASCADE'),
+        ForeignKeyConstraint(['product_id', 'user_id'], ['products.id', 'products.user_id'], ondelete='CASCADE'),
         ForeignKeyConstraint(['user_id'], ['users.id']),
+        # Period range lookups per store (overlap filters, analytics) and per product (decision)
+        Index('ix_ads_store_period', 'user_id', 'store_id', 'start_date', 'end_date'),
+        Index('ix_ads_product_period', 'user_id', 'product_id', 'start_date'),
+        # Covering index for rankings: GROUP BY listing reads only the index (keywords: ad_keyword_facts)
+        Index('ix_ads_listing_totals', 'user_id', 'store_id', 'product_id', 'start_date', 'end_date', 'spend', 'gmv', 'orders'),
     )
 
     # Relationships
@@ -0,0 +1,66 @@
+from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey, ForeignKeyConstraint, Index, UniqueConstraint
+from ..database import Base
+from .ad import AdPeriodMixin
+
+
+class AdTerm(Base):
+    """
+    Dictionary of ads report strings per user (keyword, placement, campaign),
+    so keyword facts store and group by integer keys instead of free text.
+    """
+    __tablename__ = "ad_terms"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    user_id = Column(Integer, nullable=False)
+    kind = Column(String(16), nullable=False)  # keyword | placement | campaign
+    value = Column(String, nullable=False)
+
+    __table_args__ = (
+        ForeignKeyConstraint(['user_id'], ['users.id']),
+        UniqueConstraint('user_id', 'kind', 'value', name='uq_ad_terms_value'),
+    )
+
+
+class AdKeywordFact(AdPeriodMixin, Base):
+    """
+    One keyword/placement row of a single-product Shopee ads report with all
+    its measures. Belongs to the Ad row imported from the same line (deleted
+    with it); store, product and period are copied so per-keyword totals
+    read this table only.
+    """
+    __tablename__ = "ad_keyword_facts"
+
+    ad_id = Column(Integer, ForeignKey('ads.id', ondelete='CASCADE'), primary_key=True, autoincrement=False)
+    user_id = Column(Integer, nullable=False)
+    store_id = Column(String, nullable=False)
+    product_id = Column(String, nullable=False)
+    start_date = Column(Date, nullable=True)
+    end_date = Column(Date, nullable=True)
+
+    keyword_id = Column(Integer, ForeignKey('ad_terms.id'), nullable=False)
+    placement_id = Column(Integer, ForeignKey('ad_terms.id'), nullable=True)
+    campaign_id = Column(Integer, ForeignKey('ad_terms.id'), nullable=True)
+    match_type = Column(String(32), nullable=True)  # Tipe Pencocokan
+    bidding_mode = Column(String(32), nullable=True)  # Mode Bidding
+    position = Column(Integer, nullable=True)  # Urutan in the report
+    avg_rank = Column(Float, nullable=True)  # Rata-rata Peringkat Iklan
+
+    impressions = Column(Integer, nullable=False, default=0)
+    clicks = Column(Integer, nullable=False, default=0)
+    orders = Column(Integer, nullable=False, default=0)
+    direct_orders = Column(Integer, nullable=True)
+    items_sold = Column(Integer, nullable=False, default=0)
+    direct_items_sold = Column(Integer, nullable=True)
+    gmv = Column(Integer, nullable=False, default=0)
+    direct_gmv = Column(Integer, nullable=True)
+    spend = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        ForeignKeyConstraint(['user_id'], ['users.id']),
+        # Keyword rankings: GROUP BY keyword_id reads only the index
+        Index(
+            'ix_ad_keyword_facts_totals', 'user_id', 'keyword_id', 'product_id', 'start_date', 'end_date',
+            'spend', 'gmv', 'orders', 'impressions', 'clicks', 'direct_gmv'
+        ),
+        Index('ix_ad_keyword_facts_store_period', 'user_id', 'store_id', 'start_date'),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, ForeignKeyConstraint
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, ForeignKeyConstraint, CheckConstraint, Index
 from sqlalchemy.orm import relationship
 from ..database import Base
 
@@ -9,15 +9,31 @@ class BOM(Base):
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     user_id = Column(Integer, nullable=False)
     product_id = Column(String, nullable=False)
-    material_id = Column(String, nullable=False)
+    # A line uses either a raw material or another product (sub-assembly)
+    material_id = Column(String, nullable=True)
+    component_product_id = Column(String, nullable=True)
     qty = Column(Float, nullable=False)
 
     __table_args__ = (
-        ForeignKeyConstraint(['product_id', 'user_id'], ['products.id', 'products.user_id']),
+        ForeignKeyConstraint(['product_id', 'user_id'], ['products.id', 'products.user_id'], ondelete='CASCADE'),
         ForeignKeyConstraint(['material_id', 'user_id'], ['materials.id', 'materials.user_id']),
+        ForeignKeyConstraint(['component_product_id', 'user_id'], ['products.id', 'products.user_id']),
         ForeignKeyConstraint(['user_id'], ['users.id']),
+        CheckConstraint(
+            '(material_id IS NULL) <> (component_product_id IS NULL)',
+            name='ck_bom_material_or_component'
+        ),
+        # Lines of a product (HPP, dashboard setup health, ON DELETE CASCADE)
+        Index('ix_bom_product_id', 'user_id', 'product_id'),
+        Index('ix_bom_component_product_id', 'user_id', 'component_product_id'),
+        # Reverse index material -> products for price impact analysis
+        Index('ix_bom_material_id', 'user_id', 'material_id'),
     )
 
     # Relationships
-    product = relationship("Product", back_populates="bom_items")
-    material = relationship("Material", back_populates="bom_items")
+    product = relationship("Product", back_populates="bom_items", foreign_keys=[product_id, user_id])
+    material = relationship("Material", back_populates="bom_items", overlaps="bom_items,product")
+    component_product = relationship(
+        "Product", back_populates="used_in_bom", foreign_keys=[component_product_id, user_id],
+        overlaps="bom_items,material,product"
+    )
@@ -8,7 +8,7 @@ class Discount(Base):
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    store_product_id = Column(Integer, ForeignKey("store_products.id"), nullable=False)
+    store_product_id = Column(Integer, ForeignKey("store_products.id", ondelete="CASCADE"), nullable=False)
     discount_type = Column(String, nullable=False)  # 'percent' atau 'fixed'
     value = Column(Float, nullable=False)
 
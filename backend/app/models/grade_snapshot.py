@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, String, Float, Date, ForeignKeyConstraint, Index, UniqueConstraint
+from ..database import Base
+
+
+class GradeSnapshot(Base):
+    """
+    Daily grade of one listing, written by the nightly re-grading job.
+    store_product_id has no FK so the trend survives the listing.
+    """
+    __tablename__ = "grade_snapshots"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    user_id = Column(Integer, nullable=False)
+    store_product_id = Column(Integer, nullable=False)
+    store_id = Column(String, nullable=False)
+    product_id = Column(String, nullable=False)
+    snapshot_date = Column(Date, nullable=False)
+    grade = Column(String(16), nullable=False)
+    margin_percent = Column(Float, nullable=False)
+    roas = Column(Float, nullable=True)  # NULL without ads data
+    profit_per_order = Column(Float, nullable=False)
+
+    __table_args__ = (
+        ForeignKeyConstraint(['user_id'], ['users.id']),
+        UniqueConstraint('user_id', 'store_product_id', 'snapshot_date', name='uq_grade_snapshots_listing_date'),
+        Index('ix_grade_snapshots_trend', 'user_id', 'store_id', 'product_id', 'snapshot_date'),
+    )
@@ -0,0 +1,38 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKeyConstraint, Index
+from ..database import Base
+
+
+class ListingEconomics(Base):
+    """
+    Read model: forward pricing of one store product, kept current by
+    ListingEconomicsService whenever an input (listing, discount, fee, cost
+    type, BOM, material, extra cost) is committed.
+    store_product_id has no FK so the row can be dropped after its listing.
+    """
+    __tablename__ = "listing_economics"
+
+    store_product_id = Column(Integer, primary_key=True, autoincrement=False)
+    user_id = Column(Integer, nullable=False)
+    store_id = Column(String, nullable=False)
+    product_id = Column(String, nullable=False)
+    harga_jual = Column(Integer, nullable=False)
+    total_diskon = Column(Float, nullable=False)
+    harga_setelah_diskon = Column(Float, nullable=False)
+    fee_percent = Column(Float, nullable=False)  # Rupiah from percent fees
+    fee_fixed = Column(Float, nullable=False)
+    total_biaya_marketplace = Column(Float, nullable=False)
+    hpp = Column(Float, nullable=False)
+    profit_per_order = Column(Float, nullable=False)
+    margin_percent = Column(Float, nullable=False)
+    break_even_roas = Column(Float)  # NULL when profit_per_order <= 0
+    max_cpa = Column(Float, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        ForeignKeyConstraint(['user_id'], ['users.id']),
+        Index('ix_listing_economics_store', 'user_id', 'store_id'),
+        Index('ix_listing_economics_product', 'user_id', 'product_id'),
+        # Rankings: ORDER BY ... LIMIT walks these instead of sorting
+        Index('ix_listing_economics_margin', 'user_id', 'margin_percent'),
+        Index('ix_listing_economics_profit', 'user_id', 'profit_per_order'),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Float, ForeignKey
+from sqlalchemy import Column, String, Integer, Float, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from ..database import Base
 
@@ -14,6 +14,12 @@ class Material(Base):
     harga_satuan = Column(Float, nullable=False)  # Computed: harga_total / jumlah_unit
     satuan = Column(String, nullable=False)
 
+    __table_args__ = (
+        # Catalog listing/search ordered by name (substring matching: see CatalogSearchService)
+        Index('ix_materials_user_nama', 'user_id', 'nama'),
+    )
+
     # Relationships
     user = relationship("User", back_populates="materials")
     bom_items = relationship("BOM", back_populates="material", overlaps="bom_items")
+    price_history = relationship("MaterialPriceHistory", back_populates="material", cascade="all, delete-orphan", passive_deletes=True)
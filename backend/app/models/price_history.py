@@ -0,0 +1,50 @@
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, ForeignKeyConstraint, Index
+from sqlalchemy.orm import relationship
+from ..database import Base
+
+
+class MaterialPriceHistory(Base):
+    """Effective-dated material prices; the row with the latest effective_from <= a date is in force then"""
+    __tablename__ = "material_price_history"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    user_id = Column(Integer, nullable=False)
+    material_id = Column(String, nullable=False)
+    harga_total = Column(Integer, nullable=False)
+    jumlah_unit = Column(Float, nullable=False)
+    harga_satuan = Column(Float, nullable=False)
+    effective_from = Column(Date, nullable=False)
+    recorded_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        ForeignKeyConstraint(['material_id', 'user_id'], ['materials.id', 'materials.user_id'], ondelete='CASCADE'),
+        ForeignKeyConstraint(['user_id'], ['users.id']),
+        Index('ix_material_price_history_lookup', 'user_id', 'material_id', 'effective_from'),
+    )
+
+    material = relationship("Material", back_populates="price_history")
+
+
+class ProductExtraCostHistory(Base):
+    """
+    Effective-dated values of one ProductExtraCost row.
+    extra_cost_id has no FK so history outlives the cost; deletion is recorded as value 0.
+    """
+    __tablename__ = "product_extra_cost_history"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    user_id = Column(Integer, nullable=False)
+    product_id = Column(String, nullable=False)
+    extra_cost_id = Column(Integer, nullable=False)
+    label = Column(String, nullable=False)
+    value = Column(Float, nullable=False)
+    effective_from = Column(Date, nullable=False)
+    recorded_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        ForeignKeyConstraint(['product_id', 'user_id'], ['products.id', 'products.user_id'], ondelete='CASCADE'),
+        ForeignKeyConstraint(['user_id'], ['users.id']),
+        Index('ix_product_extra_cost_history_lookup', 'user_id', 'product_id', 'extra_cost_id', 'effective_from'),
+    )
+
+    product = relationship("Product", back_populates="extra_cost_history")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, ForeignKey
+from sqlalchemy import Column, String, Integer, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from ..database import Base
 
@@ -10,9 +10,22 @@ class Product(Base):
     user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
     nama = Column(String, nullable=False)
 
+    __table_args__ = (
+        # Catalog listing/search ordered by name (substring matching: see CatalogSearchService)
+        Index('ix_products_user_nama', 'user_id', 'nama'),
+    )
+
     # Relationships
     user = relationship("User", back_populates="products")
-    bom_items = relationship("BOM", back_populates="product", cascade="all, delete-orphan", overlaps="bom_items")
-    store_products = relationship("StoreProduct", back_populates="product", cascade="all, delete-orphan", overlaps="store_products")
-    ads = relationship("Ad", back_populates="product", cascade="all, delete-orphan", overlaps="ads")
-    extra_costs = relationship("ProductExtraCost", back_populates="product", cascade="all, delete-orphan")
+    bom_items = relationship(
+        "BOM", back_populates="product", cascade="all, delete-orphan", passive_deletes=True, overlaps="bom_items",
+        foreign_keys="[BOM.product_id, BOM.user_id]"
+    )
+    used_in_bom = relationship(
+        "BOM", back_populates="component_product", overlaps="bom_items",
+        foreign_keys="[BOM.component_product_id, BOM.user_id]"
+    )
+    store_products = relationship("StoreProduct", back_populates="product", cascade="all, delete-orphan", passive_deletes=True, overlaps="store_products")
+    ads = relationship("Ad", back_populates="product", cascade="all, delete-orphan", passive_deletes=True, overlaps="ads")
+    extra_costs = relationship("ProductExtraCost", back_populates="product", cascade="all, delete-orphan", passive_deletes=True)
+    extra_cost_history = relationship("ProductExtraCostHistory", back_populates="product", cascade="all, delete-orphan", passive_deletes=True)
@@ -13,7 +13,7 @@ class ProductExtraCost(Base):
     value = Column(Float, nullable=False)
 
     __table_args__ = (
-        ForeignKeyConstraint(['product_id', 'user_id'], ['products.id', 'products.user_id']),
+        ForeignKeyConstraint(['product_id', 'user_id'], ['products.id', 'products.user_id'], ondelete='CASCADE'),
         ForeignKeyConstraint(['user_id'], ['users.id']),
     )
 
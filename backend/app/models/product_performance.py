@@ -16,10 +16,11 @@ class ProductPerformance(Base):
     orders = Column(Integer, default=0)
     revenue = Column(Float, default=0.0)
     conversion_rate = Column(Float, default=0.0)
+    report_id = Column(Integer, ForeignKey('sales_reports.id'), nullable=True, index=True)  # Import that last wrote this row
 
     __table_args__ = (
-        ForeignKeyConstraint(['product_id', 'user_id'], ['products.id', 'products.user_id']),
-        ForeignKeyConstraint(['store_id', 'user_id'], ['stores.id', 'stores.user_id']),
+        ForeignKeyConstraint(['product_id', 'user_id'], ['products.id', 'products.user_id'], ondelete='CASCADE'),
+        ForeignKeyConstraint(['store_id', 'user_id'], ['stores.id', 'stores.user_id'], ondelete='CASCADE'),
         ForeignKeyConstraint(['user_id'], ['users.id']),
     )
 
@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKeyConstraint, UniqueConstraint
+from sqlalchemy.orm import relationship
+from ..database import Base
+
+
+class ReportArchive(Base):
+    """Catalog of raw uploaded reports kept as Parquet files (see ReportArchiveService)"""
+    __tablename__ = "report_archives"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    user_id = Column(Integer, nullable=False)
+    store_id = Column(String, nullable=False)
+    report_type = Column(String, nullable=False)  # 'shopee_ads', 'shopee_sales', 'shopee_products'
+    file_hash = Column(String, nullable=False)    # sha256 of the uploaded file
+    filename = Column(String, nullable=False)
+    path = Column(String, nullable=False)         # relative to REPORT_ARCHIVE_DIR
+    row_count = Column(Integer, default=0)
+    column_count = Column(Integer, default=0)
+    size_bytes = Column(Integer, default=0)
+    report_metadata = Column(Text, nullable=True)  # JSON: values read above the table (period, product)
+    archived_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        ForeignKeyConstraint(['store_id', 'user_id'], ['stores.id', 'stores.user_id'], ondelete='CASCADE'),
+        ForeignKeyConstraint(['user_id'], ['users.id']),
+        UniqueConstraint('user_id', 'report_type', 'file_hash'),
+    )
+
+    store = relationship("Store")
@@ -18,6 +18,6 @@ class Store(Base):
     # Relationships
     user = relationship("User", back_populates="stores")
     marketplace = relationship("Marketplace", back_populates="stores")
-    store_products = relationship("StoreProduct", back_populates="store", cascade="all, delete-orphan", overlaps="store_products")
-    ads = relationship("Ad", back_populates="store", cascade="all, delete-orphan", overlaps="ads")
-    performances = relationship("StorePerformance", back_populates="store", cascade="all, delete-orphan")
+    store_products = relationship("StoreProduct", back_populates="store", cascade="all, delete-orphan", passive_deletes=True, overlaps="store_products")
+    ads = relationship("Ad", back_populates="store", cascade="all, delete-orphan", passive_deletes=True, overlaps="ads")
+    performances = relationship("StorePerformance", back_populates="store", cascade="all, delete-orphan", passive_deletes=True)
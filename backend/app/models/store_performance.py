@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey, ForeignKeyConstraint
+from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey, ForeignKeyConstraint, Index
 from sqlalchemy.orm import relationship
 from ..database import Base
 
@@ -16,10 +16,13 @@ class StorePerformance(Base):
     gross_revenue = Column(Float, default=0.0)
     conversion_rate = Column(Float, default=0.0)
     avg_order_value = Column(Float, default=0.0)
+    report_id = Column(Integer, ForeignKey('sales_reports.id'), nullable=True, index=True)  # Import that last wrote this row
 
     __table_args__ = (
-        ForeignKeyConstraint(['store_id', 'user_id'], ['stores.id', 'stores.user_id']),
+        ForeignKeyConstraint(['store_id', 'user_id'], ['stores.id', 'stores.user_id'], ondelete='CASCADE'),
         ForeignKeyConstraint(['user_id'], ['users.id']),
+        # Period totals across stores (dashboard)
+        Index('ix_store_performances_user_date', 'user_id', 'date'),
     )
 
     # Relationships
@@ -32,16 +35,18 @@ class SalesReport(Base):
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     user_id = Column(Integer, nullable=False)
     store_id = Column(String, nullable=False)
+    report_type = Column(String, nullable=False, default="shopee_sales")  # 'shopee_sales', 'shopee_products', 'shopee_ads'
     filename = Column(String, nullable=False)
     file_hash = Column(String, nullable=False)
     period_start = Column(Date, nullable=False)
     period_end = Column(Date, nullable=False)
+    # Totals of the linked rows: revenue for sales/product reports, ads GMV for ads reports
     total_gross = Column(Float, default=0.0)
     total_net = Column(Float, default=0.0)
     upload_date = Column(Date, nullable=False)
 
     __table_args__ = (
-        ForeignKeyConstraint(['store_id', 'user_id'], ['stores.id', 'stores.user_id']),
+        ForeignKeyConstraint(['store_id', 'user_id'], ['stores.id', 'stores.user_id'], ondelete='CASCADE'),
         ForeignKeyConstraint(['user_id'], ['users.id']),
     )
 
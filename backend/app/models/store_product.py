@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, ForeignKeyConstraint, UniqueConstraint
+from sqlalchemy import Column, Integer, String, ForeignKey, ForeignKeyConstraint, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from ..database import Base
 
@@ -13,14 +13,15 @@ class StoreProduct(Base):
     harga_jual = Column(Integer, nullable=False)
 
     __table_args__ = (
-        ForeignKeyConstraint(['store_id', 'user_id'], ['stores.id', 'stores.user_id']),
-        ForeignKeyConstraint(['product_id', 'user_id'], ['products.id', 'products.user_id']),
+        ForeignKeyConstraint(['store_id', 'user_id'], ['stores.id', 'stores.user_id'], ondelete='CASCADE'),
+        ForeignKeyConstraint(['product_id', 'user_id'], ['products.id', 'products.user_id'], ondelete='CASCADE'),
         ForeignKeyConstraint(['user_id'], ['users.id']),
         UniqueConstraint('id', 'user_id'),
+        Index('ix_store_products_product_id', 'user_id', 'product_id'),
     )
 
     # Relationships
     store = relationship("Store", back_populates="store_products")
     product = relationship("Product", back_populates="store_products")
-    discounts = relationship("Discount", back_populates="store_product", cascade="all, delete-orphan")
-    marketplace_costs = relationship("StoreProductMarketplaceCost", back_populates="store_product", cascade="all, delete-orphan")
+    discounts = relationship("Discount", back_populates="store_product", cascade="all, delete-orphan", passive_deletes=True)
+    marketplace_costs = relationship("StoreProductMarketplaceCost", back_populates="store_product", cascade="all, delete-orphan", passive_deletes=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, ForeignKeyConstraint
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, ForeignKeyConstraint, Index
 from sqlalchemy.orm import relationship
 from ..database import Base
 
@@ -13,9 +13,11 @@ class StoreProductMarketplaceCost(Base):
     value = Column(Float, nullable=False)
 
     __table_args__ = (
-        ForeignKeyConstraint(['store_product_id', 'user_id'], ['store_products.id', 'store_products.user_id']),
-        ForeignKeyConstraint(['cost_type_id', 'user_id'], ['marketplace_cost_types.id', 'marketplace_cost_types.user_id']),
+        ForeignKeyConstraint(['store_product_id', 'user_id'], ['store_products.id', 'store_products.user_id'], ondelete='CASCADE'),
+        ForeignKeyConstraint(['cost_type_id', 'user_id'], ['marketplace_cost_types.id', 'marketplace_cost_types.user_id'], ondelete='CASCADE'),
         ForeignKeyConstraint(['user_id'], ['users.id']),
+        # Fees of a listing (pricing, dashboard setup health, ON DELETE CASCADE)
+        Index('ix_store_product_marketplace_costs_listing', 'user_id', 'store_product_id'),
     )
 
     # Relationships
@@ -17,6 +17,10 @@ from .ads import router as ads_router
 from .decision import router as decision_router
 from .extra_costs import router as extra_costs_router
 from .imports import router as imports_router
+from .exports import router as exports_router
+from .analytics import router as analytics_router
+from .dashboard import router as dashboard_router
+from .rankings import router as rankings_router
 
 __all__ = [
     "auth_router",
@@ -34,5 +38,9 @@ __all__ = [
     "ads_router",
     "decision_router",
     "extra_costs_router",
-    "imports_router"
+    "imports_router",
+    "exports_router",
+    "analytics_router",
+    "dashboard_router",
+    "rankings_router"
 ]
@@ -1,14 +1,16 @@
 """
 Ads Router - CRUD operations for advertising data
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from typing import List
+from datetime import date
 
-from ..database import get_db
+from ..database import get_db, get_read_db
 from ..models import Ad, Store, Product, ProductPerformance, User
 from ..schemas.ad import AdCreate, AdUpdate, AdResponse
+from ..services.ad_keyword_service import AdKeywordService
 from ..deps import get_current_user
 
 router = APIRouter(prefix="/ads", tags=["Ads"])
@@ -56,23 +58,37 @@ def create_ad(
 def get_ads(
     store_id: str = None, 
     product_id: str = None, 
-    db: Session = Depends(get_db),
+    date_from: date = Query(None, alias="from", description="Periode iklan overlap mulai tanggal ini"),
+    date_to: date = Query(None, alias="to", description="Periode iklan overlap sampai tanggal ini"),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get ads for current user with optional filtering"""
+    """
+    Get ads for current user with optional filtering.
+    With from/to only ads whose period overlaps the window are returned, and
+    TACoS uses product revenue inside the same window.
+    """
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Tanggal 'from' tidak boleh setelah 'to'"
+        )
+
     query = db.query(Ad).filter(Ad.user_id == current_user.id)
     if store_id:
         query = query.filter(Ad.store_id == store_id)
     if product_id:
         query = query.filter(Ad.product_id == product_id)
+    if date_from or date_to:
+        query = query.filter(Ad.overlapping(date_from, date_to))
     
-    return [_build_ad_response(ad, db) for ad in query.all()]
+    return [_build_ad_response(ad, db, date_from, date_to) for ad in query.order_by(Ad.start_date, Ad.id).all()]
 
 
 @router.get("/{ad_id}", response_model=AdResponse)
 def get_ad(
     ad_id: int, 
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get a specific ad by ID"""
@@ -102,6 +118,7 @@ def update_ad(
     
     for key, value in ad.model_dump(exclude_unset=True).items():
         setattr(db_ad, key, value)
+    AdKeywordService.sync_fact(db, db_ad)
     
     db.commit()
     db.refresh(db_ad)
@@ -125,8 +142,8 @@ def delete_ad(
     db.commit()
 
 
-def _build_ad_response(ad: Ad, db: Session = None) -> AdResponse:
-    """Build ad response with derived metrics"""
+def _build_ad_response(ad: Ad, db: Session = None, date_from: date = None, date_to: date = None) -> AdResponse:
+    """Build ad response with derived metrics; date_from/date_to bound the TACoS revenue"""
     roas = ad.gmv / ad.spend if ad.spend > 0 else None
     acos = ad.spend / ad.gmv if ad.gmv > 0 else None
     aov = ad.gmv / ad.orders if ad.orders > 0 else None
@@ -138,11 +155,16 @@ def _build_ad_response(ad: Ad, db: Session = None) -> AdResponse:
     if not total_sales and db:
         # Sum revenue for this product in this store (for today or recent period)
         # For simplicity, we take the most recent record or sum last 30 days
-        perf_revenue = db.query(func.sum(ProductPerformance.revenue)).filter(
+        revenue_query = db.query(func.sum(ProductPerformance.revenue)).filter(
             ProductPerformance.product_id == ad.product_id,
             ProductPerformance.store_id == ad.store_id,
             ProductPerformance.user_id == ad.user_id
-        ).scalar()
+        )
+        if date_from:
+            revenue_query = revenue_query.filter(ProductPerformance.date >= date_from)
+        if date_to:
+            revenue_query = revenue_query.filter(ProductPerformance.date <= date_to)
+        perf_revenue = revenue_query.scalar()
         if perf_revenue:
             total_sales = float(perf_revenue)
 
@@ -154,6 +176,9 @@ def _build_ad_response(ad: Ad, db: Session = None) -> AdResponse:
         id=ad.id, store_id=ad.store_id, product_id=ad.product_id,
         campaign=ad.campaign, spend=ad.spend, gmv=ad.gmv, orders=ad.orders,
         total_sales=total_sales,
+        impressions=ad.impressions, clicks=ad.clicks, ctr=ad.ctr,
+        direct_conversions=ad.direct_conversions, items_sold=ad.items_sold,
+        start_date=ad.start_date, end_date=ad.end_date,
         roas=round(roas, 2) if roas else None,
         acos=round(acos, 4) if acos else None,
         aov=round(aov, 2) if aov else None,
@@ -0,0 +1,63 @@
+"""
+Analytics Router - Rolling-window store and ads metrics
+"""
+from datetime import date
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from ..database import get_read_db
+from ..models import User
+from ..schemas.analytics import StoreRollingPoint, AdsRollingPoint
+from ..services.analytics_service import AnalyticsService, MAX_WINDOW
+from ..deps import get_current_user
+
+router = APIRouter(prefix="/analytics", tags=["Analytics"])
+
+
+def _parse_windows(windows: str) -> List[int]:
+    try:
+        values = sorted({int(w) for w in windows.split(",") if w.strip()})
+    except ValueError:
+        values = []
+    if not values or values[0] < 1 or values[-1] > MAX_WINDOW:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Parameter windows tidak valid. Gunakan daftar hari 1-{MAX_WINDOW}, contoh: 7,14,30"
+        )
+    return values
+
+
+@router.get("/store-performance/rolling", response_model=List[StoreRollingPoint])
+def get_store_rolling(
+    store_id: str = None,
+    start_date: date = None,
+    end_date: date = None,
+    windows: str = "7,14,30",
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Daily store performance with 7/14/30-day moving averages of revenue and orders,
+    and rolling conversion and cancellation (1 - net/gross) rates.
+    """
+    return AnalyticsService.store_rolling(
+        db, current_user.id, store_id, start_date, end_date, _parse_windows(windows)
+    )
+
+
+@router.get("/ads/rolling", response_model=List[AdsRollingPoint])
+def get_ads_rolling(
+    store_id: str = None,
+    product_id: str = None,
+    start_date: date = None,
+    end_date: date = None,
+    windows: str = "7,14,30",
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Rolling ROAS, ACOS and CPA per store, by ads report period start"""
+    return AnalyticsService.ads_rolling(
+        db, current_user.id, store_id, product_id, start_date, end_date, _parse_windows(windows)
+    )
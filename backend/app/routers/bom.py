@@ -1,10 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from ..database import get_db
 from ..models import BOM, Product, Material, User
 from ..schemas.bom import BOMCreate, BOMUpdate, BOMResponse
+from ..services.hpp_service import HPPService, BOMCycleError
 from ..deps import get_current_user
 
 router = APIRouter(prefix="/bom", tags=["BOM"])
@@ -28,21 +29,41 @@ def create_bom(
             detail="Product tidak ditemukan"
         )
     
-    # Validate material exists for this user
-    material = db.query(Material).filter(
-        Material.id == bom.material_id,
-        Material.user_id == current_user.id
-    ).first()
-    if not material:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Material tidak ditemukan"
-        )
+    if bom.material_id:
+        # Validate material exists for this user
+        material = db.query(Material).filter(
+            Material.id == bom.material_id,
+            Material.user_id == current_user.id
+        ).first()
+        if not material:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Material tidak ditemukan"
+            )
+        component = None
+    else:
+        # Validate sub-assembly product exists and does not create a cycle
+        component = db.query(Product).filter(
+            Product.id == bom.component_product_id,
+            Product.user_id == current_user.id
+        ).first()
+        if not component:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Product komponen tidak ditemukan"
+            )
+        cycle = HPPService.check_bom_cycle(db, bom.product_id, bom.component_product_id, current_user.id)
+        if cycle:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(BOMCycleError(cycle))
+            )
+        material = None
     
     # Check for duplicate entry
     existing = db.query(BOM).filter(
         BOM.product_id == bom.product_id,
-        BOM.material_id == bom.material_id,
+        BOM.material_id == bom.material_id if bom.material_id else BOM.component_product_id == bom.component_product_id,
         BOM.user_id == current_user.id
     ).first()
     if existing:
@@ -54,6 +75,7 @@ def create_bom(
     db_bom = BOM(
         product_id=bom.product_id,
         material_id=bom.material_id,
+        component_product_id=bom.component_product_id,
         user_id=current_user.id,
         qty=bom.qty
     )
@@ -62,7 +84,7 @@ def create_bom(
     db.commit()
     db.refresh(db_bom)
     
-    return _build_bom_response(db_bom, material)
+    return _build_bom_response(db, db_bom, material, component)
 
 
 @router.get("/{product_id}", response_model=List[BOMResponse])
@@ -85,17 +107,30 @@ def get_bom_by_product(
     bom_items = db.query(BOM).filter(
         BOM.product_id == product_id,
         BOM.user_id == current_user.id
-    ).all()
+    ).order_by(BOM.id).all()
     
-    responses = []
-    for bom in bom_items:
-        material = db.query(Material).filter(
-            Material.id == bom.material_id,
+    material_ids = [bom.material_id for bom in bom_items if bom.material_id]
+    materials = {
+        m.id: m for m in db.query(Material).filter(
+            Material.id.in_(material_ids),
             Material.user_id == current_user.id
-        ).first()
-        responses.append(_build_bom_response(bom, material))
+        )
+    } if material_ids else {}
+    component_ids = [bom.component_product_id for bom in bom_items if bom.component_product_id]
+    components = {
+        p.id: p for p in db.query(Product).filter(
+            Product.id.in_(component_ids),
+            Product.user_id == current_user.id
+        )
+    } if component_ids else {}
+    hpp_cache = {}
     
-    return responses
+    return [
+        _build_bom_response(
+            db, bom, materials.get(bom.material_id), components.get(bom.component_product_id), hpp_cache
+        )
+        for bom in bom_items
+    ]
 
 
 @router.put("/{bom_id}", response_model=BOMResponse)
@@ -125,8 +160,12 @@ def update_bom(
     material = db.query(Material).filter(
         Material.id == db_bom.material_id,
         Material.user_id == current_user.id
-    ).first()
-    return _build_bom_response(db_bom, material)
+    ).first() if db_bom.material_id else None
+    component = db.query(Product).filter(
+        Product.id == db_bom.component_product_id,
+        Product.user_id == current_user.id
+    ).first() if db_bom.component_product_id else None
+    return _build_bom_response(db, db_bom, material, component)
 
 
 @router.delete("/{bom_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -150,16 +189,36 @@ def delete_bom(
     db.commit()
 
 
-def _build_bom_response(bom: BOM, material: Material) -> BOMResponse:
-    """Helper to build BOM response with material info"""
+def _build_bom_response(
+    db: Session,
+    bom: BOM,
+    material: Optional[Material],
+    component: Optional[Product] = None,
+    hpp_cache: Optional[dict] = None
+) -> BOMResponse:
+    """Helper to build BOM response with material or sub-assembly info"""
+    if component is not None:
+        try:
+            harga_satuan = HPPService.calculate_hpp_values(db, [component.id], bom.user_id, hpp_cache).get(component.id, 0)
+        except BOMCycleError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        return BOMResponse(
+            id=bom.id,
+            product_id=bom.product_id,
+            component_product_id=bom.component_product_id,
+            qty=bom.qty,
+            component_nama=component.nama,
+            material_harga_satuan=harga_satuan,
+            biaya_bahan=bom.qty * harga_satuan
+        )
     return BOMResponse(
         id=bom.id,
         product_id=bom.product_id,
         material_id=bom.material_id,
+        component_product_id=bom.component_product_id,
         qty=bom.qty,
         material_nama=material.nama if material else None,
         material_satuan=material.satuan if material else None,
         material_harga_satuan=material.harga_satuan if material else None,
         biaya_bahan=bom.qty * material.harga_satuan if material else None
     )
-
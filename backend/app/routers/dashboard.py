@@ -0,0 +1,27 @@
+"""
+Dashboard Router - One-request summary for the home page
+"""
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from ..database import get_read_db
+from ..models import User
+from ..schemas.dashboard import DashboardSummaryResponse
+from ..services.dashboard_service import DashboardService, DEFAULT_DAYS
+from ..deps import get_current_user
+
+router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
+
+
+@router.get("/summary", response_model=DashboardSummaryResponse)
+def get_dashboard_summary(
+    days: int = Query(DEFAULT_DAYS, ge=1, le=365),
+    store_id: str = None,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Entity counts, sales totals of the last `days` days with a daily series,
+    cancellation rate and setup-health issues, from COUNT/SUM queries
+    """
+    return DashboardService.summary(db, current_user.id, days, store_id)
@@ -1,12 +1,15 @@
 """
 Decision Router - Product viability grading and alerts
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
+from datetime import date
+from typing import List
 
-from ..database import get_db
-from ..schemas.decision import DecisionResponse
+from ..database import get_read_db
+from ..schemas.decision import DecisionResponse, GradeSnapshotResponse
 from ..services.decision_service import DecisionService
+from ..services.grading_service import GradingService
 
 from ..deps import get_current_user
 from ..models import User
@@ -18,7 +21,10 @@ router = APIRouter(prefix="/decision", tags=["Decision & Grading"])
 def get_decision(
     store_id: str, 
     product_id: str, 
-    db: Session = Depends(get_db),
+    date_from: date = Query(None, alias="from", description="Hanya iklan dengan periode overlap mulai tanggal ini"),
+    date_to: date = Query(None, alias="to", description="Hanya iklan dengan periode overlap sampai tanggal ini"),
+    as_of: date = Query(None, description="Tanggal harga bahan untuk HPP (default: to, atau harga saat ini)"),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -28,8 +34,11 @@ def get_decision(
     - Grade: NOT_VIABLE, RISKY, VIABLE, or SCALABLE
     - Detailed metrics
     - Alerts and recommendations
+
+    Optional from/to limit the ads used for ROAS/CPA to periods overlapping that window.
+    HPP uses material prices and extra costs in force on as_of (default: to).
     """
-    result = DecisionService.get_decision(db, store_id, product_id, current_user.id)
+    result = DecisionService.get_decision(db, store_id, product_id, current_user.id, date_from, date_to, as_of)
     
     if not result:
         raise HTTPException(
@@ -38,3 +47,20 @@ def get_decision(
         )
     
     return result
+
+
+@router.get("/{store_id}/{product_id}/trend", response_model=List[GradeSnapshotResponse])
+def get_grade_trend(
+    store_id: str,
+    product_id: str,
+    date_from: date = Query(None, alias="from", description="Snapshot mulai tanggal ini"),
+    date_to: date = Query(None, alias="to", description="Snapshot sampai tanggal ini"),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Riwayat grade harian listing dari re-grading terjadwal (urut tanggal).
+
+    Kosong jika job belum pernah berjalan untuk listing ini.
+    """
+    return GradingService.trend(db, current_user.id, store_id, product_id, date_from, date_to)
@@ -0,0 +1,100 @@
+"""
+Exports Router - Streaming CSV/XLSX downloads
+"""
+from datetime import date
+from typing import Iterable, List, Literal
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+
+from ..database import read_session_factory
+from ..models import User
+from ..services.export_service import (
+    ExportService, STORE_PERFORMANCE_COLUMNS, ADS_COLUMNS, PRICING_COLUMNS
+)
+from ..deps import get_current_user
+
+router = APIRouter(prefix="/exports", tags=["Exports"])
+
+MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+def _stream(request: Request, name: str, fmt: str, columns: List[str], rows_factory) -> StreamingResponse:
+    """
+    Build a streaming download.
+
+    The generator opens its own session: it runs after the handler has
+    returned, while rows are still being fetched from the cursor. Exports
+    only read, so the session comes from the read replica when configured.
+    """
+    session_factory = read_session_factory(request)
+
+    def body():
+        db = session_factory()
+        try:
+            rows: Iterable[list] = rows_factory(db)
+            if fmt == "xlsx":
+                yield from ExportService.iter_xlsx(columns, rows, sheet_title=name)
+            else:
+                yield from ExportService.iter_csv(columns, rows)
+        finally:
+            db.close()
+
+    filename = f"{name}-{date.today().isoformat()}.{fmt}"
+    return StreamingResponse(
+        body(),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.get("/store-performance")
+def export_store_performance(
+    request: Request,
+    format: Literal["csv", "xlsx"] = "csv",
+    store_id: str = None,
+    start_date: date = None,
+    end_date: date = None,
+    current_user: User = Depends(get_current_user)
+):
+    """Export daily store performance"""
+    user_id = current_user.id
+    return _stream(
+        request, "store-performance", format, STORE_PERFORMANCE_COLUMNS,
+        lambda db: ExportService.store_performance_rows(db, user_id, store_id, start_date, end_date)
+    )
+
+
+@router.get("/ads")
+def export_ads(
+    request: Request,
+    format: Literal["csv", "xlsx"] = "csv",
+    store_id: str = None,
+    product_id: str = None,
+    current_user: User = Depends(get_current_user)
+):
+    """Export ads with ROAS, ACOS, CPA, AOV and TACoS"""
+    user_id = current_user.id
+    return _stream(
+        request, "ads", format, ADS_COLUMNS,
+        lambda db: ExportService.ads_rows(db, user_id, store_id, product_id)
+    )
+
+
+@router.get("/pricing")
+def export_pricing(
+    request: Request,
+    format: Literal["csv", "xlsx"] = "csv",
+    store_id: str = None,
+    as_of: date = None,
+    current_user: User = Depends(get_current_user)
+):
+    """Export forward pricing for every store product (HPP at as_of prices when given)"""
+    user_id = current_user.id
+    return _stream(
+        request, "pricing", format, PRICING_COLUMNS,
+        lambda db: ExportService.pricing_rows(db, user_id, store_id, as_of)
+    )
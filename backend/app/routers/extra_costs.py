@@ -3,8 +3,11 @@ from sqlalchemy.orm import Session
 from typing import List
 
 from ..database import get_db
-from ..models import ProductExtraCost, Product, User
-from ..schemas.product_extra_cost import ProductExtraCostCreate, ProductExtraCostUpdate, ProductExtraCostResponse
+from ..models import ProductExtraCost, ProductExtraCostHistory, Product, User
+from ..schemas.product_extra_cost import (
+    ProductExtraCostCreate, ProductExtraCostUpdate, ProductExtraCostResponse, ProductExtraCostHistoryResponse
+)
+from ..services.price_history_service import PriceHistoryService
 from ..deps import get_current_user
 
 router = APIRouter(prefix="/extra-costs", tags=["Extra Costs"])
@@ -36,6 +39,8 @@ def create_extra_cost(
     )
     
     db.add(db_extra_cost)
+    db.flush()
+    PriceHistoryService.record_extra_cost(db, db_extra_cost, extra_cost.effective_from)
     db.commit()
     db.refresh(db_extra_cost)
     return db_extra_cost
@@ -54,6 +59,19 @@ def get_extra_costs_by_product(
     ).all()
 
 
+@router.get("/{product_id}/history", response_model=List[ProductExtraCostHistoryResponse])
+def get_extra_cost_history(
+    product_id: str, 
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get effective-dated history of a product's extra costs, newest first"""
+    return db.query(ProductExtraCostHistory).filter(
+        ProductExtraCostHistory.product_id == product_id,
+        ProductExtraCostHistory.user_id == current_user.id
+    ).order_by(ProductExtraCostHistory.effective_from.desc(), ProductExtraCostHistory.id.desc()).all()
+
+
 @router.put("/{cost_id}", response_model=ProductExtraCostResponse)
 def update_extra_cost(
     cost_id: int, 
@@ -77,6 +95,9 @@ def update_extra_cost(
         db_cost.label = extra_cost.label
     if extra_cost.value is not None:
         db_cost.value = extra_cost.value
+    
+    if extra_cost.label is not None or extra_cost.value is not None:
+        PriceHistoryService.record_extra_cost(db, db_cost, extra_cost.effective_from)
         
     db.commit()
     db.refresh(db_cost)
@@ -101,5 +122,6 @@ def delete_extra_cost(
             detail="Biaya tidak ditemukan"
         )
     
+    PriceHistoryService.record_extra_cost(db, db_cost, deleted=True)
     db.delete(db_cost)
     db.commit()
@@ -1,12 +1,13 @@
 """
 HPP Router - Cost of Goods Sold calculations
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
+from datetime import date
 
-from ..database import get_db
+from ..database import get_read_db
 from ..schemas.hpp import HPPResponse
-from ..services.hpp_service import HPPService
+from ..services.hpp_service import HPPService, BOMCycleError
 from ..deps import get_current_user
 from ..models import User
 
@@ -16,11 +17,18 @@ router = APIRouter(prefix="/hpp", tags=["HPP"])
 @router.get("/{product_id}", response_model=HPPResponse)
 def calculate_hpp(
     product_id: str, 
-    db: Session = Depends(get_db),
+    as_of: date = Query(None, description="Pakai harga bahan dan biaya ekstra yang berlaku pada tanggal ini"),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Calculate HPP for a product"""
-    result = HPPService.calculate_hpp(db, product_id, current_user.id)
+    try:
+        result = HPPService.calculate_hpp(db, product_id, current_user.id, as_of)
+    except BOMCycleError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     
     if not result:
         raise HTTPException(
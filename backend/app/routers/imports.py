@@ -1,38 +1,68 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, status
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 import pandas as pd
 import io
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
 from datetime import datetime, date
-from typing import List
+from typing import List, Optional
 import hashlib
 
-from ..database import get_db
-from ..models import Store, StorePerformance, ProductPerformance, Product, User, SalesReport, Ad
+from ..database import get_db, get_read_db, primary_session
+from ..models import Store, StorePerformance, ProductPerformance, Product, User, SalesReport, ReportArchive
 from ..schemas.store_performance import (
     SalesImportResponse, 
     StorePerformanceResponse, 
     ProductSalesImportResponse,
-    SalesReportResponse
+    SalesReportResponse,
+    ReportArchiveResponse,
+    ArchiveReimportResponse
 )
-from ..schemas.ad import AdsImportResponse
+from ..schemas.ad import AdsImportResponse, AdsBatchImportResponse, AdsFileImportSummary
+from ..schemas.catalog import CatalogImportResponse
+from ..services.product_name_index import ProductNameIndex
+from ..services.ads_import_service import (
+    AdsImportService, AdsReportError, ADS_METADATA_KEYS, get_parse_pool, reset_parse_pool
+)
+from ..services.report_archive_service import ReportArchiveService, archive_path
+from ..services.import_report_service import ImportReportService
+from ..services.catalog_import_service import CatalogImportService, CatalogImportError
+from ..services.import_progress import ImportProgress, NULL_PROGRESS, stream_import
 from ..deps import get_current_user
 
 router = APIRouter(prefix="/imports", tags=["Imports & Sales Reports"])
 
+MAX_ZIP_UNCOMPRESSED_BYTES = 500 * 1024 * 1024
+
 @router.post("/shopee-sales", response_model=SalesImportResponse)
 async def import_shopee_sales(
+    request: Request,
     store_id: str = Form(...),
     file: UploadFile = File(...),
+    stream: bool = Query(False, description="Kirim progress import sebagai Server-Sent Events"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Import Shopee Business Insight (Sales Overview) Excel file.
+
+    With ?stream=true the response is an SSE stream of progress events ending in complete or error.
     """
+    contents = await file.read()
+    job = partial(_import_sales, user_id=current_user.id, store_id=store_id, filename=file.filename, contents=contents)
+    return await _run_import(request, db, job, stream)
+
+
+def _import_sales(
+    db: Session, progress: ImportProgress, user_id: int, store_id: str, filename: str, contents: bytes
+) -> SalesImportResponse:
     # Validate store
     store = db.query(Store).filter(
         Store.id == store_id,
-        Store.user_id == current_user.id
+        Store.user_id == user_id
     ).first()
     
     if not store:
@@ -41,16 +71,12 @@ async def import_shopee_sales(
             detail="Store tidak ditemukan"
         )
 
-    # Read file and Calculate Hash
+    # Calculate Hash
     try:
-        contents = await file.read()
         file_hash = hashlib.sha256(contents).hexdigest()
         
         # Check if file hash already exists
-        duplicate_hash = db.query(SalesReport).filter(
-            SalesReport.file_hash == file_hash,
-            SalesReport.user_id == current_user.id
-        ).first()
+        duplicate_hash = ImportReportService.get(db, user_id, "shopee_sales", file_hash)
         
         if duplicate_hash:
             raise HTTPException(
@@ -58,50 +84,7 @@ async def import_shopee_sales(
                 detail=f"File ini sudah pernah di-upload sebelumnya (ID Laporan: {duplicate_hash.id})"
             )
 
-        # Detect file type and read accordingly
-        filename = file.filename.lower()
-        if filename.endswith('.csv'):
-            # For CSV: First scan to find header row, then re-read properly
-            try:
-                content_str = contents.decode('utf-8-sig')
-            except UnicodeDecodeError:
-                content_str = contents.decode('latin-1')
-            
-            lines = content_str.splitlines()
-            header_idx = -1
-            
-            # Find the header row containing 'Tanggal'
-            for i, line in enumerate(lines):
-                if 'Tanggal' in line:
-                    header_idx = i
-                    break
-            
-            if header_idx == -1:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Format file CSV tidak dikenali. Kolom 'Tanggal' tidak ditemukan."
-                )
-            
-            # Re-read CSV with proper skiprows
-            df = pd.read_csv(io.StringIO(content_str), skiprows=header_idx)
-        else:
-            df = pd.read_excel(io.BytesIO(contents))
-            
-            # For Excel: Find header row containing 'Tanggal'
-            header_idx = -1
-            for i, row in df.iterrows():
-                if 'Tanggal' in row.values:
-                    header_idx = i
-                    break
-            
-            if header_idx == -1:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Format file tidak dikenali. Kolom 'Tanggal' tidak ditemukan."
-                )
-            
-            df.columns = df.iloc[header_idx]
-            df = df.iloc[header_idx + 1:]
+        df = _read_sales_frame(filename, contents)
             
     except HTTPException:
         raise
@@ -110,91 +93,15 @@ async def import_shopee_sales(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Gagal membaca file: {str(e)}"
         )
+    progress.parsed(len(df), filename)
 
-    # Mapping logic
-    imported_count = 0
-    total_rev = 0
-    total_gross = 0
-    conversions = []
-    
-    dates_found = []
-
-    for _, row in df.iterrows():
-        try:
-            raw_date = str(row['Tanggal']).strip()
-            if not raw_date or raw_date == 'nan':
-                continue
-            
-            # Shopee date format is often DD-MM-YYYY
-            try:
-                processed_date = None
-                for fmt in ("%d-%m-%Y", "%Y-%m-%d"):
-                    try:
-                        processed_date = datetime.strptime(raw_date, fmt).date()
-                        break
-                    except ValueError:
-                        continue
-                
-                if not processed_date:
-                    continue
-            except:
-                continue
-
-            def parse_num(val):
-                if pd.isna(val): return 0
-                if isinstance(val, (int, float)): return val
-                cleaned = str(val).replace('.', '').replace(',', '.')
-                try:
-                    return float(cleaned)
-                except:
-                    return 0
-
-            # Net Revenue = Penjualan (Pesanan Siap Dikirim)
-            # Gross Revenue = Penjualan (Pesanan Dibuat)
-            revenue_net = parse_num(row.get('Penjualan (Pesanan Siap Dikirim) (IDR)', 0))
-            revenue_gross = parse_num(row.get('Penjualan (Pesanan Dibuat) (IDR)', 0))
-            
-            visitors = int(parse_num(row.get('Total Pengunjung (Kunjungan)', 0)))
-            orders = int(parse_num(row.get('Pesanan (COD Dibuat + non-COD Dibayar)', 0)))
-            conv_rate = parse_num(row.get('Tingkat Konversi', 0))
-            if conv_rate > 1: # percentage format 50.5
-                conv_rate = conv_rate / 100
-
-            # Update or create performance entry
-            perf = db.query(StorePerformance).filter(
-                StorePerformance.store_id == store_id,
-                StorePerformance.user_id == current_user.id,
-                StorePerformance.date == processed_date
-            ).first()
-
-            if perf:
-                perf.visitors = visitors
-                perf.orders = orders
-                perf.revenue = revenue_net
-                perf.gross_revenue = revenue_gross
-                perf.conversion_rate = conv_rate
-            else:
-                perf = StorePerformance(
-                    user_id=current_user.id,
-                    store_id=store_id,
-                    date=processed_date,
-                    visitors=visitors,
-                    orders=orders,
-                    revenue=revenue_net,
-                    gross_revenue=revenue_gross,
-                    conversion_rate=conv_rate
-                )
-                db.add(perf)
-            
-            dates_found.append(processed_date)
-            imported_count += 1
-            total_rev += revenue_net
-            total_gross += revenue_gross
-            conversions.append(conv_rate)
-
-        except Exception as e:
-            print(f"Row skip error: {e}")
-            continue
+    report, _ = ImportReportService.open(db, user_id, store_id, "shopee_sales", filename, file_hash)
+    result = _apply_sales_frame(db, user_id, store_id, df, report.id, progress)
+    imported_count = result["imported_count"]
+    total_rev = result["total_revenue"]
+    total_gross = result["total_gross"]
+    conversions = result["conversions"]
+    dates_found = result["dates"]
 
     if imported_count == 0:
         raise HTTPException(status_code=400, detail="Tidak ada data yang valid untuk diimpor.")
@@ -204,8 +111,10 @@ async def import_shopee_sales(
     period_end = max(dates_found)
     
     duplicate_period = db.query(SalesReport).filter(
+        SalesReport.id != report.id,
         SalesReport.store_id == store_id,
-        SalesReport.user_id == current_user.id,
+        SalesReport.user_id == user_id,
+        SalesReport.report_type == "shopee_sales",
         SalesReport.period_start == period_start,
         SalesReport.period_end == period_end
     ).first()
@@ -218,19 +127,9 @@ async def import_shopee_sales(
             detail=f"Laporan untuk periode {period_start} s/d {period_end} sudah pernah di-upload (ID: {duplicate_period.id})."
         )
 
-    # Save to SalesReport history
-    report = SalesReport(
-        user_id=current_user.id,
-        store_id=store_id,
-        filename=file.filename,
-        file_hash=file_hash,
-        period_start=period_start,
-        period_end=period_end,
-        total_gross=total_gross,
-        total_net=total_rev,
-        upload_date=date.today()
-    )
-    db.add(report)
+    # Period and totals of the SalesReport history entry
+    ImportReportService.refresh_totals(db, report)
+    ReportArchiveService.archive(db, user_id, store_id, "shopee_sales", file_hash, filename, df)
     db.commit()
 
     avg_conv = sum(conversions) / len(conversions) if conversions else 0
@@ -254,7 +153,7 @@ def get_performance(
     store_id: str = None,
     start_date: date = None,
     end_date: date = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -276,29 +175,44 @@ def get_performance(
 @router.get("/reports", response_model=List[SalesReportResponse])
 async def get_reports(
     store_id: str = None,
-    db: Session = Depends(get_db),
+    report_type: str = None,
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get report history, optionally filtered by store"""
+    """Get report history, optionally filtered by store and report type"""
     query = db.query(SalesReport).filter(SalesReport.user_id == current_user.id)
     if store_id:
         query = query.filter(SalesReport.store_id == store_id)
+    if report_type:
+        query = query.filter(SalesReport.report_type == report_type)
     return query.order_by(SalesReport.upload_date.desc()).all()
 
 @router.post("/shopee-products", response_model=ProductSalesImportResponse)
 async def import_shopee_product_sales(
+    request: Request,
     store_id: str = Form(...),
     file: UploadFile = File(...),
+    stream: bool = Query(False, description="Kirim progress import sebagai Server-Sent Events"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Import Shopee Business Insight (Product Performance) Excel file.
+
+    With ?stream=true the response is an SSE stream of progress events ending in complete or error.
     """
+    contents = await file.read()
+    job = partial(_import_products, user_id=current_user.id, store_id=store_id, filename=file.filename, contents=contents)
+    return await _run_import(request, db, job, stream)
+
+
+def _import_products(
+    db: Session, progress: ImportProgress, user_id: int, store_id: str, filename: str, contents: bytes
+) -> ProductSalesImportResponse:
     # Validate store
     store = db.query(Store).filter(
         Store.id == store_id,
-        Store.user_id == current_user.id
+        Store.user_id == user_id
     ).first()
     
     if not store:
@@ -309,53 +223,608 @@ async def import_shopee_product_sales(
 
     # Read file (CSV or Excel)
     try:
-        contents = await file.read()
-        filename = file.filename.lower()
-        if filename.endswith('.csv'):
-            # For CSV: First scan to find header row, then re-read properly
-            try:
-                content_str = contents.decode('utf-8-sig')
-            except UnicodeDecodeError:
-                content_str = contents.decode('latin-1')
-            
-            lines = content_str.splitlines()
-            header_idx = -1
-            
-            # Find the header row containing 'Nama Produk' or 'Product Name'
-            for i, line in enumerate(lines):
-                if 'Nama Produk' in line or 'Product Name' in line:
-                    header_idx = i
-                    break
-            
-            if header_idx != -1:
-                df = pd.read_csv(io.StringIO(content_str), skiprows=header_idx)
-            else:
-                # No header found, read normally
-                df = pd.read_csv(io.StringIO(content_str))
-        else:
-            df = pd.read_excel(io.BytesIO(contents))
-            
-            # For Excel: Shopee Product report often has metadata rows
-            header_idx = -1
-            for i, row in df.iterrows():
-                if 'Nama Produk' in row.values or 'Product Name' in row.values:
-                    header_idx = i
-                    break
-            
-            if header_idx != -1:
-                df.columns = df.iloc[header_idx]
-                df = df.iloc[header_idx + 1:]
+        df = _read_product_frame(filename, contents)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Gagal membaca file: {str(e)}"
         )
+    progress.parsed(len(df), filename)
 
-    # Mapping logic: Try 'Nama Produk' or 'SKU Ibu'
+    file_hash = hashlib.sha256(contents).hexdigest()
+    report, is_new = ImportReportService.open(db, user_id, store_id, "shopee_products", filename, file_hash)
+    imported_count, skipped_count = _apply_product_frame(db, user_id, store_id, df, report.id, progress)
+    if imported_count == 0 and is_new:
+        db.delete(report)
+    else:
+        ImportReportService.refresh_totals(db, report)
+    ReportArchiveService.archive(db, user_id, store_id, "shopee_products", file_hash, filename, df)
+    db.commit()
+
+    return ProductSalesImportResponse(
+        store_id=store_id,
+        rows_imported=imported_count,
+        rows_skipped=skipped_count,
+        summary=f"Berhasil mengimpor {imported_count} produk. {skipped_count} produk dilewati karena tidak terdaftar di MartTool."
+    )
+
+@router.post("/shopee-ads", response_model=AdsImportResponse)
+async def import_ads(
+    request: Request,
+    store_id: str = Form(...),
+    file: UploadFile = File(...),
+    stream: bool = Query(False, description="Kirim progress import sebagai Server-Sent Events"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Generic Import Ads Report Endpoint.
+    Automatically detects marketplace based on Store ID and selects appropriate parser.
+    Currently supports: Shopee.
+
+    With ?stream=true the response is an SSE stream of progress events ending in complete or error.
+    """
+    # Read file content
+    try:
+        contents = await file.read()
+    except Exception as e:
+         raise HTTPException(status_code=400, detail=f"Gagal membaca file: {str(e)}")
+
+    job = partial(_import_ads, user_id=current_user.id, store_id=store_id, filename=file.filename, contents=contents)
+    return await _run_import(request, db, job, stream)
+
+
+def _import_ads(
+    db: Session, progress: ImportProgress, user_id: int, store_id: str, filename: str, contents: bytes
+) -> AdsImportResponse:
+    store = _get_ads_store(db, store_id, user_id)
+
+    archive_to = _ads_archive_targets(db, user_id, [contents])[0]
+    try:
+        parsed = AdsImportService.parse_shopee(filename, contents, archive_to)
+    except AdsReportError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    progress.parsed(len(parsed["rows"]) + parsed["rows_failed"], filename)
+
+    new_reports = _open_ads_reports(db, user_id, store.id, [parsed])
+    result = AdsImportService.write_ads(db, user_id, store.id, [parsed], progress)
+    _close_ads_reports(db, [parsed], result, new_reports)
+    archived = _register_ads_archives(db, user_id, store.id, [parsed])
+    if result["rows_imported"] > 0 or result["products_created"] > 0 or archived:
+        db.commit()
+
+    return AdsImportResponse(
+        store_id=store_id,
+        rows_imported=result["rows_imported"],
+        rows_skipped=result["rows_skipped"],
+        total_spend=result["total_spend"],
+        total_gmv=result["total_gmv"],
+        summary=_ads_summary(result)
+    )
+
+
+@router.post("/shopee-ads/batch", response_model=AdsBatchImportResponse)
+async def import_ads_batch(
+    request: Request,
+    store_id: str = Form(...),
+    files: List[UploadFile] = File(...),
+    stream: bool = Query(False, description="Kirim progress import sebagai Server-Sent Events"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Import banyak laporan iklan sekaligus (beberapa file dan/atau satu ZIP).
+    File di-parse paralel di process pool, lalu semua baris ditulis dengan
+    satu bulk insert dan satu pengecekan duplikat.
+
+    Dengan ?stream=true response berupa SSE: event parsed per file selesai
+    di-parse, progress penulisan, lalu complete atau error.
+    """
+    uploads = []
+    for upload in files:
+        contents = await upload.read()
+        if upload.filename.lower().endswith('.zip'):
+            try:
+                uploads.extend(_extract_zip(contents))
+            except (zipfile.BadZipFile, ValueError) as e:
+                raise HTTPException(status_code=400, detail=f"Gagal membaca ZIP '{upload.filename}': {e}")
+        else:
+            uploads.append((upload.filename, contents))
+
+    job = partial(_import_ads_batch, user_id=current_user.id, store_id=store_id, uploads=uploads)
+    return await _run_import(request, db, job, stream)
+
+
+def _import_ads_batch(
+    db: Session, progress: ImportProgress, user_id: int, store_id: str, uploads: List[tuple]
+) -> AdsBatchImportResponse:
+    store = _get_ads_store(db, store_id, user_id)
+
+    if not uploads:
+        raise HTTPException(status_code=400, detail="Tidak ada file laporan yang bisa diproses.")
+
+    # Workers also write the raw table to the Parquet archive for files not archived yet
+    archive_targets = _ads_archive_targets(db, user_id, [data for _, data in uploads])
+    jobs = [(name, data, target) for (name, data), target in zip(uploads, archive_targets)]
+    outcomes = _parse_ads_files(jobs, progress)
+
+    parsed_files = []
+    file_summaries = []
+    for (name, _), outcome in zip(uploads, outcomes):
+        if isinstance(outcome, Exception):
+            file_summaries.append(AdsFileImportSummary(filename=name, status="error", error=str(outcome)))
+        else:
+            parsed_files.append(outcome)
+            file_summaries.append(None)
+
+    new_reports = _open_ads_reports(db, user_id, store.id, parsed_files)
+    result = AdsImportService.write_ads(db, user_id, store.id, parsed_files, progress)
+    _close_ads_reports(db, parsed_files, result, new_reports)
+    archived = _register_ads_archives(db, user_id, store.id, parsed_files)
+    if result["rows_imported"] > 0 or result["products_created"] > 0 or archived:
+        db.commit()
+
+    written = iter(zip(parsed_files, result["files"]))
+    for i, summary in enumerate(file_summaries):
+        if summary is not None:
+            continue
+        parsed, counts = next(written)
+        file_summaries[i] = AdsFileImportSummary(
+            filename=parsed["filename"],
+            status="ok",
+            period_start=parsed["start_date"],
+            period_end=parsed["end_date"],
+            rows_parsed=len(parsed["rows"]),
+            rows_imported=counts["imported"],
+            rows_skipped=counts["skipped"],
+            total_spend=counts["spend"],
+            total_gmv=counts["gmv"]
+        )
+
+    failed = sum(1 for f in file_summaries if f.status == "error")
+    summary_msg = f"{len(file_summaries) - failed} dari {len(file_summaries)} file diproses. " + _ads_summary(result)
+    if failed:
+        summary_msg += f" {failed} file gagal dibaca."
+
+    return AdsBatchImportResponse(
+        store_id=store_id,
+        files=file_summaries,
+        rows_imported=result["rows_imported"],
+        rows_skipped=result["rows_skipped"],
+        products_created=result["products_created"],
+        total_spend=result["total_spend"],
+        total_gmv=result["total_gmv"],
+        summary=summary_msg
+    )
+
+
+@router.post("/catalog", response_model=CatalogImportResponse)
+async def import_catalog(
+    file: UploadFile = File(None),
+    materials_file: UploadFile = File(None),
+    products_file: UploadFile = File(None),
+    bom_file: UploadFile = File(None),
+    replace_bom: bool = Form(False),
+    dry_run: bool = Form(False),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Bulk import of materials, products and BOM lines.
+    Upload one XLSX workbook (`file`, sheets materials/products/bom) and/or one
+    CSV/XLSX per section. Everything is written in one transaction; with
+    dry_run the import is validated and counted but not saved.
+    """
+    workbook = (file.filename, await file.read()) if file is not None else None
+    uploads = {}
+    for section, upload in (("materials", materials_file), ("products", products_file), ("bom", bom_file)):
+        if upload is not None:
+            uploads[section] = (upload.filename, await upload.read())
+    # Parsing, upserts and the listing_economics refresh on commit run in a worker thread
+    return await run_in_threadpool(
+        _import_catalog, db, current_user.id, workbook, uploads, replace_bom, dry_run
+    )
+
+
+def _import_catalog(
+    db: Session, user_id: int, workbook: Optional[tuple], uploads: dict, replace_bom: bool, dry_run: bool
+) -> CatalogImportResponse:
+    frames = {}
+    try:
+        if workbook is not None:
+            frames.update(CatalogImportService.read_workbook(*workbook))
+        for section, (filename, contents) in uploads.items():
+            frames[section] = CatalogImportService.read_table(filename, contents, section)
+    except CatalogImportError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if not frames:
+        raise HTTPException(status_code=400, detail="Tidak ada file katalog yang di-upload.")
+
+    try:
+        result = CatalogImportService.import_catalog(
+            db, user_id,
+            materials=frames.get("materials"),
+            products=frames.get("products"),
+            bom=frames.get("bom"),
+            replace_bom=replace_bom
+        )
+    except CatalogImportError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    if dry_run:
+        db.rollback()
+    else:
+        db.commit()
+
+    parts = []
+    for section, label in (("materials", "bahan"), ("products", "produk"), ("bom", "baris BOM")):
+        counts = result.get(section)
+        if counts:
+            parts.append(f"{counts['created']} {label} baru, {counts['updated']} diperbarui")
+    summary_msg = ("Validasi selesai (tidak disimpan): " if dry_run else "Import katalog selesai: ") + "; ".join(parts) + "."
+    if result["error_count"]:
+        summary_msg += f" {result['error_count']} baris dilewati karena error."
+
+    return CatalogImportResponse(dry_run=dry_run, **result, summary=summary_msg)
+
+
+async def _run_import(request: Request, db: Session, job, stream: bool):
+    """
+    Run an import job (db, progress) -> response: as an SSE stream with its own
+    primary session, or in a worker thread with the request session
+    """
+    if stream:
+        return stream_import(partial(primary_session, request), job)
+    return await run_in_threadpool(job, db, NULL_PROGRESS)
+
+
+def _parse_ads_files(jobs: List[tuple], progress: ImportProgress) -> list:
+    """
+    Parse ads reports (name, contents, archive_to); one outcome per job, the parsed
+    dict or the exception. Several files go to the process pool, one is parsed here.
+    """
+    def parse_all(executor) -> list:
+        futures = {executor.submit(AdsImportService.parse_shopee, *job): i for i, job in enumerate(jobs)}
+        outcomes = [None] * len(jobs)
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                outcomes[i] = future.result()
+            except BrokenProcessPool:
+                raise
+            except Exception as e:
+                outcomes[i] = e
+                progress.skipped(0, f"File '{jobs[i][0]}' gagal dibaca: {e}")
+            else:
+                progress.parsed(len(outcomes[i]["rows"]) + outcomes[i]["rows_failed"], jobs[i][0])
+        return outcomes
+
+    if len(jobs) == 1:
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return parse_all(executor)
+    try:
+        return parse_all(get_parse_pool())
+    except BrokenProcessPool:
+        # Worker died (e.g. out of memory); retry this batch in threads
+        reset_parse_pool()
+        with ThreadPoolExecutor() as executor:
+            return parse_all(executor)
+
+
+def _get_ads_store(db: Session, store_id: str, user_id: int) -> Store:
+    """Validate store & check its marketplace has an ads parser"""
+    store = db.query(Store).filter(
+        Store.id == store_id,
+        Store.user_id == user_id
+    ).first()
+
+    if not store:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Store tidak ditemukan"
+        )
+
+    # Dispatcher Logic
+    marketplace_id = store.marketplace_id.lower()
+
+    if "shopee" in marketplace_id:
+        return store
+    elif "tokopedia" in marketplace_id:
+        raise HTTPException(status_code=400, detail="Import Tokopedia Ads belum didukung. Harap berikan contoh file CSV untuk pengembangan.")
+    elif "tiktok" in marketplace_id:
+        raise HTTPException(status_code=400, detail="Import TikTok Ads belum didukung. Harap berikan contoh file CSV untuk pengembangan.")
+    else:
+        # Strict check: unknown marketplaces have no parser yet
+        raise HTTPException(status_code=400, detail=f"Marketplace '{marketplace_id}' belum didukung untuk import otomatis.")
+
+
+def _extract_zip(contents: bytes) -> list:
+    """Return (filename, bytes) for every report file inside a ZIP"""
+    reports = []
+    total_size = 0
+    with zipfile.ZipFile(io.BytesIO(contents)) as zf:
+        for info in zf.infolist():
+            name = info.filename
+            base = name.rsplit('/', 1)[-1]
+            if info.is_dir() or name.startswith('__MACOSX/') or base.startswith('.'):
+                continue
+            if not base.lower().endswith(('.csv', '.xlsx', '.xls')):
+                continue
+            total_size += info.file_size
+            if total_size > MAX_ZIP_UNCOMPRESSED_BYTES:
+                raise ValueError("Isi ZIP terlalu besar")
+            reports.append((base, zf.read(info)))
+    return reports
+
+
+def _ads_archive_targets(db: Session, user_id: int, contents_list: List[bytes]) -> list:
+    """Archive path for each upload, or None when the same file is already archived"""
+    hashes = [hashlib.sha256(contents).hexdigest() for contents in contents_list]
+    archived = {
+        h for (h,) in db.query(ReportArchive.file_hash).filter(
+            ReportArchive.user_id == user_id,
+            ReportArchive.report_type == "shopee_ads",
+            ReportArchive.file_hash.in_(sorted(set(hashes)))
+        )
+    }
+    targets = []
+    for h in hashes:
+        if h in archived:
+            targets.append(None)
+        else:
+            targets.append(archive_path(user_id, "shopee_ads", h))
+            archived.add(h)  # same file twice in one batch: archive once
+    return targets
+
+
+def _register_ads_archives(db: Session, user_id: int, store_id: str, parsed_files: List[dict]) -> int:
+    """Add catalog entries for the Parquet files written by parse_shopee"""
+    registered = 0
+    for parsed in parsed_files:
+        archive = parsed.get("archive")
+        if not archive:
+            continue
+        ReportArchiveService.register(
+            db, user_id, store_id, "shopee_ads", parsed["file_hash"], parsed["filename"],
+            archive["row_count"], archive["column_count"], archive["size_bytes"],
+            metadata={key: parsed[key] for key in ADS_METADATA_KEYS}
+        )
+        registered += 1
+    return registered
+
+
+def _open_ads_reports(db: Session, user_id: int, store_id: str, parsed_files: List[dict]) -> set:
+    """
+    Attach a SalesReport to every parsed ads file (parsed["report_id"]).
+    Re-uploading the same file reuses its report. Returns the ids created now.
+    """
+    created = set()
+    for parsed in parsed_files:
+        report, is_new = ImportReportService.open(
+            db, user_id, store_id, "shopee_ads", parsed["filename"], parsed["file_hash"]
+        )
+        parsed["report_id"] = report.id
+        if is_new:
+            created.add(report.id)
+    return created
+
+
+def _close_ads_reports(db: Session, parsed_files: List[dict], result: dict, new_reports: set) -> None:
+    """Refresh report totals; drop reports created for files that imported nothing"""
+    imported = {}
+    for parsed, counts in zip(parsed_files, result["files"]):
+        imported[parsed["report_id"]] = imported.get(parsed["report_id"], 0) + counts["imported"]
+    for report_id, count in imported.items():
+        report = db.get(SalesReport, report_id)
+        if count == 0 and report_id in new_reports:
+            db.delete(report)
+        else:
+            ImportReportService.refresh_totals(db, report)
+
+
+def _ads_summary(result: dict) -> str:
+    summary_msg = f"Berhasil import {result['rows_imported']} data."
+    if result["products_created"] > 0:
+        summary_msg += f" {result['products_created']} Produk baru otomatis dibuat."
+    if result["rows_skipped"] > 0:
+        summary_msg += f" {result['rows_skipped']} data dilewati (Duplikat atau error)."
+    return summary_msg
+
+def _read_sales_frame(filename: str, contents: bytes) -> pd.DataFrame:
+    """Read the daily table of a Shopee sales overview report (CSV or Excel)"""
+    filename = filename.lower()
+    if filename.endswith('.csv'):
+        # For CSV: First scan to find header row, then re-read properly
+        try:
+            content_str = contents.decode('utf-8-sig')
+        except UnicodeDecodeError:
+            content_str = contents.decode('latin-1')
+        
+        lines = content_str.splitlines()
+        header_idx = -1
+        
+        # Find the header row containing 'Tanggal'
+        for i, line in enumerate(lines):
+            if 'Tanggal' in line:
+                header_idx = i
+                break
+        
+        if header_idx == -1:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Format file CSV tidak dikenali. Kolom 'Tanggal' tidak ditemukan."
+            )
+        
+        # Re-read CSV with proper skiprows
+        df = pd.read_csv(io.StringIO(content_str), skiprows=header_idx)
+    else:
+        df = pd.read_excel(io.BytesIO(contents))
+        
+        # For Excel: Find header row containing 'Tanggal'
+        header_idx = -1
+        for i, row in df.iterrows():
+            if 'Tanggal' in row.values:
+                header_idx = i
+                break
+        
+        if header_idx == -1:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Format file tidak dikenali. Kolom 'Tanggal' tidak ditemukan."
+            )
+        
+        df.columns = df.iloc[header_idx]
+        df = df.iloc[header_idx + 1:]
+
+    return df
+
+
+def _apply_sales_frame(
+    db: Session, user_id: int, store_id: str, df: pd.DataFrame, report_id: int = None,
+    progress: ImportProgress = NULL_PROGRESS
+) -> dict:
+    """Upsert StorePerformance rows from a sales overview table, linked to report_id (no commit)"""
+    # Mapping logic
     imported_count = 0
-    skipped_count = 0
-    product_stats = []
+    total_rev = 0
+    total_gross = 0
+    conversions = []
     
+    dates_found = []
+
+    for _, row in df.iterrows():
+        try:
+            raw_date = str(row['Tanggal']).strip()
+            if not raw_date or raw_date == 'nan':
+                continue
+            
+            # Shopee date format is often DD-MM-YYYY
+            try:
+                processed_date = None
+                for fmt in ("%d-%m-%Y", "%Y-%m-%d"):
+                    try:
+                        processed_date = datetime.strptime(raw_date, fmt).date()
+                        break
+                    except ValueError:
+                        continue
+                
+                if not processed_date:
+                    progress.row(False, f"Tanggal '{raw_date}' tidak dikenali")
+                    continue
+            except:
+                progress.row(False, f"Tanggal '{raw_date}' tidak dikenali")
+                continue
+
+            def parse_num(val):
+                if pd.isna(val): return 0
+                if isinstance(val, (int, float)): return val
+                cleaned = str(val).replace('.', '').replace(',', '.')
+                try:
+                    return float(cleaned)
+                except:
+                    return 0
+
+            # Net Revenue = Penjualan (Pesanan Siap Dikirim)
+            # Gross Revenue = Penjualan (Pesanan Dibuat)
+            revenue_net = parse_num(row.get('Penjualan (Pesanan Siap Dikirim) (IDR)', 0))
+            revenue_gross = parse_num(row.get('Penjualan (Pesanan Dibuat) (IDR)', 0))
+            
+            visitors = int(parse_num(row.get('Total Pengunjung (Kunjungan)', 0)))
+            orders = int(parse_num(row.get('Pesanan (COD Dibuat + non-COD Dibayar)', 0)))
+            conv_rate = parse_num(row.get('Tingkat Konversi', 0))
+            if conv_rate > 1: # percentage format 50.5
+                conv_rate = conv_rate / 100
+
+            # Update or create performance entry
+            perf = db.query(StorePerformance).filter(
+                StorePerformance.store_id == store_id,
+                StorePerformance.user_id == user_id,
+                StorePerformance.date == processed_date
+            ).first()
+
+            if perf:
+                perf.visitors = visitors
+                perf.orders = orders
+                perf.revenue = revenue_net
+                perf.gross_revenue = revenue_gross
+                perf.conversion_rate = conv_rate
+                perf.report_id = report_id
+            else:
+                perf = StorePerformance(
+                    user_id=user_id,
+                    store_id=store_id,
+                    date=processed_date,
+                    visitors=visitors,
+                    orders=orders,
+                    revenue=revenue_net,
+                    gross_revenue=revenue_gross,
+                    conversion_rate=conv_rate,
+                    report_id=report_id
+                )
+                db.add(perf)
+            
+            dates_found.append(processed_date)
+            imported_count += 1
+            total_rev += revenue_net
+            total_gross += revenue_gross
+            conversions.append(conv_rate)
+            progress.row()
+
+        except Exception as e:
+            print(f"Row skip error: {e}")
+            progress.row(False, str(e))
+            continue
+
+    return {
+        "imported_count": imported_count,
+        "total_revenue": total_rev,
+        "total_gross": total_gross,
+        "conversions": conversions,
+        "dates": dates_found,
+    }
+
+
+def _read_product_frame(filename: str, contents: bytes) -> pd.DataFrame:
+    """Read the product table of a Shopee product performance report (CSV or Excel)"""
+    filename = filename.lower()
+    if filename.endswith('.csv'):
+        # For CSV: First scan to find header row, then re-read properly
+        try:
+            content_str = contents.decode('utf-8-sig')
+        except UnicodeDecodeError:
+            content_str = contents.decode('latin-1')
+        
+        lines = content_str.splitlines()
+        header_idx = -1
+        
+        # Find the header row containing 'Nama Produk' or 'Product Name'
+        for i, line in enumerate(lines):
+            if 'Nama Produk' in line or 'Product Name' in line:
+                header_idx = i
+                break
+        
+        if header_idx != -1:
+            df = pd.read_csv(io.StringIO(content_str), skiprows=header_idx)
+        else:
+            # No header found, read normally
+            df = pd.read_csv(io.StringIO(content_str))
+    else:
+        df = pd.read_excel(io.BytesIO(contents))
+        
+        # For Excel: Shopee Product report often has metadata rows
+        header_idx = -1
+        for i, row in df.iterrows():
+            if 'Nama Produk' in row.values or 'Product Name' in row.values:
+                header_idx = i
+                break
+        
+        if header_idx != -1:
+            df.columns = df.iloc[header_idx]
+            df = df.iloc[header_idx + 1:]
+
     # Validate required columns exist
     required_cols = ['Nama Produk', 'Product Name']
     has_required_col = any(col in df.columns for col in required_cols)
@@ -372,9 +841,22 @@ async def import_shopee_product_sales(
             detail="Format file tidak sesuai. Kolom 'Nama Produk' tidak ditemukan. Pastikan file adalah Laporan Performa Produk dari Shopee."
         )
 
+    return df
+
+
+def _apply_product_frame(
+    db: Session, user_id: int, store_id: str, df: pd.DataFrame, report_id: int = None,
+    progress: ImportProgress = NULL_PROGRESS
+) -> tuple:
+    """Upsert ProductPerformance rows from a product performance table, linked to report_id (no commit)"""
+    # Mapping logic: Try 'Nama Produk' or 'SKU Ibu'
+    imported_count = 0
+    skipped_count = 0
+    product_stats = []
+    
     # Get all products for this user for mapping
-    user_products = db.query(Product).filter(Product.user_id == current_user.id).all()
-    product_map = {p.nama.lower(): p.id for p in user_products}
+    user_products = db.query(Product).filter(Product.user_id == user_id).all()
+    product_index = ProductNameIndex.from_products(user_products)
 
     for _, row in df.iterrows():
         try:
@@ -382,9 +864,10 @@ async def import_shopee_product_sales(
             if not raw_name or raw_name == 'nan':
                 continue
             
-            product_id = product_map.get(raw_name.lower())
+            product_id = product_index.lookup(raw_name)
             if not product_id:
                 skipped_count += 1
+                progress.row(False, f"Produk '{raw_name}' tidak terdaftar di MartTool")
                 continue
 
             def parse_num(val):
@@ -412,7 +895,7 @@ async def import_shopee_product_sales(
             perf = db.query(ProductPerformance).filter(
                 ProductPerformance.product_id == product_id,
                 ProductPerformance.store_id == store_id,
-                ProductPerformance.user_id == current_user.id,
+                ProductPerformance.user_id == user_id,
                 ProductPerformance.date == record_date
             ).first()
 
@@ -420,15 +903,17 @@ async def import_shopee_product_sales(
                 perf.revenue = revenue
                 perf.orders = orders
                 perf.visitors = visitors
+                perf.report_id = report_id
             else:
                 perf = ProductPerformance(
-                    user_id=current_user.id,
+                    user_id=user_id,
                     product_id=product_id,
                     store_id=store_id,
                     date=record_date,
                     revenue=revenue,
                     orders=orders,
-                    visitors=visitors
+                    visitors=visitors,
+                    report_id=report_id
                 )
                 db.add(perf)
             
@@ -438,313 +923,115 @@ async def import_shopee_product_sales(
                 "product_name": raw_name,
                 "revenue": revenue
             })
+            progress.row()
 
         except Exception as e:
             print(f"Row product skip error: {e}")
+            progress.row(False, str(e))
             continue
 
-    db.commit()
+    return imported_count, skipped_count
 
-    return ProductSalesImportResponse(
-        store_id=store_id,
-        rows_imported=imported_count,
-        rows_skipped=skipped_count,
-        summary=f"Berhasil mengimpor {imported_count} produk. {skipped_count} produk dilewati karena tidak terdaftar di MartTool."
-    )
+@router.get("/archives", response_model=List[ReportArchiveResponse])
+def get_archives(
+    store_id: str = None,
+    report_type: str = None,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """List archived raw reports, newest first"""
+    query = db.query(ReportArchive).filter(ReportArchive.user_id == current_user.id)
+    if store_id:
+        query = query.filter(ReportArchive.store_id == store_id)
+    if report_type:
+        query = query.filter(ReportArchive.report_type == report_type)
+    return query.order_by(ReportArchive.archived_at.desc()).all()
 
-@router.post("/shopee-ads", response_model=AdsImportResponse)
-async def import_ads(
-    store_id: str = Form(...),
-    file: UploadFile = File(...),
+
+@router.post("/archives/{archive_id}/reimport", response_model=ArchiveReimportResponse)
+def reimport_archive(
+    archive_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
-    Generic Import Ads Report Endpoint.
-    Automatically detects marketplace based on Store ID and selects appropriate parser.
-    Currently supports: Shopee.
+    Re-import an archived report from its Parquet table (no re-upload, no CSV parsing).
+    Rows from the previous import of the same file are deleted first, so the
+    result is the same as importing the file once.
     """
-    # Validate store & Identify Marketplace
-    store = db.query(Store).filter(
-        Store.id == store_id,
-        Store.user_id == current_user.id
+    archive = db.query(ReportArchive).filter(
+        ReportArchive.id == archive_id,
+        ReportArchive.user_id == current_user.id
     ).first()
-    
-    if not store:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Store tidak ditemukan"
-        )
+    if not archive:
+        raise HTTPException(status_code=404, detail="Arsip laporan tidak ditemukan")
+    return _reimport_archive(db, current_user.id, archive)
 
-    # Dispatcher Logic
-    marketplace_id = store.marketplace_id.lower()
-    
-    # Read file content
-    try:
-        contents = await file.read()
-        filename = file.filename.lower()
-        
-        # Prepare content string for CSVs
-        content_str = ""
-        if filename.endswith('.csv'):
-             # Use utf-8-sig to handle BOM if present, and errors='replace' for safety
-             content_str = contents.decode('utf-8-sig', errors='replace')
-    except Exception as e:
-         raise HTTPException(status_code=400, detail=f"Gagal membaca file: {str(e)}")
-
-    if "shopee" in marketplace_id:
-        return _parse_shopee_ads(db, current_user, store_id, filename, contents, content_str)
-    elif "tokopedia" in marketplace_id:
-        raise HTTPException(status_code=400, detail="Import Tokopedia Ads belum didukung. Harap berikan contoh file CSV untuk pengembangan.")
-    elif "tiktok" in marketplace_id:
-        raise HTTPException(status_code=400, detail="Import TikTok Ads belum didukung. Harap berikan contoh file CSV untuk pengembangan.")
-    else:
-        # Defaults to Shopee or Error? Error is safer.
-        # But if marketplace not set correctly, fallback logic might be needed.
-        # For now, strict check.
-        raise HTTPException(status_code=400, detail=f"Marketplace '{marketplace_id}' belum didukung untuk import otomatis.")
 
+@router.post("/reports/{report_id}/reimport", response_model=ArchiveReimportResponse)
+def reimport_report(
+    report_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Replace the rows of an imported report with a fresh import of its archived file"""
+    report = db.query(SalesReport).filter(
+        SalesReport.id == report_id,
+        SalesReport.user_id == current_user.id
+    ).first()
+    if not report:
+        raise HTTPException(status_code=404, detail="Laporan tidak ditemukan")
 
-def _parse_shopee_ads(db, current_user, store_id, filename, contents, content_str):
-    """
-    Internal helper to parse Shopee Ads CSV.
-    Primary format: CSV. Excel check explicitly secondary.
-    """
-    if filename.endswith('.csv'):
-        # Use splitlines to handle various newline formats (\n, \r\n) safely
-        lines = content_str.splitlines()
-    elif filename.endswith('.xlsx') or filename.endswith('.xls'):
-        # ... existing excel logic ...
-        df_raw = pd.read_excel(io.BytesIO(contents), header=None)
-        lines = df_raw.fillna('').astype(str).apply(lambda x: ','.join(x), axis=1).tolist()
-    else:
-        raise HTTPException(status_code=400, detail="Format file tidak didukung. Harap gunakan file .csv (Format Standar Shopee).")
+    archive = ReportArchiveService.get(db, current_user.id, report.report_type, report.file_hash)
+    if not archive:
+        raise HTTPException(status_code=404, detail="Arsip file untuk laporan ini tidak ditemukan, silakan upload ulang")
+    return _reimport_archive(db, current_user.id, archive)
 
-    # Metadata extraction
-    start_date_str = None
-    end_date_str = None
-    period_found = False
-    
-    metadata_product_name = None
-    metadata_product_id = None
-    
-    # Header row index for data
-    header_idx = -1
-    
-    for i, line in enumerate(lines):
-        clean_line = line.strip()
-        
-        # Extract Period
-        if "Periode" in clean_line:
-            try:
-                parts = clean_line.split(',')
-                for part in parts:
-                    if " - " in part:
-                        date_parts = part.strip().split(' - ')
-                        if len(date_parts) == 2:
-                            def to_iso(d_str):
-                                d_str = d_str.strip()
-                                d_str = d_str.split(' ')[0] 
-                                return datetime.strptime(d_str, "%d/%m/%Y").strftime("%Y-%m-%d")
-
-                            start_date_str = to_iso(date_parts[0])
-                            end_date_str = to_iso(date_parts[1])
-                            period_found = True
-            except:
-                pass
-        
-        # Extract Metadata Product Name
-        # Format: Nama Iklan,"Rak helm..."
-        if "Nama Iklan" in clean_line and header_idx == -1: # Metadata section only
-             # Naive csv split might break on quotes. 
-             # But for single line simple parsing:
-             # Look for first comma
-             parts = clean_line.split(',', 1)
-             if len(parts) > 1 and "Nama Iklan" in parts[0]:
-                 metadata_product_name = parts[1].strip().strip('"')
-
-        # Extract Metadata Product ID
-        # Format: No. Produk,29351024010
-        if "No. Produk" in clean_line and header_idx == -1:
-             parts = clean_line.split(',', 1)
-             if len(parts) > 1 and "No. Produk" in parts[0]:
-                 metadata_product_id = parts[1].strip().strip('"')
-
-        if "Penempatan Iklan" in clean_line or "Urutan" in clean_line:
-            header_idx = i
-            break
-            
-    if header_idx == -1:
-         raise HTTPException(status_code=400, detail="Format Shopee tidak dikenali. Header tabel tidak ditemukan.")
 
-    # Parse Data
+def _reimport_archive(db: Session, user_id: int, archive: ReportArchive) -> ArchiveReimportResponse:
+    """Delete the rows of the archive's report (one DELETE per table) and import the Parquet table again"""
     try:
-        if filename.endswith('.csv'):
-             df = pd.read_csv(io.StringIO(content_str), skiprows=header_idx)
-        else:
-             df = pd.read_excel(io.BytesIO(contents), skiprows=header_idx)
-    except Exception as e:
-         raise HTTPException(status_code=400, detail=f"Gagal memparsing data tabel: {e}")
+        df, metadata = ReportArchiveService.load(archive)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="File arsip laporan tidak ditemukan di server")
 
-    # Clean column names (strip whitespace and hidden chars)
-    df.columns = [str(c).strip() for c in df.columns]
+    if archive.report_type not in ("shopee_ads", "shopee_sales", "shopee_products"):
+        raise HTTPException(status_code=400, detail=f"Tipe laporan '{archive.report_type}' tidak didukung")
 
-    # Prepare logic
-    imported_count = 0
-    skipped_count = 0
-    created_products_count = 0
-    total_spend = 0
-    total_gmv = 0
-    
-    # User's products for mapping
-    user_products = db.query(Product).filter(Product.user_id == current_user.id).all()
-    # Map name to ID
-    product_map = {p.nama.lower().strip(): p.id for p in user_products}
-    
-    def parse_num(val):
-        if pd.isna(val) or val == '-': return 0
-        if isinstance(val, (int, float)): return val
-        s = str(val).strip()
-        if '%' in s:
-            s = s.replace('%', '')
-            try: return float(s) / 100
-            except: return 0
-        try: 
-            # Remove thousand separators
-            s = s.replace(',', '')
-            return float(s)
-        except: return 0
-
-    import uuid
+    report, is_new = ImportReportService.open(
+        db, user_id, archive.store_id, archive.report_type, archive.filename, archive.file_hash
+    )
+    rows_replaced = 0 if is_new else ImportReportService.clear_rows(db, report.id)
 
-    for _, row in df.iterrows():
-        try:
-            # 1. Identify Product
-            # Priority: Column 'Nama Iklan' > Metadata Product Name
-            raw_app_name = str(row.get('Nama Iklan', ''))
-            
-            # If empty or not present in columns, fallback to metadata
-            if not raw_app_name or raw_app_name == 'nan' or raw_app_name == 'None':
-                if metadata_product_name:
-                    raw_app_name = metadata_product_name
-                else:
-                    # Generic fallback if no name found anywhere
-                    raw_app_name = "Unknown Product"
-
-            # Match
-            clean_name = raw_app_name.strip()
-            lower_name = clean_name.lower()
-            product_id = product_map.get(lower_name)
-            
-            if not product_id:
-                # PRODUCT NOT FOUND -> AUTO CREATE
-                # Use metadata ID if available, else random UUID
-                new_id = metadata_product_id if metadata_product_id else str(uuid.uuid4())[:12]
-                
-                # Check if this ID already exists (collision check)
-                collision = db.query(Product).filter(Product.id == new_id, Product.user_id == current_user.id).first()
-                if collision:
-                    new_id = str(uuid.uuid4())[:12]
-                
-                new_product = Product(
-                    id=new_id,
-                    user_id=current_user.id,
-                    nama=clean_name
-                )
-                db.add(new_product)
-                db.flush() 
-                
-                # Update map so next rows use this new product
-                product_map[lower_name] = new_id
-                product_id = new_id
-                created_products_count += 1
-
-            # 2. Extract Metrics
-            # Determine campaign name: Column 'Nama Iklan' OR 'Kata Pencarian/Penempatan'
-            # In single product report, 'Kata Pencarian' is the differentiator
-            campaign_col = row.get('Kata Pencarian/Penempatan', row.get('Kata Pencarian', ''))
-            
-            # If generic Bulk report, 'Nama Iklan' is usually the campaign/product identifier
-            if metadata_product_name:
-                # Single Product Report mode: "Nama Iklan" is the product, "Kata Pencarian" is the sub-entity
-                campaign_name = str(campaign_col) if not pd.isna(campaign_col) else 'General'
-            else:
-                # Bulk Report mode: "Nama Iklan" serves as campaign
-                campaign_name = str(row.get('Nama Iklan', 'Imported'))
-
-            spend = parse_num(row.get('Biaya', 0))
-            gmv = parse_num(row.get('Omzet Penjualan', 0))
-            orders = int(parse_num(row.get('Konversi', row.get('Pesanan', 0))))
-            impressions = int(parse_num(row.get('Dilihat', 0)))
-            clicks = int(parse_num(row.get('Jumlah Klik', 0)))
-            ctr = parse_num(row.get('Persentase Klik', 0))
-            
-            direct_conv = int(parse_num(row.get('Konversi Langsung', 0)))
-            items_sold = int(parse_num(row.get('Produk Terjual', 0)))
-            
-            # 3. Double Input Prevention
-            if start_date_str and end_date_str:
-                existing = db.query(Ad).filter(
-                    Ad.store_id == store_id,
-                    Ad.product_id == product_id,
-                    Ad.start_date == start_date_str,
-                    Ad.end_date == end_date_str,
-                    Ad.campaign == campaign_name,
-                    Ad.user_id == current_user.id
-                ).first()
-                
-                if existing:
-                    skipped_count += 1
-                    continue
-            
-            # 4. Create Record
-            new_ad = Ad(
-                user_id=current_user.id,
-                store_id=store_id,
-                product_id=product_id,
-                campaign=campaign_name,
-                spend=spend,
-                gmv=gmv,
-                orders=orders,
-                total_sales=0, 
-                impressions=impressions,
-                clicks=clicks,
-                ctr=ctr,
-                direct_conversions=direct_conv,
-                items_sold=items_sold,
-                start_date=start_date_str,
-                end_date=end_date_str
-            )
-            
-            db.add(new_ad)
-            
-            total_spend += spend
-            total_gmv += gmv
-            imported_count += 1
-            
-        except Exception as row_e:
-            print(f"Row error: {row_e}")
-            skipped_count += 1
-            continue
+    if archive.report_type == "shopee_ads":
+        rows, rows_failed = AdsImportService.rows_from_frame(df, metadata)
+        parsed = {
+            "filename": archive.filename, **metadata, "rows": rows, "rows_failed": rows_failed,
+            "report_id": report.id
+        }
+        result = AdsImportService.write_ads(db, user_id, archive.store_id, [parsed])
+        rows_imported, rows_skipped = result["rows_imported"], result["rows_skipped"]
+    elif archive.report_type == "shopee_sales":
+        result = _apply_sales_frame(db, user_id, archive.store_id, df, report.id)
+        rows_imported, rows_skipped = result["imported_count"], 0
+    else:
+        rows_imported, rows_skipped = _apply_product_frame(db, user_id, archive.store_id, df, report.id)
 
-    if imported_count > 0 or created_products_count > 0:
-        db.commit()
-    
-    summary_msg = f"Berhasil import {imported_count} data."
-    if created_products_count > 0:
-        summary_msg += f" {created_products_count} Produk baru otomatis dibuat."
-    if skipped_count > 0:
-        summary_msg += f" {skipped_count} data dilewati (Duplikat atau error)."
+    ImportReportService.refresh_totals(db, report)
+    db.commit()
 
-    return AdsImportResponse(
-        store_id=store_id,
-        rows_imported=imported_count,
-        rows_skipped=skipped_count,
-        total_spend=total_spend,
-        total_gmv=total_gmv,
-        summary=summary_msg
+    return ArchiveReimportResponse(
+        archive_id=archive.id,
+        report_id=report.id,
+        report_type=archive.report_type,
+        rows_replaced=rows_replaced,
+        rows_imported=rows_imported,
+        rows_skipped=rows_skipped,
+        summary=f"Berhasil import ulang {rows_imported} data dari arsip '{archive.filename}' "
+                f"({rows_replaced} data lama diganti). {rows_skipped} data dilewati."
     )
 
+
 @router.delete("/reports/{report_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_sales_report(
     report_id: int,
@@ -752,7 +1039,7 @@ def delete_sales_report(
     current_user: User = Depends(get_current_user)
 ):
     """
-    Delete a sales report and its associated metrics record.
+    Delete an imported report together with every performance/ads row it produced.
     Allows user to re-upload if needed.
     """
     report = db.query(SalesReport).filter(
@@ -763,6 +1050,6 @@ def delete_sales_report(
     if not report:
         raise HTTPException(status_code=404, detail="Laporan tidak ditemukan")
         
-    db.delete(report)
+    ImportReportService.delete(db, report)
     db.commit()
     return None
@@ -6,8 +6,9 @@ from sqlalchemy.orm import Session
 from typing import List
 
 from ..database import get_db
-from ..models import MarketplaceCostType, User
+from ..models import MarketplaceCostType, StoreProductMarketplaceCost, User
 from ..schemas.marketplace_cost_type import MarketplaceCostTypeCreate, MarketplaceCostTypeUpdate, MarketplaceCostTypeResponse
+from ..services.listing_economics_service import ListingEconomicsService
 from ..deps import get_current_user
 
 router = APIRouter(prefix="/marketplace-cost-types", tags=["Marketplace Cost Types"])
@@ -146,5 +147,12 @@ def delete_cost_type(
             detail=f"Cost type dengan ID '{cost_type_id}' tidak ditemukan"
         )
     
+    # Fee rows cascade in the database, so their listings must be marked before they are gone
+    ListingEconomicsService.mark_stale(db, current_user.id, store_product_ids=[
+        sp_id for (sp_id,) in db.query(StoreProductMarketplaceCost.store_product_id).filter(
+            StoreProductMarketplaceCost.cost_type_id == cost_type_id,
+            StoreProductMarketplaceCost.user_id == current_user.id
+        ).distinct()
+    ])
     db.delete(db_cost_type)
     db.commit()
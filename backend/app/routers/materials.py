@@ -1,10 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from typing import List
 
-from ..database import get_db
-from ..models import Material, BOM, User
-from ..schemas.material import MaterialCreate, MaterialUpdate, MaterialResponse
+from ..database import get_db, get_read_db
+from ..models import Material, MaterialPriceHistory, BOM, User
+from ..schemas.material import (
+    MaterialCreate, MaterialUpdate, MaterialResponse, MaterialSearchItem, MaterialSearchResponse, MaterialUsage,
+    MaterialPriceHistoryResponse, MaterialPriceImpactRequest, MaterialPriceImpactResponse
+)
+from ..services.price_history_service import PriceHistoryService
+from ..services.material_impact_service import MaterialImpactService
+from ..services.hpp_service import BOMCycleError
+from ..services.catalog_search_service import CatalogSearchService, DEFAULT_LIMIT, MAX_LIMIT
 from ..deps import get_current_user
 
 router = APIRouter(prefix="/materials", tags=["Materials"])
@@ -42,6 +49,7 @@ def create_material(
     )
     
     db.add(db_material)
+    PriceHistoryService.record_material(db, db_material, material.effective_from)
     db.commit()
     db.refresh(db_material)
     
@@ -57,6 +65,29 @@ def get_materials(
     return db.query(Material).filter(Material.user_id == current_user.id).all()
 
 
+@router.get("/search", response_model=MaterialSearchResponse)
+def search_materials(
+    q: str = Query("", description="Bagian nama atau ID bahan"),
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Materials whose nama or id contains q (prefix matches first), one page at a time,
+    each with the number of products using it (details: GET /materials/{id}/usage)
+    """
+    items, total = CatalogSearchService.search(db, Material, current_user.id, q, limit, offset)
+    counts = MaterialImpactService.usage_counts(db, [m.id for m in items], current_user.id)
+    return MaterialSearchResponse(
+        items=[
+            MaterialSearchItem.model_validate(m).model_copy(update={"product_count": counts.get(m.id, 0)})
+            for m in items
+        ],
+        total=total, limit=limit, offset=offset
+    )
+
+
 @router.get("/{material_id}", response_model=MaterialResponse)
 def get_material(
     material_id: str, 
@@ -105,11 +136,86 @@ def update_material(
     
     db_material.harga_satuan = db_material.harga_total / db_material.jumlah_unit
     
+    # Price changes are kept as effective-dated history for point-in-time HPP
+    if material.harga_total is not None or material.jumlah_unit is not None:
+        PriceHistoryService.record_material(db, db_material, material.effective_from)
+    
     db.commit()
     db.refresh(db_material)
     return db_material
 
 
+@router.get("/{material_id}/price-history", response_model=List[MaterialPriceHistoryResponse])
+def get_material_price_history(
+    material_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get effective-dated price history of a material, newest first"""
+    return db.query(MaterialPriceHistory).filter(
+        MaterialPriceHistory.material_id == material_id,
+        MaterialPriceHistory.user_id == current_user.id
+    ).order_by(MaterialPriceHistory.effective_from.desc(), MaterialPriceHistory.id.desc()).all()
+
+
+@router.get("/{material_id}/usage", response_model=List[MaterialUsage])
+def get_material_usage(
+    material_id: str,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Products using the material directly in their BOM, with its share of their HPP"""
+    db_material = db.query(Material).filter(
+        Material.id == material_id,
+        Material.user_id == current_user.id
+    ).first()
+    if not db_material:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Material tidak ditemukan"
+        )
+    try:
+        return MaterialImpactService.usage(db, db_material, current_user.id)
+    except BOMCycleError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.post("/{material_id}/price-impact", response_model=MaterialPriceImpactResponse)
+def material_price_impact(
+    material_id: str,
+    request: MaterialPriceImpactRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Preview a material price change before saving it.
+    Returns the HPP delta of every product that uses the material (directly or via
+    sub-assemblies) and new profit, margin and grade of each of their listings.
+    Nothing is written.
+    """
+    db_material = db.query(Material).filter(
+        Material.id == material_id,
+        Material.user_id == current_user.id
+    ).first()
+    if not db_material:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Material tidak ditemukan"
+        )
+    if request.harga_total is None and request.jumlah_unit is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Isi harga_total dan/atau jumlah_unit yang baru"
+        )
+    
+    try:
+        return MaterialImpactService.price_impact(
+            db, db_material, current_user.id, request.harga_total, request.jumlah_unit
+        )
+    except BOMCycleError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
 @router.delete("/{material_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_material(
     material_id: str, 
@@ -24,7 +24,7 @@ def calculate_forward_pricing(
     current_user: User = Depends(get_current_user)
 ):
     """Calculate forward pricing for a store product."""
-    result = PricingService.calculate_forward_pricing(db, request.store_product_id, current_user.id)
+    result = PricingService.calculate_forward_pricing(db, request.store_product_id, current_user.id, request.as_of)
     
     if not result:
         raise HTTPException(
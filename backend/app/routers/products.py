@@ -1,10 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from collections import defaultdict
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from typing import List
 
-from ..database import get_db
+from ..database import get_db, get_read_db
 from ..models import Product, User
-from ..schemas.product import ProductCreate, ProductUpdate, ProductResponse
+from ..schemas.product import ProductCreate, ProductUpdate, ProductResponse, ProductSearchResponse
+from ..services.catalog_search_service import CatalogSearchService, DEFAULT_LIMIT, MAX_LIMIT
+from ..services.hpp_service import HPPService, BOMCycleError
+from ..services.listing_economics_service import ListingEconomicsService
 from ..deps import get_current_user
 
 router = APIRouter(prefix="/products", tags=["Products"])
@@ -50,33 +54,42 @@ def get_products(
     
     products = db.query(Product).filter(Product.user_id == current_user.id).all()
     
+    # BOM lines, material prices and sub-assembly HPPs are loaded once for all products
+    bom_by_product = defaultdict(list)
+    for bom in db.query(BOM).filter(BOM.user_id == current_user.id).order_by(BOM.id):
+        bom_by_product[bom.product_id].append(bom)
+    materials = {m.id: m for m in db.query(Material).filter(Material.user_id == current_user.id)}
+    names = {p.id: p.nama for p in products}
+    try:
+        hpp_values = HPPService.calculate_hpp_values(db, list(names), current_user.id)
+    except BOMCycleError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
     # Populate BOM items for each product
     result = []
     for product in products:
-        # Get BOM items for this product
-        bom_items = db.query(BOM).filter(
-            BOM.product_id == product.id,
-            BOM.user_id == current_user.id
-        ).all()
-        
-        # Build BOM item responses with material info
+        # Build BOM item responses with material / sub-assembly info
         bom_responses = []
         total_hpp = 0
-        for bom in bom_items:
-            material = db.query(Material).filter(
-                Material.id == bom.material_id,
-                Material.user_id == current_user.id
-            ).first()
+        for bom in bom_by_product[product.id]:
+            if bom.material_id:
+                material = materials.get(bom.material_id)
+                nama = material.nama if material else None
+                harga_satuan = material.harga_satuan if material else None
+            else:
+                nama = names.get(bom.component_product_id)
+                harga_satuan = hpp_values.get(bom.component_product_id)
             
-            biaya_bahan = bom.qty * material.harga_satuan if material else 0
+            biaya_bahan = bom.qty * harga_satuan if harga_satuan is not None else 0
             total_hpp += biaya_bahan
             
             bom_responses.append(BOMItem(
                 id=bom.id,
                 material_id=bom.material_id,
+                component_product_id=bom.component_product_id,
                 qty=bom.qty,
-                material_nama=material.nama if material else None,
-                material_harga_satuan=material.harga_satuan if material else None,
+                material_nama=nama,
+                material_harga_satuan=harga_satuan,
                 biaya_bahan=biaya_bahan
             ))
         
@@ -92,6 +105,19 @@ def get_products(
     return result
 
 
+@router.get("/search", response_model=ProductSearchResponse)
+def search_products(
+    q: str = Query("", description="Bagian nama atau ID produk"),
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Products whose nama or id contains q (prefix matches first), one page at a time"""
+    items, total = CatalogSearchService.search(db, Product, current_user.id, q, limit, offset)
+    return ProductSearchResponse(items=items, total=total, limit=limit, offset=offset)
+
+
 @router.get("/{product_id}", response_model=ProductResponse)
 def get_product(
     product_id: str, 
@@ -143,7 +169,7 @@ def delete_product(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Delete a product"""
+    """Delete a product with its listings, BOM, ads and performance data (ON DELETE CASCADE)"""
     db_product = db.query(Product).filter(
         Product.id == product_id,
         Product.user_id == current_user.id
@@ -154,6 +180,14 @@ def delete_product(
             detail="Product tidak ditemukan"
         )
     
+    # Check if used as a sub-assembly in another product's BOM
+    if db_product.used_in_bom:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Product masih digunakan sebagai komponen di BOM produk lain"
+        )
+    
+    ListingEconomicsService.discard(db, current_user.id, product_id=product_id)
     db.delete(db_product)
     db.commit()
 
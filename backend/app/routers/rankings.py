@@ -0,0 +1,68 @@
+"""
+Rankings Router - Top-N ads products, listings and keywords
+"""
+from datetime import date
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from ..database import get_read_db
+from ..models import User
+from ..schemas.ranking import AdsProductRank, KeywordRank, ListingRank
+from ..services.ranking_service import RankingService, DEFAULT_LIMIT, MAX_LIMIT
+from ..deps import get_current_user
+
+router = APIRouter(prefix="/rankings", tags=["Rankings"])
+
+
+@router.get("/ads-products", response_model=List[AdsProductRank])
+def rank_ads_products(
+    metric: Literal["ads_loss", "ads_profit", "spend", "roas", "acos"] = "ads_loss",
+    order: Optional[Literal["asc", "desc"]] = None,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    store_id: str = None,
+    date_from: date = Query(None, alias="from", description="Periode iklan overlap mulai tanggal ini"),
+    date_to: date = Query(None, alias="to", description="Periode iklan overlap sampai tanggal ini"),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Ads products per store ranked by ads profit/loss, spend, ROAS or ACOS.
+    Default order puts the worst first (e.g. metric=ads_loss: biggest loss).
+    """
+    return RankingService.ads_products(
+        db, current_user.id, metric, order, limit, store_id, date_from, date_to
+    )
+
+
+@router.get("/listings", response_model=List[ListingRank])
+def rank_listings(
+    metric: Literal["margin", "profit", "break_even_roas"] = "margin",
+    order: Optional[Literal["asc", "desc"]] = None,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    store_id: str = None,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Listings ranked by margin, profit per order or break-even ROAS (default: lowest margin first)"""
+    return RankingService.listings(db, current_user.id, metric, order, limit, store_id)
+
+
+@router.get("/keywords", response_model=List[KeywordRank])
+def rank_keywords(
+    metric: Literal["acos", "spend", "roas", "orders"] = "acos",
+    order: Optional[Literal["asc", "desc"]] = None,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    store_id: str = None,
+    product_id: str = None,
+    min_spend: float = Query(0, ge=0, description="Abaikan keyword dengan total spend di bawah ini"),
+    date_from: date = Query(None, alias="from", description="Periode iklan overlap mulai tanggal ini"),
+    date_to: date = Query(None, alias="to", description="Periode iklan overlap sampai tanggal ini"),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Ads keywords/placements ranked across report periods (default: highest ACOS first)"""
+    return RankingService.keywords(
+        db, current_user.id, metric, order, limit, store_id, product_id, date_from, date_to, min_spend
+    )
@@ -2,16 +2,22 @@
 StoreProductMarketplaceCosts Router - CRUD operations for product-specific marketplace costs
 """
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import and_, insert, select, update
 from sqlalchemy.orm import Session
 from typing import List
 
 from ..database import get_db
-from ..models import StoreProductMarketplaceCost, StoreProduct, MarketplaceCostType, User
+from ..models import StoreProductMarketplaceCost, StoreProduct, Store, MarketplaceCostType, User
 from ..schemas.store_product_marketplace_cost import (
     StoreProductMarketplaceCostCreate, 
     StoreProductMarketplaceCostUpdate, 
-    StoreProductMarketplaceCostResponse
+    StoreProductMarketplaceCostResponse,
+    StoreProductMarketplaceCostBulkUpdate,
+    StoreProductMarketplaceCostBulkResponse,
+    ListingPricingDelta
 )
+from ..services.pricing_service import PricingService
+from ..services.listing_economics_service import ListingEconomicsService
 from ..deps import get_current_user
 
 router = APIRouter(prefix="/store-product-marketplace-costs", tags=["Store Product Marketplace Costs"])
@@ -96,6 +102,128 @@ def get_product_costs(
     return responses
 
 
+@router.put("/bulk", response_model=StoreProductMarketplaceCostBulkResponse)
+def bulk_update_product_costs(
+    request: StoreProductMarketplaceCostBulkUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Set one fee to the same value for every listing in a store and/or marketplace.
+    Runs as a single UPDATE and returns profit & margin before/after per affected listing.
+    """
+    if not request.store_id and not request.marketplace_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Pilih store_id dan/atau marketplace_id untuk update massal"
+        )
+
+    cost_type = db.query(MarketplaceCostType).filter(
+        MarketplaceCostType.id == request.cost_type_id,
+        MarketplaceCostType.user_id == current_user.id
+    ).first()
+    if not cost_type:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cost type dengan ID '{request.cost_type_id}' tidak ditemukan"
+        )
+
+    # Listings in scope
+    scope = select(StoreProduct.id).join(
+        Store, (Store.id == StoreProduct.store_id) & (Store.user_id == StoreProduct.user_id)
+    ).where(StoreProduct.user_id == current_user.id)
+    if request.store_id:
+        scope = scope.where(StoreProduct.store_id == request.store_id)
+    if request.marketplace_id:
+        scope = scope.where(Store.marketplace_id == request.marketplace_id)
+    scope = scope.subquery()
+
+    # Current values of this fee per listing (empty list = listing does not have the fee)
+    old_values = {}
+    for sp_id, value in db.execute(
+        select(scope.c.id, StoreProductMarketplaceCost.value).outerjoin(
+            StoreProductMarketplaceCost, and_(
+                StoreProductMarketplaceCost.store_product_id == scope.c.id,
+                StoreProductMarketplaceCost.user_id == current_user.id,
+                StoreProductMarketplaceCost.cost_type_id == request.cost_type_id
+            )
+        )
+    ):
+        values = old_values.setdefault(sp_id, [])
+        if value is not None:
+            values.append(value)
+
+    result = db.execute(
+        update(StoreProductMarketplaceCost).where(
+            StoreProductMarketplaceCost.user_id == current_user.id,
+            StoreProductMarketplaceCost.cost_type_id == request.cost_type_id,
+            StoreProductMarketplaceCost.store_product_id.in_(select(scope.c.id))
+        ).values(value=request.value).execution_options(synchronize_session=False)
+    )
+    rows_updated = result.rowcount
+
+    missing = [sp_id for sp_id, values in old_values.items() if not values]
+    rows_created = 0
+    if request.create_missing and missing:
+        db.execute(insert(StoreProductMarketplaceCost), [
+            {
+                "store_product_id": sp_id,
+                "cost_type_id": request.cost_type_id,
+                "user_id": current_user.id,
+                "value": request.value,
+            }
+            for sp_id in missing
+        ])
+        rows_created = len(missing)
+
+    affected = [sp_id for sp_id, values in old_values.items() if values or request.create_missing]
+    ListingEconomicsService.mark_stale(db, current_user.id, store_product_ids=affected)
+    priced = PricingService.calculate_forward_pricing_batch(db, affected, current_user.id)
+    db.commit()
+
+    listings = []
+    for sp_id in affected:
+        after = priced.get(sp_id)
+        if not after:
+            continue
+        values = old_values[sp_id]
+        # Profit before = profit after + (this fee now - this fee before); other costs are unchanged
+        fee_after = sum(
+            PricingService.fee_amount(cost_type, request.value, after.harga_jual, after.harga_setelah_diskon)
+            for _ in (values or [None])
+        )
+        fee_before = sum(
+            PricingService.fee_amount(cost_type, v, after.harga_jual, after.harga_setelah_diskon)
+            for v in values
+        )
+        profit_before = after.profit_per_order + fee_after - fee_before
+        margin_before = (profit_before / after.harga_jual * 100) if after.harga_jual > 0 else 0
+        listings.append(ListingPricingDelta(
+            store_product_id=sp_id,
+            store_id=after.store_id,
+            product_id=after.product_id,
+            product_name=after.product_name,
+            old_value=values[0] if values else None,
+            new_value=request.value,
+            profit_before=round(profit_before, 2),
+            profit_after=round(after.profit_per_order, 2),
+            profit_delta=round(after.profit_per_order - profit_before, 2),
+            margin_before=round(margin_before, 2),
+            margin_after=round(after.margin_percent, 2),
+            margin_delta=round(after.margin_percent - margin_before, 2)
+        ))
+
+    return StoreProductMarketplaceCostBulkResponse(
+        cost_type_id=request.cost_type_id,
+        value=request.value,
+        rows_updated=rows_updated,
+        rows_created=rows_created,
+        listings=listings,
+        summary=f"Fee '{cost_type.name}' diubah untuk {rows_updated} listing"
+                + (f" dan ditambahkan ke {rows_created} listing." if rows_created else ".")
+    )
+
+
 @router.put("/{cost_id}", response_model=StoreProductMarketplaceCostResponse)
 def update_product_cost(
     cost_id: int, 
@@ -2,9 +2,11 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
 
-from ..database import get_db
-from ..models import StoreProduct, Store, Product, User
-from ..schemas.store_product import StoreProductCreate, StoreProductUpdate, StoreProductResponse
+from ..database import get_db, get_read_db
+from ..models import StoreProduct, Store, Product, User, ListingEconomics
+from ..schemas.store_product import (
+    StoreProductCreate, StoreProductUpdate, StoreProductResponse, ListingEconomicsResponse
+)
 from ..deps import get_current_user
 
 router = APIRouter(prefix="/store-products", tags=["Store Products"])
@@ -92,6 +94,27 @@ def get_store_products(
     return responses
 
 
+@router.get("/economics", response_model=List[ListingEconomicsResponse])
+def get_listing_economics(
+    store_id: str = None,
+    product_id: str = None,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Profitabilitas per listing dari read model listing_economics
+
+    Satu scan berindeks, tanpa menghitung ulang HPP dan biaya marketplace;
+    read model diperbarui setiap kali input pricing di-commit.
+    """
+    query = db.query(ListingEconomics).filter(ListingEconomics.user_id == current_user.id)
+    if store_id:
+        query = query.filter(ListingEconomics.store_id == store_id)
+    if product_id:
+        query = query.filter(ListingEconomics.product_id == product_id)
+    return query.order_by(ListingEconomics.store_product_id).all()
+
+
 @router.get("/{store_product_id}", response_model=StoreProductResponse)
 def get_store_product(
     store_product_id: int, 
@@ -3,8 +3,10 @@ from sqlalchemy.orm import Session
 from typing import List
 
 from ..database import get_db
-from ..models import Store, Marketplace, User
+from ..models import Store, Marketplace, User, ReportArchive
 from ..schemas.store import StoreCreate, StoreUpdate, StoreResponse
+from ..services.listing_economics_service import ListingEconomicsService
+from ..services.report_archive_service import ReportArchiveService
 from ..deps import get_current_user
 
 router = APIRouter(prefix="/stores", tags=["Stores"])
@@ -134,7 +136,7 @@ def delete_store(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Delete a store"""
+    """Delete a store with its listings, ads, performance data and reports (ON DELETE CASCADE)"""
     db_store = db.query(Store).filter(
         Store.id == store_id,
         Store.user_id == current_user.id
@@ -145,8 +147,20 @@ def delete_store(
             detail="Store tidak ditemukan"
         )
     
+    # Archive catalog rows cascade in the database; their Parquet files do not
+    archive_files = [
+        ReportArchiveService.delete(db, archive)
+        for archive in db.query(ReportArchive).filter(
+            ReportArchive.store_id == store_id,
+            ReportArchive.user_id == current_user.id
+        ).all()
+    ]
+    ListingEconomicsService.discard(db, current_user.id, store_id=store_id)
     db.delete(db_store)
     db.commit()
+    # Files go only once the rows are gone, so a failed commit keeps the archive intact
+    for path in archive_files:
+        ReportArchiveService.remove_file(path)
 
 
 def _build_store_response(store: Store, marketplace: Marketplace) -> StoreResponse:
@@ -0,0 +1,56 @@
+"""
+In-process scheduler for nightly jobs (re-grading into GradeSnapshot)
+
+Runs in a daemon thread of the API process. With several API workers each
+one schedules the job; GradingService.save_snapshots replaces the day's rows,
+so duplicate runs only cost time. Set GRADING_TIME= (empty) to disable and
+run grade_listings.py from cron instead.
+"""
+import logging
+import os
+import threading
+from datetime import datetime, time, timedelta
+from typing import Optional
+
+from .services.grading_service import GradingService
+
+logger = logging.getLogger(__name__)
+
+# Local time of the nightly re-grading, HH:MM; empty disables the scheduler
+GRADING_TIME = os.getenv("GRADING_TIME", "02:00")
+
+_stop = threading.Event()
+_thread: Optional[threading.Thread] = None
+
+
+def _seconds_until(at: time) -> float:
+    now = datetime.now()
+    next_run = datetime.combine(now.date(), at)
+    if next_run <= now:
+        next_run += timedelta(days=1)
+    return (next_run - now).total_seconds()
+
+
+def _run(at: time):
+    while not _stop.wait(_seconds_until(at)):
+        try:
+            written = GradingService.run_all()
+            logger.info("Re-grading selesai: %s snapshot untuk %s user", sum(written.values()), len(written))
+        except Exception:
+            logger.exception("Re-grading terjadwal gagal")
+
+
+def start_scheduler():
+    """Mulai thread scheduler (sekali per proses)"""
+    global _thread
+    if not GRADING_TIME or (_thread and _thread.is_alive()):
+        return
+    at = time.fromisoformat(GRADING_TIME)
+    _stop.clear()
+    _thread = threading.Thread(target=_run, args=(at,), name="grading-scheduler", daemon=True)
+    _thread.start()
+
+
+def stop_scheduler():
+    """Hentikan scheduler; job yang sedang berjalan diselesaikan dulu di thread-nya"""
+    _stop.set()
@@ -2,6 +2,8 @@
 Ad Schemas
 """
 from pydantic import BaseModel, Field
+from typing import List
+from datetime import date
 
 
 class AdBase(BaseModel):
@@ -19,8 +21,8 @@ class AdBase(BaseModel):
     ctr: float | None = Field(0.0)
     direct_conversions: int | None = Field(0, ge=0)
     items_sold: int | None = Field(0, ge=0)
-    start_date: str | None = None
-    end_date: str | None = None
+    start_date: date | None = None
+    end_date: date | None = None
 
 
 class AdCreate(AdBase):
@@ -40,8 +42,8 @@ class AdUpdate(BaseModel):
     ctr: float | None = None
     direct_conversions: int | None = Field(None, ge=0)
     items_sold: int | None = Field(None, ge=0)
-    start_date: str | None = None
-    end_date: str | None = None
+    start_date: date | None = None
+    end_date: date | None = None
 
 
 class AdResponse(AdBase):
@@ -63,3 +65,27 @@ class AdsImportResponse(BaseModel):
     total_spend: float
     total_gmv: float
     summary: str
+
+
+class AdsFileImportSummary(BaseModel):
+    filename: str
+    status: str  # 'ok' atau 'error'
+    period_start: str | None = None
+    period_end: str | None = None
+    rows_parsed: int = 0
+    rows_imported: int = 0
+    rows_skipped: int = 0
+    total_spend: float = 0
+    total_gmv: float = 0
+    error: str | None = None
+
+
+class AdsBatchImportResponse(BaseModel):
+    store_id: str
+    files: List[AdsFileImportSummary]
+    rows_imported: int
+    rows_skipped: int
+    products_created: int
+    total_spend: float
+    total_gmv: float
+    summary: str
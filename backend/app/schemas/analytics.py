@@ -0,0 +1,45 @@
+"""
+Analytics Schemas
+"""
+from pydantic import BaseModel
+from datetime import date
+from typing import List, Optional
+
+
+class StoreRollingWindow(BaseModel):
+    window: int  # days, including the current day
+    revenue_avg: float
+    orders_avg: float
+    conversion_rate: Optional[float] = None
+    cancellation_rate: Optional[float] = None
+
+
+class StoreRollingPoint(BaseModel):
+    store_id: str
+    date: date
+    visitors: int
+    orders: int
+    revenue: float  # Net
+    gross_revenue: float
+    conversion_rate: Optional[float] = None
+    cancellation_rate: Optional[float] = None
+    windows: List[StoreRollingWindow]
+
+
+class AdsRollingWindow(BaseModel):
+    window: int
+    spend: float
+    gmv: float
+    orders: int
+    roas: Optional[float] = None
+    acos: Optional[float] = None
+    cpa: Optional[float] = None
+
+
+class AdsRollingPoint(BaseModel):
+    store_id: str
+    date: date  # ads report period start
+    spend: float
+    gmv: float
+    orders: int
+    windows: List[AdsRollingWindow]
@@ -1,14 +1,21 @@
 """
 BOM (Bill of Materials) Schemas
 """
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 
 class BOMBase(BaseModel):
     product_id: str = Field(..., min_length=1, description="ID produk")
-    material_id: str = Field(..., min_length=1, description="ID bahan")
+    material_id: str | None = Field(None, min_length=1, description="ID bahan")
+    component_product_id: str | None = Field(None, min_length=1, description="ID produk sub-assembly")
     qty: float = Field(..., gt=0, description="Jumlah bahan yang digunakan")
 
+    @model_validator(mode="after")
+    def check_material_or_component(self):
+        if (self.material_id is None) == (self.component_product_id is None):
+            raise ValueError("Isi salah satu: material_id atau component_product_id")
+        return self
+
 
 class BOMCreate(BOMBase):
     pass
@@ -24,7 +31,8 @@ class BOMResponse(BOMBase):
     id: int
     material_nama: str | None = None
     material_satuan: str | None = None
-    material_harga_satuan: float | None = None
+    material_harga_satuan: float | None = None  # For sub-assembly lines: HPP of the component
+    component_nama: str | None = None
     biaya_bahan: float | None = None  # qty * harga_satuan
 
     class Config:
@@ -0,0 +1,28 @@
+"""
+Catalog Import Schemas
+"""
+from pydantic import BaseModel
+from typing import List, Optional
+
+
+class CatalogSectionSummary(BaseModel):
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    deleted: int = 0  # BOM lines removed by replace_bom
+
+
+class CatalogRowError(BaseModel):
+    section: str  # 'materials', 'products' atau 'bom'
+    row: int      # Nomor baris di spreadsheet (header = baris 1)
+    message: str
+
+
+class CatalogImportResponse(BaseModel):
+    dry_run: bool
+    materials: Optional[CatalogSectionSummary] = None
+    products: Optional[CatalogSectionSummary] = None
+    bom: Optional[CatalogSectionSummary] = None
+    error_count: int
+    errors: List[CatalogRowError]
+    summary: str
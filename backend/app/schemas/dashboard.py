@@ -0,0 +1,41 @@
+"""
+Dashboard Schemas
+"""
+from pydantic import BaseModel
+from datetime import date
+from typing import List, Optional
+
+
+class DashboardCounts(BaseModel):
+    materials: int
+    products: int
+    stores: int
+    listings: int  # store products
+
+
+class DashboardIssue(BaseModel):
+    type: str  # 'danger', 'warning' atau 'info'
+    msg: str
+    link: str  # halaman frontend untuk menyelesaikan
+    count: Optional[int] = None
+
+
+class DashboardDailyPoint(BaseModel):
+    date: date
+    revenue: float  # Net, semua toko
+    gross_revenue: float
+    orders: int
+
+
+class DashboardSummaryResponse(BaseModel):
+    period_start: date
+    period_end: date
+    counts: DashboardCounts
+    revenue: float  # Net
+    gross_revenue: float
+    orders: int
+    avg_conversion: float
+    cancellation_rate: float  # 1 - net / gross
+    status: str  # 'healthy' atau 'needs_attention'
+    issues: List[DashboardIssue]
+    daily: List[DashboardDailyPoint]
@@ -2,6 +2,7 @@
 Decision & Grading Schemas
 """
 from pydantic import BaseModel, Field
+from datetime import date
 from typing import List, Literal
 
 
@@ -42,3 +43,15 @@ class DecisionResponse(BaseModel):
     # Break-even metrics
     break_even_roas: float
     max_cpa: float
+
+
+class GradeSnapshotResponse(BaseModel):
+    """Grade satu listing pada satu hari (dari re-grading terjadwal)"""
+    snapshot_date: date
+    grade: str
+    margin_percent: float
+    roas: float | None = None
+    profit_per_order: float
+
+    class Config:
+        from_attributes = True
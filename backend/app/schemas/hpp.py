@@ -2,16 +2,17 @@
 HPP Schemas
 """
 from pydantic import BaseModel, Field
-from typing import List
+from typing import List, Optional
 
 
 from .product_extra_cost import ProductExtraCostResponse
 
 
 class BOMDetail(BaseModel):
-    material_id: str
+    material_id: Optional[str] = None
+    component_product_id: Optional[str] = None  # Sub-assembly line: harga_satuan is its HPP
     material_nama: str
-    material_satuan: str
+    material_satuan: Optional[str] = None
     qty: float
     harga_satuan: float
     biaya_bahan: float  # qty * harga_satuan
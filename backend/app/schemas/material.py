@@ -2,6 +2,8 @@
 Material Schemas
 """
 from pydantic import BaseModel, Field, field_validator
+from datetime import date, datetime
+from typing import List
 
 
 class MaterialBase(BaseModel):
@@ -11,8 +13,18 @@ class MaterialBase(BaseModel):
     satuan: str = Field(..., min_length=1, description="Satuan bahan (cm, pcs, gram, dll)")
 
 
+def check_effective_from(value: date | None) -> date | None:
+    """effective_from di masa depan ditolak: perubahan langsung menjadi nilai saat ini"""
+    if value is not None and value > date.today():
+        raise ValueError("effective_from tidak boleh setelah hari ini")
+    return value
+
+
 class MaterialCreate(MaterialBase):
     id: str = Field(..., min_length=1, description="ID unik bahan")
+    effective_from: date | None = Field(None, description="Harga berlaku mulai tanggal ini (default hari ini)")
+
+    _check_effective_from = field_validator("effective_from")(check_effective_from)
 
 
 class MaterialUpdate(BaseModel):
@@ -20,6 +32,9 @@ class MaterialUpdate(BaseModel):
     harga_total: int | None = Field(None, ge=0)
     jumlah_unit: float | None = Field(None, gt=0)
     satuan: str | None = Field(None, min_length=1)
+    effective_from: date | None = Field(None, description="Harga baru berlaku mulai tanggal ini (default hari ini)")
+
+    _check_effective_from = field_validator("effective_from")(check_effective_from)
 
 
 class MaterialResponse(MaterialBase):
@@ -28,3 +43,81 @@ class MaterialResponse(MaterialBase):
 
     class Config:
         from_attributes = True
+
+
+class MaterialSearchItem(MaterialResponse):
+    product_count: int = 0  # produk yang memakai bahan ini langsung di BOM
+
+
+class MaterialSearchResponse(BaseModel):
+    items: List[MaterialSearchItem]
+    total: int  # jumlah bahan yang cocok (semua halaman)
+    limit: int
+    offset: int
+
+
+class MaterialPriceHistoryResponse(BaseModel):
+    id: int
+    material_id: str
+    harga_total: int
+    jumlah_unit: float
+    harga_satuan: float
+    effective_from: date
+    recorded_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class MaterialUsage(BaseModel):
+    product_id: str
+    product_name: str
+    qty: float  # total qty bahan di BOM produk
+    biaya_bahan: float  # qty x harga satuan
+    hpp: float
+    contribution_percent: float  # biaya_bahan / hpp x 100
+
+
+class MaterialPriceImpactRequest(BaseModel):
+    harga_total: int | None = Field(None, ge=0, description="Harga total baru (default: harga saat ini)")
+    jumlah_unit: float | None = Field(None, gt=0, description="Jumlah unit baru (default: jumlah saat ini)")
+
+
+class ProductHPPImpact(BaseModel):
+    product_id: str
+    product_name: str
+    hpp_before: float
+    hpp_after: float
+    hpp_delta: float
+
+
+class ListingPriceImpact(BaseModel):
+    store_product_id: int
+    store_id: str
+    store_name: str
+    product_id: str
+    product_name: str
+    harga_jual: int
+    hpp_before: float
+    hpp_after: float
+    hpp_delta: float
+    profit_before: float
+    profit_after: float
+    profit_delta: float
+    margin_before: float
+    margin_after: float
+    margin_delta: float
+    grade_before: str
+    grade_after: str
+    grade_changed: bool
+
+
+class MaterialPriceImpactResponse(BaseModel):
+    material_id: str
+    material_nama: str
+    harga_satuan_before: float
+    harga_satuan_after: float
+    products: List[ProductHPPImpact]
+    listings: List[ListingPriceImpact]
+    grade_changes: int
+    summary: str
@@ -2,7 +2,8 @@
 Pricing Schemas
 """
 from pydantic import BaseModel, Field
-from typing import List, Literal
+from datetime import date
+from typing import List, Literal, Optional
 
 
 class CostBreakdown(BaseModel):
@@ -16,6 +17,7 @@ class CostBreakdown(BaseModel):
 
 class PricingCalcRequest(BaseModel):
     store_product_id: int = Field(..., description="ID store_product untuk dihitung")
+    as_of: Optional[date] = Field(None, description="Pakai HPP dari harga bahan yang berlaku pada tanggal ini")
 
 
 class PricingCalcResponse(BaseModel):
@@ -39,6 +41,7 @@ class ReversePricingRequest(BaseModel):
     product_id: str = Field(..., min_length=1, description="ID produk")
     target_type: Literal["fixed", "percent"] = Field(..., description="Tipe target: fixed (nominal) atau percent (margin)")
     target_value: float = Field(..., description="Nilai target profit")
+    as_of: Optional[date] = Field(None, description="Pakai HPP dari harga bahan yang berlaku pada tanggal ini")
 
 
 class ReversePricingResponse(BaseModel):
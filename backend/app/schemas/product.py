@@ -20,7 +20,8 @@ class ProductUpdate(BaseModel):
 class BOMItem(BaseModel):
     """Simplified BOM item for product response"""
     id: int
-    material_id: str
+    material_id: Optional[str] = None
+    component_product_id: Optional[str] = None
     qty: float
     material_nama: Optional[str] = None
     material_harga_satuan: Optional[float] = None
@@ -37,3 +38,18 @@ class ProductResponse(ProductBase):
     
     class Config:
         from_attributes = True
+
+
+class ProductSummary(ProductBase):
+    """Produk tanpa BOM/HPP, untuk daftar hasil pencarian"""
+    id: str
+
+    class Config:
+        from_attributes = True
+
+
+class ProductSearchResponse(BaseModel):
+    items: List[ProductSummary]
+    total: int  # jumlah produk yang cocok (semua halaman)
+    limit: int
+    offset: int
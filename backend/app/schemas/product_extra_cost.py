@@ -1,4 +1,7 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
+from datetime import date, datetime
+
+from .material import check_effective_from
 
 
 class ProductExtraCostBase(BaseModel):
@@ -8,11 +11,17 @@ class ProductExtraCostBase(BaseModel):
 
 class ProductExtraCostCreate(ProductExtraCostBase):
     product_id: str
+    effective_from: date | None = Field(None, description="Biaya berlaku mulai tanggal ini (default hari ini)")
+
+    _check_effective_from = field_validator("effective_from")(check_effective_from)
 
 
 class ProductExtraCostUpdate(BaseModel):
     label: str | None = Field(None, min_length=1)
     value: float | None = Field(None, ge=0)
+    effective_from: date | None = Field(None, description="Nilai baru berlaku mulai tanggal ini (default hari ini)")
+
+    _check_effective_from = field_validator("effective_from")(check_effective_from)
 
 
 class ProductExtraCostResponse(ProductExtraCostBase):
@@ -21,3 +30,16 @@ class ProductExtraCostResponse(ProductExtraCostBase):
 
     class Config:
         from_attributes = True
+
+
+class ProductExtraCostHistoryResponse(BaseModel):
+    id: int
+    extra_cost_id: int
+    product_id: str
+    label: str
+    value: float  # 0 marks a deleted cost
+    effective_from: date
+    recorded_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,48 @@
+"""
+Ranking Schemas
+"""
+from pydantic import BaseModel
+from typing import Optional
+
+
+class AdsProductRank(BaseModel):
+    store_id: str
+    product_id: str
+    product_name: Optional[str] = None
+    spend: float
+    gmv: float
+    orders: int
+    roas: Optional[float] = None
+    acos: Optional[float] = None
+    cpa: Optional[float] = None
+    # gmv - (hpp + biaya marketplace) * orders - spend; None jika produk belum ada di toko
+    ads_profit: Optional[float] = None
+    ads_profit_per_order: Optional[float] = None
+
+
+class ListingRank(BaseModel):
+    store_product_id: int
+    store_id: str
+    product_id: str
+    product_name: Optional[str] = None
+    harga_jual: float
+    hpp: float
+    total_biaya_marketplace: float
+    profit_per_order: float
+    margin_percent: float
+    break_even_roas: Optional[float] = None
+
+
+class KeywordRank(BaseModel):
+    keyword_id: int
+    keyword: str
+    spend: float
+    gmv: float
+    direct_gmv: Optional[float] = None  # None jika laporan tidak memuat GMV langsung
+    orders: int
+    impressions: int
+    clicks: int
+    products: int  # produk berbeda yang memakai keyword ini
+    ctr: Optional[float] = None
+    roas: Optional[float] = None
+    acos: Optional[float] = None  # None jika belum ada GMV
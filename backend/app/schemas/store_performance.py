@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from datetime import date
+from datetime import date, datetime
 from typing import List, Optional
 
 class StorePerformanceBase(BaseModel):
@@ -40,6 +40,7 @@ class ProductSalesImportResponse(BaseModel):
 class SalesReportResponse(BaseModel):
     id: int
     store_id: str
+    report_type: str
     filename: str
     period_start: date
     period_end: date
@@ -49,3 +50,26 @@ class SalesReportResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+class ReportArchiveResponse(BaseModel):
+    id: int
+    store_id: str
+    report_type: str
+    file_hash: str
+    filename: str
+    row_count: int
+    column_count: int
+    size_bytes: int
+    archived_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class ArchiveReimportResponse(BaseModel):
+    archive_id: int
+    report_id: int
+    report_type: str
+    rows_replaced: int  # rows of the previous import of this file, deleted before re-importing
+    rows_imported: int
+    rows_skipped: int
+    summary: str
@@ -1,6 +1,8 @@
 """
 StoreProduct Schemas
 """
+from datetime import datetime
+
 from pydantic import BaseModel, Field
 
 
@@ -27,3 +29,25 @@ class StoreProductResponse(StoreProductBase):
 
     class Config:
         from_attributes = True
+
+
+class ListingEconomicsResponse(BaseModel):
+    """Baris read model listing_economics: profitabilitas satu listing"""
+    store_product_id: int
+    store_id: str
+    product_id: str
+    harga_jual: int
+    total_diskon: float
+    harga_setelah_diskon: float
+    fee_percent: float = Field(..., description="Total biaya marketplace persentase (Rp)")
+    fee_fixed: float = Field(..., description="Total biaya marketplace tetap (Rp)")
+    total_biaya_marketplace: float
+    hpp: float
+    profit_per_order: float
+    margin_percent: float
+    break_even_roas: float | None = Field(None, description="Kosong jika profit_per_order <= 0")
+    max_cpa: float
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
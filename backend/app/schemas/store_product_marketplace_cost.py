@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 
 
 class StoreProductMarketplaceCostBase(BaseModel):
@@ -25,3 +25,35 @@ class StoreProductMarketplaceCostResponse(StoreProductMarketplaceCostBase):
 
     class Config:
         from_attributes = True
+
+
+class StoreProductMarketplaceCostBulkUpdate(BaseModel):
+    cost_type_id: str
+    value: float
+    store_id: Optional[str] = None        # Limit to listings in this store
+    marketplace_id: Optional[str] = None  # Limit to listings in stores of this marketplace
+    create_missing: bool = False          # Also add the fee to listings that do not have it yet
+
+
+class ListingPricingDelta(BaseModel):
+    store_product_id: int
+    store_id: str
+    product_id: str
+    product_name: str
+    old_value: Optional[float] = None  # None when the fee was created by this update
+    new_value: float
+    profit_before: float
+    profit_after: float
+    profit_delta: float
+    margin_before: float
+    margin_after: float
+    margin_delta: float
+
+
+class StoreProductMarketplaceCostBulkResponse(BaseModel):
+    cost_type_id: str
+    value: float
+    rows_updated: int
+    rows_created: int
+    listings: List[ListingPricingDelta]
+    summary: str
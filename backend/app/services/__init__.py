@@ -4,5 +4,19 @@ Services
 from .hpp_service import HPPService
 from .pricing_service import PricingService
 from .decision_service import DecisionService
+from .product_name_index import ProductNameIndex
+from .ads_import_service import AdsImportService
+from .export_service import ExportService
+from .report_archive_service import ReportArchiveService
+from .analytics_service import AnalyticsService
+from .import_report_service import ImportReportService
+from .catalog_import_service import CatalogImportService
+from .material_impact_service import MaterialImpactService
+from .price_history_service import PriceHistoryService
+from .listing_economics_service import ListingEconomicsService
+from .grading_service import GradingService
+from .dashboard_service import DashboardService
+from .ranking_service import RankingService
+from .catalog_search_service import CatalogSearchService
 
-__all__ = ["HPPService", "PricingService", "DecisionService"]
+__all__ = ["HPPService", "PricingService", "DecisionService", "ProductNameIndex", "AdsImportService", "ExportService", "ReportArchiveService", "AnalyticsService", "ImportReportService", "CatalogImportService", "MaterialImpactService", "PriceHistoryService", "ListingEconomicsService", "GradingService", "DashboardService", "RankingService", "CatalogSearchService"]
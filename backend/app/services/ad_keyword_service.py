@@ -0,0 +1,116 @@
+"""
+Ad Keyword Service
+Dictionary-encoded keyword/placement/campaign facts from single-product ads reports
+"""
+from typing import Dict, Iterable, List
+
+from sqlalchemy import inspect, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from ..models import Ad, AdKeywordFact, AdTerm
+from .batching import chunked
+
+TERM_KINDS = ("keyword", "placement", "campaign")
+
+# Ad columns copied onto its keyword fact
+KEYWORD_FACT_COLUMNS = (
+    "store_id", "product_id", "start_date", "end_date",
+    "impressions", "clicks", "orders", "items_sold", "gmv", "spend",
+)
+
+
+def _insert_new_terms(db: Session):
+    """INSERT ke ad_terms yang melewati nilai yang sudah ada (unique user_id, kind, value)"""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(AdTerm).on_conflict_do_nothing(index_elements=["user_id", "kind", "value"])
+    if dialect == "sqlite":
+        return sqlite.insert(AdTerm).on_conflict_do_nothing(index_elements=["user_id", "kind", "value"])
+    return insert(AdTerm)
+
+
+class AdKeywordService:
+    """Service untuk fakta keyword iklan dan kamus string-nya"""
+
+    @staticmethod
+    def term_ids(db: Session, user_id: int, kind: str, values: Iterable[str]) -> Dict[str, int]:
+        """
+        ID kamus untuk setiap nilai; nilai yang belum ada ditambahkan (tanpa commit)
+
+        Args:
+            kind: keyword, placement atau campaign
+            values: Teks (duplikat boleh)
+
+        Returns:
+            Dict teks -> ID AdTerm
+        """
+        wanted = sorted(set(values))
+        ids: Dict[str, int] = {}
+
+        def lookup(chunk):
+            ids.update(db.execute(select(AdTerm.value, AdTerm.id).where(
+                AdTerm.user_id == user_id, AdTerm.kind == kind, AdTerm.value.in_(chunk)
+            )).tuples().all())
+
+        for chunk in chunked(wanted):
+            lookup(chunk)
+
+        missing = [value for value in wanted if value not in ids]
+        if missing:
+            # Another import may add the same term concurrently; its row is read back below
+            db.execute(_insert_new_terms(db), [{"user_id": user_id, "kind": kind, "value": value} for value in missing])
+            for chunk in chunked(missing):
+                lookup(chunk)
+        return ids
+
+    @staticmethod
+    def write_facts(db: Session, user_id: int, facts: List[dict]) -> int:
+        """
+        Tulis fakta keyword (satu bulk insert, tanpa commit)
+
+        Args:
+            facts: Dict kolom AdKeywordFact dengan teks di keyword, placement dan
+                campaign (diganti ID kamus); ad_id wajib diisi
+
+        Returns:
+            Jumlah fakta yang ditulis
+        """
+        if not facts:
+            return 0
+        ids = {
+            kind: AdKeywordService.term_ids(db, user_id, kind, (f[kind] for f in facts if f.get(kind)))
+            for kind in TERM_KINDS
+        }
+        rows = []
+        for fact in facts:
+            row = {key: value for key, value in fact.items() if key not in TERM_KINDS}
+            row["user_id"] = user_id
+            row["keyword_id"] = ids["keyword"][fact["keyword"]]
+            row["placement_id"] = ids["placement"].get(fact.get("placement"))
+            row["campaign_id"] = ids["campaign"].get(fact.get("campaign"))
+            rows.append(row)
+        db.execute(insert(AdKeywordFact), rows)
+        return len(rows)
+
+    @staticmethod
+    def sync_fact(db: Session, ad: Ad) -> int:
+        """
+        Salin kolom Ad ke fakta keyword-nya setelah diedit (satu UPDATE, tanpa commit)
+
+        Untuk baris keyword, campaign berisi teks keyword; jika diubah, keyword_id
+        diarahkan ke entri kamus teks baru.
+
+        Returns:
+            Jumlah fakta yang diperbarui (0 jika iklan bukan baris keyword)
+        """
+        values = {key: getattr(ad, key) for key in KEYWORD_FACT_COLUMNS}
+        # Measures nullable on Ad are NOT NULL facts; a cleared value counts as 0
+        values.update({key: 0 for key in ("impressions", "clicks", "items_sold") if values[key] is None})
+        if ad.campaign and inspect(ad).attrs.campaign.history.has_changes() and db.query(
+            AdKeywordFact.ad_id
+        ).filter(AdKeywordFact.ad_id == ad.id).first():
+            values["keyword_id"] = AdKeywordService.term_ids(db, ad.user_id, "keyword", [ad.campaign])[ad.campaign]
+        return db.query(AdKeywordFact).filter(AdKeywordFact.ad_id == ad.id).update(
+            values, synchronize_session=False
+        )
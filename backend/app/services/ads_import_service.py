@@ -0,0 +1,425 @@
+"""
+Ads Import Service
+Parses Shopee ads reports and writes them as Ad rows
+"""
+import hashlib
+import io
+import multiprocessing
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from typing import List, Optional, Tuple
+
+import pandas as pd
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from ..models import Ad, Product
+from .product_name_index import ProductNameIndex
+from .report_archive_service import write_frame
+from .import_progress import ImportProgress, NULL_PROGRESS
+from .ad_keyword_service import AdKeywordService, KEYWORD_FACT_COLUMNS
+
+
+# Parsing is CPU-bound pandas work; batch uploads fan out over this pool
+PARSE_WORKERS = int(os.getenv("IMPORT_PARSE_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+_parse_pool = None
+
+# Values read above the table; kept in the archive catalog so a re-import needs only the Parquet table
+ADS_METADATA_KEYS = ("start_date", "end_date", "metadata_product_name", "metadata_product_id")
+
+
+class AdsReportError(ValueError):
+    """Report cannot be parsed; message is shown to the user"""
+
+
+def get_parse_pool() -> ProcessPoolExecutor:
+    """Shared process pool for report parsing, created on first use"""
+    global _parse_pool
+    if _parse_pool is None:
+        # spawn: forking a multi-threaded server process is not safe
+        _parse_pool = ProcessPoolExecutor(max_workers=PARSE_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    return _parse_pool
+
+
+def reset_parse_pool() -> None:
+    """Drop a broken pool (worker crashed) so the next batch gets a fresh one"""
+    global _parse_pool
+    if _parse_pool is not None:
+        _parse_pool.shutdown(wait=False, cancel_futures=True)
+        _parse_pool = None
+
+
+def _parse_num(val):
+    if pd.isna(val) or val == '-': return 0
+    if isinstance(val, (int, float)): return val
+    s = str(val).strip()
+    if '%' in s:
+        s = s.replace('%', '')
+        try: return float(s) / 100
+        except: return 0
+    try:
+        # Remove thousand separators
+        s = s.replace(',', '')
+        return float(s)
+    except: return 0
+
+
+def _parse_optional_num(val):
+    """Like _parse_num, but None for a missing value ('-') instead of 0"""
+    if pd.isna(val) or str(val).strip() in ('', '-'): return None
+    return _parse_num(val)
+
+
+def _parse_text(val) -> Optional[str]:
+    if pd.isna(val): return None
+    s = str(val).strip()
+    return None if s in ('', '-') else s
+
+
+def _keyword_detail(row, keyword: str, campaign: Optional[str]) -> dict:
+    """Keyword-level columns of a single-product report row (stored as AdKeywordFact)"""
+    position = _parse_optional_num(row.get('Urutan'))
+    direct_orders = _parse_optional_num(row.get('Konversi Langsung'))
+    direct_items_sold = _parse_optional_num(row.get('Terjual Langsung'))
+    direct_gmv = _parse_optional_num(row.get('Penjualan Langsung (GMV Langsung)'))
+    return {
+        "keyword": keyword,
+        "placement": _parse_text(row.get('Penempatan Iklan')),
+        "campaign": campaign,
+        "match_type": _parse_text(row.get('Tipe Pencocokan')),
+        "bidding_mode": _parse_text(row.get('Mode Bidding')),
+        "position": int(position) if position is not None else None,
+        "avg_rank": _parse_optional_num(row.get('Rata-rata Peringkat Iklan')),
+        "direct_orders": int(direct_orders) if direct_orders is not None else None,
+        "direct_items_sold": int(direct_items_sold) if direct_items_sold is not None else None,
+        "direct_gmv": direct_gmv,
+    }
+
+
+def _to_date(value) -> Optional[date]:
+    """Parsed periods travel as YYYY-MM-DD strings (pickled to workers, JSON in the archive)"""
+    return date.fromisoformat(value) if value else None
+
+
+class AdsImportService:
+    """Service untuk import laporan iklan marketplace"""
+
+    @staticmethod
+    def parse_shopee(filename: str, contents: bytes, archive_to: Optional[str] = None) -> dict:
+        """
+        Parse satu file laporan iklan Shopee (CSV utama, Excel sekunder)
+
+        Pure function tanpa akses database, sehingga bisa dijalankan di process pool.
+
+        Args:
+            filename: Nama file (menentukan format)
+            contents: Isi file
+            archive_to: Jika diisi, tabel mentah ditulis ke arsip Parquet di path ini
+                (relatif terhadap REPORT_ARCHIVE_DIR)
+
+        Returns:
+            Dict berisi filename, file_hash, start_date, end_date, metadata_product_name,
+            metadata_product_id, rows (list of dict), rows_failed dan archive
+            (row_count, column_count, size_bytes atau None)
+
+        Raises:
+            AdsReportError jika format tidak dikenali
+        """
+        metadata, df = AdsImportService.read_shopee_table(filename, contents)
+
+        archive = None
+        if archive_to:
+            try:
+                row_count, size_bytes = write_frame(archive_to, df)
+                archive = {"row_count": row_count, "column_count": len(df.columns), "size_bytes": size_bytes}
+            except Exception as e:
+                print(f"Report archive error ({filename}): {e}")
+
+        rows, rows_failed = AdsImportService.rows_from_frame(df, metadata)
+        return {
+            "filename": filename,
+            "file_hash": hashlib.sha256(contents).hexdigest(),
+            **metadata,
+            "rows": rows,
+            "rows_failed": rows_failed,
+            "archive": archive,
+        }
+
+    @staticmethod
+    def read_shopee_table(filename: str, contents: bytes) -> Tuple[dict, pd.DataFrame]:
+        """
+        Baca metadata (periode, produk) dan tabel mentah laporan iklan Shopee
+
+        Returns:
+            (metadata, DataFrame dengan semua kolom laporan)
+        """
+        lower_name = filename.lower()
+        if lower_name.endswith('.csv'):
+            # Use utf-8-sig to handle BOM if present, and errors='replace' for safety
+            content_str = contents.decode('utf-8-sig', errors='replace')
+            # Use splitlines to handle various newline formats (\n, \r\n) safely
+            lines = content_str.splitlines()
+        elif lower_name.endswith('.xlsx') or lower_name.endswith('.xls'):
+            df_raw = pd.read_excel(io.BytesIO(contents), header=None)
+            lines = df_raw.fillna('').astype(str).apply(lambda x: ','.join(x), axis=1).tolist()
+        else:
+            raise AdsReportError("Format file tidak didukung. Harap gunakan file .csv (Format Standar Shopee).")
+
+        # Metadata extraction
+        start_date_str = None
+        end_date_str = None
+
+        metadata_product_name = None
+        metadata_product_id = None
+
+        # Header row index for data
+        header_idx = -1
+
+        for i, line in enumerate(lines):
+            clean_line = line.strip()
+
+            # Extract Period
+            if "Periode" in clean_line:
+                try:
+                    parts = clean_line.split(',')
+                    for part in parts:
+                        if " - " in part:
+                            date_parts = part.strip().split(' - ')
+                            if len(date_parts) == 2:
+                                def to_iso(d_str):
+                                    d_str = d_str.strip()
+                                    d_str = d_str.split(' ')[0]
+                                    return datetime.strptime(d_str, "%d/%m/%Y").strftime("%Y-%m-%d")
+
+                                start_date_str = to_iso(date_parts[0])
+                                end_date_str = to_iso(date_parts[1])
+                except:
+                    pass
+
+            # Extract Metadata Product Name
+            # Format: Nama Iklan,"Rak helm..."
+            if "Nama Iklan" in clean_line and header_idx == -1:  # Metadata section only
+                parts = clean_line.split(',', 1)
+                if len(parts) > 1 and "Nama Iklan" in parts[0]:
+                    metadata_product_name = parts[1].strip().strip('"')
+
+            # Extract Metadata Product ID
+            # Format: No. Produk,29351024010
+            if "No. Produk" in clean_line and header_idx == -1:
+                parts = clean_line.split(',', 1)
+                if len(parts) > 1 and "No. Produk" in parts[0]:
+                    metadata_product_id = parts[1].strip().strip('"')
+
+            if "Penempatan Iklan" in clean_line or "Urutan" in clean_line:
+                header_idx = i
+                break
+
+        if header_idx == -1:
+            raise AdsReportError("Format Shopee tidak dikenali. Header tabel tidak ditemukan.")
+
+        # Parse Data
+        try:
+            if lower_name.endswith('.csv'):
+                df = pd.read_csv(io.StringIO(content_str), skiprows=header_idx)
+            else:
+                df = pd.read_excel(io.BytesIO(contents), skiprows=header_idx)
+        except Exception as e:
+            raise AdsReportError(f"Gagal memparsing data tabel: {e}")
+
+        # Clean column names (strip whitespace and hidden chars)
+        df.columns = [str(c).strip() for c in df.columns]
+
+        metadata = {
+            "start_date": start_date_str,
+            "end_date": end_date_str,
+            "metadata_product_name": metadata_product_name,
+            "metadata_product_id": metadata_product_id,
+        }
+        return metadata, df
+
+    @staticmethod
+    def rows_from_frame(df: pd.DataFrame, metadata: dict) -> Tuple[List[dict], int]:
+        """
+        Map baris tabel laporan (hasil parse atau dari arsip) ke nilai kolom Ad
+
+        Pada laporan satu produk, baris dengan kolom Kata Pencarian/Penempatan
+        juga membawa "keyword" (kolom AdKeywordFact, lihat _keyword_detail).
+
+        Returns:
+            (rows, rows_failed)
+        """
+        metadata_product_name = metadata.get("metadata_product_name")
+        rows = []
+        rows_failed = 0
+        for _, row in df.iterrows():
+            try:
+                # Priority: Column 'Nama Iklan' > Metadata Product Name
+                raw_app_name = str(row.get('Nama Iklan', ''))
+                if not raw_app_name or raw_app_name == 'nan' or raw_app_name == 'None':
+                    # Generic fallback if no name found anywhere
+                    raw_app_name = metadata_product_name or "Unknown Product"
+
+                # Determine campaign name: Column 'Nama Iklan' OR 'Kata Pencarian/Penempatan'
+                # In single product report, 'Kata Pencarian' is the differentiator
+                campaign_col = row.get('Kata Pencarian/Penempatan', row.get('Kata Pencarian', ''))
+
+                keyword = None
+                if metadata_product_name:
+                    # Single Product Report mode: "Nama Iklan" is the product, "Kata Pencarian" is the sub-entity
+                    campaign_name = str(campaign_col) if not pd.isna(campaign_col) else 'General'
+                    if _parse_text(campaign_col):
+                        keyword = _keyword_detail(row, campaign_name, metadata_product_name)
+                else:
+                    # Bulk Report mode: "Nama Iklan" serves as campaign
+                    campaign_name = str(row.get('Nama Iklan', 'Imported'))
+
+                rows.append({
+                    "product_name": raw_app_name.strip(),
+                    "campaign": campaign_name,
+                    "spend": _parse_num(row.get('Biaya', 0)),
+                    "gmv": _parse_num(row.get('Omzet Penjualan', 0)),
+                    "orders": int(_parse_num(row.get('Konversi', row.get('Pesanan', 0)))),
+                    "impressions": int(_parse_num(row.get('Dilihat', 0))),
+                    "clicks": int(_parse_num(row.get('Jumlah Klik', 0))),
+                    "ctr": _parse_num(row.get('Persentase Klik', 0)),
+                    "direct_conversions": int(_parse_num(row.get('Konversi Langsung', 0))),
+                    "items_sold": int(_parse_num(row.get('Produk Terjual', 0))),
+                    "keyword": keyword,
+                })
+            except Exception as row_e:
+                print(f"Row error: {row_e}")
+                rows_failed += 1
+
+        return rows, rows_failed
+
+    @staticmethod
+    def write_ads(
+        db: Session,
+        user_id: int,
+        store_id: str,
+        parsed_files: List[dict],
+        progress: ImportProgress = NULL_PROGRESS
+    ) -> dict:
+        """
+        Tulis hasil parse satu atau banyak file ke tabel ads
+
+        Produk dicocokkan lewat ProductNameIndex (produk baru dibuat otomatis),
+        duplikat (store, produk, periode, campaign) dicek sekali terhadap database
+        dan antar file, lalu semua Ad ditulis dengan satu bulk insert.
+        Baris keyword laporan satu produk juga ditulis sebagai AdKeywordFact
+        (tertaut ke Ad-nya, ikut terhapus bersama Ad).
+        Baris ditautkan ke parsed["report_id"] (SalesReport) jika ada.
+        Commit dilakukan oleh pemanggil. Progress per baris dilaporkan ke progress.
+
+        Returns:
+            Dict berisi totals dan ringkasan per file (urutan sama dengan parsed_files)
+        """
+        user_products = db.query(Product).filter(Product.user_id == user_id).all()
+        product_index = ProductNameIndex.from_products(user_products)
+        known_ids = {p.id for p in user_products}
+
+        # One dedupe query for every period in the batch
+        periods = {
+            (_to_date(f["start_date"]), _to_date(f["end_date"]))
+            for f in parsed_files if f["start_date"] and f["end_date"]
+        }
+        seen = set()
+        if periods:
+            existing = db.query(Ad.product_id, Ad.start_date, Ad.end_date, Ad.campaign).filter(
+                Ad.user_id == user_id,
+                Ad.store_id == store_id,
+                Ad.start_date.in_(sorted({p[0] for p in periods}))
+            ).all()
+            seen = {tuple(e) for e in existing}
+
+        new_products = []
+        ad_rows = []
+        keyword_facts = []  # (index in ad_rows, keyword detail)
+        per_file = []
+
+        for parsed in parsed_files:
+            summary = {"imported": 0, "skipped": parsed["rows_failed"], "spend": 0, "gmv": 0}
+            start_date, end_date = _to_date(parsed["start_date"]), _to_date(parsed["end_date"])
+            if parsed["rows_failed"]:
+                progress.skipped(parsed["rows_failed"], f"{parsed['filename']}: baris tidak bisa dibaca")
+
+            for row in parsed["rows"]:
+                clean_name = row["product_name"]
+                product_id = product_index.lookup(clean_name)
+
+                if not product_id:
+                    # PRODUCT NOT FOUND -> AUTO CREATE
+                    # Use metadata ID if available, else random UUID
+                    new_id = parsed["metadata_product_id"] or str(uuid.uuid4())[:12]
+                    if new_id in known_ids:
+                        new_id = str(uuid.uuid4())[:12]
+                    new_products.append(Product(id=new_id, user_id=user_id, nama=clean_name))
+                    known_ids.add(new_id)
+                    # Update index so next rows use this new product
+                    product_index.add(new_id, clean_name)
+                    product_id = new_id
+
+                # Double Input Prevention
+                if start_date and end_date:
+                    key = (product_id, start_date, end_date, row["campaign"])
+                    if key in seen:
+                        summary["skipped"] += 1
+                        progress.row(False, f"Duplikat: '{clean_name}' ({row['campaign']}) periode {start_date} s/d {end_date}")
+                        continue
+                    seen.add(key)
+
+                if row.get("keyword"):
+                    keyword_facts.append((len(ad_rows), row["keyword"]))
+                ad_rows.append({
+                    "user_id": user_id,
+                    "store_id": store_id,
+                    "product_id": product_id,
+                    "campaign": row["campaign"],
+                    "spend": row["spend"],
+                    "gmv": row["gmv"],
+                    "orders": row["orders"],
+                    "total_sales": 0,
+                    "impressions": row["impressions"],
+                    "clicks": row["clicks"],
+                    "ctr": row["ctr"],
+                    "direct_conversions": row["direct_conversions"],
+                    "items_sold": row["items_sold"],
+                    "start_date": start_date,
+                    "end_date": end_date,
+                    "report_id": parsed.get("report_id"),
+                })
+                summary["imported"] += 1
+                summary["spend"] += row["spend"]
+                summary["gmv"] += row["gmv"]
+                progress.row()
+
+            per_file.append(summary)
+
+        if new_products:
+            db.add_all(new_products)
+            db.flush()
+        if keyword_facts:
+            ad_ids = db.execute(insert(Ad).returning(Ad.id, sort_by_parameter_order=True), ad_rows).scalars().all()
+            AdKeywordService.write_facts(db, user_id, [
+                {
+                    **detail,
+                    "ad_id": ad_ids[i],
+                    **{key: ad_rows[i][key] for key in KEYWORD_FACT_COLUMNS},
+                }
+                for i, detail in keyword_facts
+            ])
+        elif ad_rows:
+            db.execute(insert(Ad), ad_rows)
+        progress.report(stage="written")
+
+        return {
+            "rows_imported": sum(f["imported"] for f in per_file),
+            "rows_skipped": sum(f["skipped"] for f in per_file),
+            "products_created": len(new_products),
+            "total_spend": sum(f["spend"] for f in per_file),
+            "total_gmv": sum(f["gmv"] for f in per_file),
+            "files": per_file,
+        }
@@ -0,0 +1,288 @@
+"""
+Analytics Service
+Rolling-window store and ads metrics computed in the database
+"""
+import sqlite3
+from datetime import date, timedelta
+from typing import List, Optional
+
+import pandas as pd
+from sqlalchemy import Date, Integer, and_, cast, func, literal, select, type_coerce
+from sqlalchemy.orm import Session
+
+from ..models import Ad, StorePerformance
+from ..schemas.analytics import (
+    AdsRollingPoint, AdsRollingWindow, StoreRollingPoint, StoreRollingWindow
+)
+
+DEFAULT_WINDOWS = (7, 14, 30)
+MAX_WINDOW = 365
+
+
+def _ratio(numerator, denominator) -> Optional[float]:
+    if numerator is None or not denominator:
+        return None
+    return float(numerator) / float(denominator)
+
+
+def _cancellation(net, gross) -> Optional[float]:
+    # Orders created but not shipped: 1 - net / gross
+    if net is None or not gross:
+        return None
+    return 1 - float(net) / float(gross)
+
+
+class AnalyticsService:
+    """Service untuk analitik rolling window (7/14/30 hari)"""
+
+    @staticmethod
+    def supports_range_windows(db: Session) -> bool:
+        """
+        True jika database mendukung window function dengan frame RANGE n PRECEDING
+
+        PostgreSQL selalu; SQLite sejak 3.28. Selain itu dipakai fallback pandas.
+        """
+        dialect = db.get_bind().dialect.name
+        if dialect == "postgresql":
+            return True
+        if dialect == "sqlite":
+            return sqlite3.sqlite_version_info >= (3, 28, 0)
+        return False
+
+    @staticmethod
+    def _day_number(db: Session, column):
+        """Date column as a day count, so RANGE frames span calendar days (gaps included)"""
+        if db.get_bind().dialect.name == "sqlite":
+            return func.julianday(column)
+        return type_coerce(cast(column, Date) - literal(date(1970, 1, 1), Date), Integer)
+
+    @staticmethod
+    def store_rolling(
+        db: Session,
+        user_id: int,
+        store_id: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        windows: List[int] = DEFAULT_WINDOWS,
+        use_sql: Optional[bool] = None
+    ) -> List[StoreRollingPoint]:
+        """
+        Moving average revenue/orders dan rasio konversi & pembatalan per toko per hari
+
+        Per window N hari (termasuk hari ini):
+        - revenue_avg, orders_avg: rata-rata harian dari hari yang ada datanya
+        - conversion_rate: sum(orders) / sum(visitors)
+        - cancellation_rate: 1 - sum(net) / sum(gross)
+
+        Args:
+            db: Database session
+            user_id: ID user saat ini
+            store_id: Filter toko (opsional)
+            start_date / end_date: Rentang tanggal output; data sebelum start_date
+                tetap dipakai untuk mengisi window
+            windows: Panjang window dalam hari
+            use_sql: Paksa jalur SQL (True) atau pandas (False); default otomatis
+        """
+        lookback_from = start_date - timedelta(days=max(windows) - 1) if start_date else None
+
+        conditions = [StorePerformance.user_id == user_id]
+        if store_id:
+            conditions.append(StorePerformance.store_id == store_id)
+        if lookback_from:
+            conditions.append(StorePerformance.date >= lookback_from)
+        if end_date:
+            conditions.append(StorePerformance.date <= end_date)
+
+        if use_sql is None:
+            use_sql = AnalyticsService.supports_range_windows(db)
+
+        if use_sql:
+            day = AnalyticsService._day_number(db, StorePerformance.date)
+            window_cols = []
+            for n in windows:
+                def over(expr, n=n):
+                    return expr.over(partition_by=StorePerformance.store_id, order_by=day, range_=(-(n - 1), 0))
+                window_cols += [
+                    over(func.avg(StorePerformance.revenue)).label(f"revenue_avg_{n}"),
+                    over(func.avg(StorePerformance.orders)).label(f"orders_avg_{n}"),
+                    over(func.sum(StorePerformance.orders)).label(f"orders_sum_{n}"),
+                    over(func.sum(StorePerformance.visitors)).label(f"visitors_sum_{n}"),
+                    over(func.sum(StorePerformance.revenue)).label(f"net_sum_{n}"),
+                    over(func.sum(StorePerformance.gross_revenue)).label(f"gross_sum_{n}"),
+                ]
+            inner = select(
+                StorePerformance.store_id, StorePerformance.date, StorePerformance.visitors,
+                StorePerformance.orders, StorePerformance.revenue, StorePerformance.gross_revenue,
+                *window_cols
+            ).where(and_(*conditions)).subquery()
+
+            stmt = select(inner)
+            if start_date:
+                stmt = stmt.where(inner.c.date >= start_date)
+            rows = [r._mapping for r in db.execute(stmt.order_by(inner.c.store_id, inner.c.date))]
+        else:
+            rows = AnalyticsService._store_rolling_frame(db, conditions, windows, start_date)
+
+        return [
+            StoreRollingPoint(
+                store_id=r["store_id"],
+                date=r["date"],
+                visitors=r["visitors"] or 0,
+                orders=r["orders"] or 0,
+                revenue=r["revenue"] or 0,
+                gross_revenue=r["gross_revenue"] or 0,
+                conversion_rate=_ratio(r["orders"], r["visitors"]),
+                cancellation_rate=_cancellation(r["revenue"], r["gross_revenue"]),
+                windows=[
+                    StoreRollingWindow(
+                        window=n,
+                        revenue_avg=float(r[f"revenue_avg_{n}"] or 0),
+                        orders_avg=float(r[f"orders_avg_{n}"] or 0),
+                        conversion_rate=_ratio(r[f"orders_sum_{n}"], r[f"visitors_sum_{n}"]),
+                        cancellation_rate=_cancellation(r[f"net_sum_{n}"], r[f"gross_sum_{n}"])
+                    )
+                    for n in windows
+                ]
+            )
+            for r in rows
+        ]
+
+    @staticmethod
+    def _store_rolling_frame(db: Session, conditions, windows, start_date) -> List[dict]:
+        """Pandas fallback for store_rolling: time-based rolling windows per store"""
+        stmt = select(
+            StorePerformance.store_id, StorePerformance.date, StorePerformance.visitors,
+            StorePerformance.orders, StorePerformance.revenue, StorePerformance.gross_revenue
+        ).where(and_(*conditions)).order_by(StorePerformance.store_id, StorePerformance.date)
+        df = pd.read_sql(stmt, db.connection())
+        if df.empty:
+            return []
+        df["date"] = pd.to_datetime(df["date"])
+
+        parts = []
+        for _, group in df.groupby("store_id", sort=True):
+            group = group.set_index("date")
+            for n in windows:
+                rolling = group[["revenue", "orders", "visitors", "gross_revenue"]].rolling(f"{n}D")
+                means = rolling.mean()
+                sums = rolling.sum()
+                group[f"revenue_avg_{n}"] = means["revenue"]
+                group[f"orders_avg_{n}"] = means["orders"]
+                group[f"orders_sum_{n}"] = sums["orders"]
+                group[f"visitors_sum_{n}"] = sums["visitors"]
+                group[f"net_sum_{n}"] = sums["revenue"]
+                group[f"gross_sum_{n}"] = sums["gross_revenue"]
+            parts.append(group.reset_index())
+
+        out = pd.concat(parts)
+        out["date"] = out["date"].dt.date
+        if start_date:
+            out = out[out["date"] >= start_date]
+        return out.to_dict("records")
+
+    @staticmethod
+    def ads_rolling(
+        db: Session,
+        user_id: int,
+        store_id: Optional[str] = None,
+        product_id: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        windows: List[int] = DEFAULT_WINDOWS,
+        use_sql: Optional[bool] = None
+    ) -> List[AdsRollingPoint]:
+        """
+        Rolling ROAS / ACOS / CPA iklan per toko
+
+        Iklan dijumlahkan per tanggal mulai periode laporan, lalu per window N hari
+        dihitung sum(gmv) / sum(spend) dan kebalikannya, bukan rata-rata rasio harian.
+        """
+        lookback_from = start_date - timedelta(days=max(windows) - 1) if start_date else None
+
+        conditions = [Ad.user_id == user_id, Ad.start_date.isnot(None)]
+        if store_id:
+            conditions.append(Ad.store_id == store_id)
+        if product_id:
+            conditions.append(Ad.product_id == product_id)
+        if lookback_from:
+            conditions.append(Ad.start_date >= lookback_from)
+        if end_date:
+            conditions.append(Ad.start_date <= end_date)
+
+        daily = select(
+            Ad.store_id.label("store_id"),
+            Ad.start_date.label("day"),
+            func.sum(Ad.spend).label("spend"),
+            func.sum(Ad.gmv).label("gmv"),
+            func.sum(Ad.orders).label("orders"),
+        ).where(and_(*conditions)).group_by(Ad.store_id, Ad.start_date)
+
+        if use_sql is None:
+            use_sql = AnalyticsService.supports_range_windows(db)
+
+        if use_sql:
+            daily = daily.subquery()
+            day = AnalyticsService._day_number(db, daily.c.day)
+            window_cols = []
+            for n in windows:
+                def over(expr, n=n):
+                    return expr.over(partition_by=daily.c.store_id, order_by=day, range_=(-(n - 1), 0))
+                window_cols += [
+                    over(func.sum(daily.c.spend)).label(f"spend_{n}"),
+                    over(func.sum(daily.c.gmv)).label(f"gmv_{n}"),
+                    over(func.sum(daily.c.orders)).label(f"orders_{n}"),
+                ]
+            inner = select(daily, *window_cols).subquery()
+            stmt = select(inner)
+            if start_date:
+                stmt = stmt.where(inner.c.day >= start_date)
+            rows = [r._mapping for r in db.execute(stmt.order_by(inner.c.store_id, inner.c.day))]
+        else:
+            rows = AnalyticsService._ads_rolling_frame(db, daily, windows, start_date)
+
+        return [
+            AdsRollingPoint(
+                store_id=r["store_id"],
+                date=r["day"],
+                spend=r["spend"] or 0,
+                gmv=r["gmv"] or 0,
+                orders=r["orders"] or 0,
+                windows=[
+                    AdsRollingWindow(
+                        window=n,
+                        spend=float(r[f"spend_{n}"] or 0),
+                        gmv=float(r[f"gmv_{n}"] or 0),
+                        orders=int(r[f"orders_{n}"] or 0),
+                        roas=_ratio(r[f"gmv_{n}"], r[f"spend_{n}"]),
+                        acos=_ratio(r[f"spend_{n}"], r[f"gmv_{n}"]),
+                        cpa=_ratio(r[f"spend_{n}"], r[f"orders_{n}"])
+                    )
+                    for n in windows
+                ]
+            )
+            for r in rows
+        ]
+
+    @staticmethod
+    def _ads_rolling_frame(db: Session, daily, windows, start_date) -> List[dict]:
+        """Pandas fallback for ads_rolling (daily totals are still aggregated in SQL)"""
+        df = pd.read_sql(daily.order_by(Ad.store_id, Ad.start_date), db.connection())
+        if df.empty:
+            return []
+        df["day"] = pd.to_datetime(df["day"])
+
+        parts = []
+        for _, group in df.groupby("store_id", sort=True):
+            group = group.set_index("day")
+            for n in windows:
+                sums = group[["spend", "gmv", "orders"]].rolling(f"{n}D").sum()
+                group[f"spend_{n}"] = sums["spend"]
+                group[f"gmv_{n}"] = sums["gmv"]
+                group[f"orders_{n}"] = sums["orders"]
+            parts.append(group.reset_index())
+
+        out = pd.concat(parts)
+        out["day"] = out["day"].dt.date
+        if start_date:
+            out = out[out["day"] >= start_date]
+        return out.to_dict("records")
@@ -0,0 +1,14 @@
+"""
+Batching
+Splits id lists into IN (...) batches shared by the services
+"""
+from typing import Iterator, Sequence
+
+# Values per IN (...) list, below every backend's bound-parameter limit
+IN_LIST_SIZE = 500
+
+
+def chunked(items: Sequence, size: int = IN_LIST_SIZE) -> Iterator[Sequence]:
+    """Potong items menjadi batch berurutan berisi paling banyak size elemen"""
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
@@ -0,0 +1,335 @@
+"""
+Catalog Import Service
+Bulk upsert of materials, products and BOM lines from CSV/XLSX tables
+"""
+import io
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+from sqlalchemy import delete, insert, update
+from sqlalchemy.orm import Session
+
+from ..models import BOM, Material, Product
+from .batching import chunked
+from .hpp_service import BOMCycleError, HPPService
+from .price_history_service import PriceHistoryService
+from .listing_economics_service import ListingEconomicsService
+
+SECTION_COLUMNS = {
+    "materials": ["id", "nama", "harga_total", "jumlah_unit", "satuan"],
+    "products": ["id", "nama"],
+    "bom": ["product_id", "material_id", "qty"],
+}
+
+# Columns read when present; missing ones are filled with empty values
+OPTIONAL_COLUMNS = {
+    "bom": ["component_product_id"],
+}
+
+# Sheet names accepted for each section in a single catalog workbook
+SECTION_SHEETS = {
+    "materials": ("materials", "material", "bahan"),
+    "products": ("products", "product", "produk"),
+    "bom": ("bom",),
+}
+
+# Row errors returned to the client; the total is always reported
+MAX_ERRORS = 200
+
+
+class CatalogImportError(ValueError):
+    """File or sheet cannot be read; message is shown to the user"""
+
+
+def _clean_frame(df: pd.DataFrame, section: str) -> pd.DataFrame:
+    df.columns = [str(c).strip().lower() for c in df.columns]
+    missing = [c for c in SECTION_COLUMNS[section] if c not in df.columns]
+    if missing:
+        raise CatalogImportError(f"Kolom {', '.join(missing)} tidak ditemukan di data {section}")
+    for col in OPTIONAL_COLUMNS.get(section, []):
+        if col not in df.columns:
+            df[col] = None
+    df = df[SECTION_COLUMNS[section] + OPTIONAL_COLUMNS.get(section, [])].copy()
+    # Built as object columns: string dtype would turn the blanks back into NaN
+    for col in df.columns:
+        df[col] = pd.Series(
+            [None if pd.isna(v) else str(v).strip() or None for v in df[col]], index=df.index, dtype=object
+        )
+    # Spreadsheet row number (header is row 1) for error messages
+    df.index = df.index + 2
+    return df.dropna(how="all")
+
+
+def _number(value: Optional[str]) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+class CatalogImportService:
+    """Service untuk import katalog (bahan, produk, BOM) dalam jumlah besar"""
+
+    @staticmethod
+    def read_table(filename: str, contents: bytes, section: str) -> pd.DataFrame:
+        """
+        Baca satu bagian katalog dari file CSV atau XLSX (sheet pertama)
+
+        Raises:
+            CatalogImportError jika file tidak bisa dibaca atau kolom wajib tidak ada
+        """
+        lower_name = filename.lower()
+        try:
+            if lower_name.endswith('.csv'):
+                df = pd.read_csv(io.BytesIO(contents), dtype=str, encoding='utf-8-sig')
+            elif lower_name.endswith(('.xlsx', '.xls')):
+                df = pd.read_excel(io.BytesIO(contents), dtype=str)
+            else:
+                raise CatalogImportError(f"Format file '{filename}' tidak didukung. Gunakan .csv atau .xlsx")
+        except CatalogImportError:
+            raise
+        except Exception as e:
+            raise CatalogImportError(f"Gagal membaca file '{filename}': {e}")
+        return _clean_frame(df, section)
+
+    @staticmethod
+    def read_workbook(filename: str, contents: bytes) -> Dict[str, pd.DataFrame]:
+        """
+        Baca workbook katalog dengan sheet materials/bahan, products/produk dan bom
+
+        Sheet yang tidak ada dilewati.
+        """
+        try:
+            sheets = pd.read_excel(io.BytesIO(contents), sheet_name=None, dtype=str)
+        except Exception as e:
+            raise CatalogImportError(f"Gagal membaca file '{filename}': {e}")
+
+        by_name = {name.strip().lower(): df for name, df in sheets.items()}
+        frames = {}
+        for section, names in SECTION_SHEETS.items():
+            for name in names:
+                if name in by_name:
+                    frames[section] = _clean_frame(by_name[name], section)
+                    break
+        if not frames:
+            raise CatalogImportError("Workbook tidak berisi sheet materials, products atau bom")
+        return frames
+
+    @staticmethod
+    def import_catalog(
+        db: Session,
+        user_id: int,
+        materials: Optional[pd.DataFrame] = None,
+        products: Optional[pd.DataFrame] = None,
+        bom: Optional[pd.DataFrame] = None,
+        replace_bom: bool = False
+    ) -> dict:
+        """
+        Upsert bahan, produk dan baris BOM (tanpa commit)
+
+        Data existing dimuat sekali per tabel, referensi BOM divalidasi terhadap
+        set id (database + file), lalu tiap tabel ditulis dengan satu bulk
+        UPDATE dan satu bulk INSERT. Baris yang tidak valid dilewati dan dilaporkan.
+
+        Args:
+            db: Database session
+            user_id: ID user saat ini
+            materials / products / bom: Tabel dari read_table / read_workbook (opsional)
+            replace_bom: Jika True, BOM lama produk yang ada di tabel bom dihapus
+                dan diganti seluruhnya; jika False, baris di-upsert per (produk, bahan)
+
+        Returns:
+            Dict berisi ringkasan per bagian (created, updated, unchanged, deleted)
+            serta errors (section, row, message) dan error_count
+
+        Raises:
+            CatalogImportError jika baris sub-assembly membentuk siklus BOM
+        """
+        errors = []
+
+        def error(section: str, row: int, message: str):
+            errors.append({"section": section, "row": int(row), "message": message})
+
+        material_ids = {
+            m_id for (m_id,) in db.query(Material.id).filter(Material.user_id == user_id)
+        }
+        product_ids = {
+            p_id for (p_id,) in db.query(Product.id).filter(Product.user_id == user_id)
+        }
+
+        summary = {}
+        if materials is not None:
+            summary["materials"] = CatalogImportService._upsert_materials(db, user_id, materials, material_ids, error)
+        if products is not None:
+            summary["products"] = CatalogImportService._upsert_products(db, user_id, products, product_ids, error)
+        if bom is not None:
+            summary["bom"] = CatalogImportService._upsert_bom(
+                db, user_id, bom, material_ids, product_ids, replace_bom, error
+            )
+
+        summary["error_count"] = len(errors)
+        summary["errors"] = errors[:MAX_ERRORS]
+        return summary
+
+    @staticmethod
+    def _upsert_materials(db: Session, user_id: int, df: pd.DataFrame, material_ids: set, error) -> dict:
+        existing = {
+            m.id: m for m in db.query(
+                Material.id, Material.nama, Material.harga_total, Material.jumlah_unit, Material.satuan
+            ).filter(Material.user_id == user_id)
+        }
+
+        rows = {}
+        for row in df.itertuples():
+            harga_total = _number(row.harga_total)
+            jumlah_unit = _number(row.jumlah_unit)
+            if not row.id:
+                error("materials", row.Index, "id kosong")
+            elif not row.nama or not row.satuan:
+                error("materials", row.Index, f"nama/satuan bahan '{row.id}' kosong")
+            elif harga_total is None or harga_total < 0:
+                error("materials", row.Index, f"harga_total bahan '{row.id}' tidak valid")
+            elif jumlah_unit is None or jumlah_unit <= 0:
+                error("materials", row.Index, f"jumlah_unit bahan '{row.id}' harus lebih dari 0")
+            else:
+                # Later rows for the same id win
+                rows[row.id] = {
+                    "id": row.id,
+                    "user_id": user_id,
+                    "nama": row.nama,
+                    "harga_total": int(round(harga_total)),
+                    "jumlah_unit": jumlah_unit,
+                    "harga_satuan": int(round(harga_total)) / jumlah_unit,
+                    "satuan": row.satuan,
+                }
+
+        inserts, updates, unchanged = [], [], 0
+        for m_id, values in rows.items():
+            current = existing.get(m_id)
+            if current is None:
+                inserts.append(values)
+            elif (current.nama, current.harga_total, current.jumlah_unit, current.satuan) == (
+                values["nama"], values["harga_total"], values["jumlah_unit"], values["satuan"]
+            ):
+                unchanged += 1
+            else:
+                updates.append(values)
+
+        if updates:
+            db.execute(update(Material), updates)
+        if inserts:
+            db.execute(insert(Material), inserts)
+        # Price history only needs a row when the price itself changed
+        PriceHistoryService.record_materials(db, inserts + [
+            values for values in updates
+            if (existing[values["id"]].harga_total, existing[values["id"]].jumlah_unit)
+            != (values["harga_total"], values["jumlah_unit"])
+        ])
+        # Bulk writes bypass the unit of work, so listings are marked by hand
+        ListingEconomicsService.mark_stale(db, user_id, material_ids=[values["id"] for values in updates])
+        material_ids.update(rows)
+        return {"created": len(inserts), "updated": len(updates), "unchanged": unchanged, "deleted": 0}
+
+    @staticmethod
+    def _upsert_products(db: Session, user_id: int, df: pd.DataFrame, product_ids: set, error) -> dict:
+        existing = {
+            p_id: nama for p_id, nama in db.query(Product.id, Product.nama).filter(Product.user_id == user_id)
+        }
+
+        rows = {}
+        for row in df.itertuples():
+            if not row.id:
+                error("products", row.Index, "id kosong")
+            elif not row.nama:
+                error("products", row.Index, f"nama produk '{row.id}' kosong")
+            else:
+                rows[row.id] = {"id": row.id, "user_id": user_id, "nama": row.nama}
+
+        inserts, updates, unchanged = [], [], 0
+        for p_id, values in rows.items():
+            if p_id not in existing:
+                inserts.append(values)
+            elif existing[p_id] == values["nama"]:
+                unchanged += 1
+            else:
+                updates.append(values)
+
+        if updates:
+            db.execute(update(Product), updates)
+        if inserts:
+            db.execute(insert(Product), inserts)
+        product_ids.update(rows)
+        return {"created": len(inserts), "updated": len(updates), "unchanged": unchanged, "deleted": 0}
+
+    @staticmethod
+    def _upsert_bom(
+        db: Session,
+        user_id: int,
+        df: pd.DataFrame,
+        material_ids: set,
+        product_ids: set,
+        replace_bom: bool,
+        error
+    ) -> dict:
+        # Keyed by (product_id, material_id, component_product_id); exactly one of the last two is set
+        lines: Dict[Tuple[str, Optional[str], Optional[str]], float] = {}
+        for row in df.itertuples():
+            qty = _number(row.qty)
+            if not row.product_id or (row.material_id is None) == (row.component_product_id is None):
+                error("bom", row.Index, "Isi product_id dan salah satu: material_id atau component_product_id")
+            elif row.product_id not in product_ids:
+                error("bom", row.Index, f"Product '{row.product_id}' tidak ditemukan")
+            elif row.material_id and row.material_id not in material_ids:
+                error("bom", row.Index, f"Material '{row.material_id}' tidak ditemukan")
+            elif row.component_product_id and row.component_product_id not in product_ids:
+                error("bom", row.Index, f"Product komponen '{row.component_product_id}' tidak ditemukan")
+            elif qty is None or qty <= 0:
+                error("bom", row.Index, "qty harus berupa angka lebih dari 0")
+            else:
+                lines[(row.product_id, row.material_id, row.component_product_id)] = qty
+
+        bom_products = sorted({p_id for p_id, _, _ in lines})
+        deleted = 0
+        existing = {}
+        if replace_bom:
+            for chunk in chunked(bom_products):
+                result = db.execute(
+                    delete(BOM).where(BOM.user_id == user_id, BOM.product_id.in_(chunk))
+                    .execution_options(synchronize_session=False)
+                )
+                deleted += result.rowcount or 0
+        else:
+            for chunk in chunked(bom_products):
+                for b_id, p_id, m_id, c_id, qty in db.query(
+                    BOM.id, BOM.product_id, BOM.material_id, BOM.component_product_id, BOM.qty
+                ).filter(BOM.user_id == user_id, BOM.product_id.in_(chunk)):
+                    existing.setdefault((p_id, m_id, c_id), (b_id, qty))
+
+        inserts, updates, unchanged = [], [], 0
+        for (p_id, m_id, c_id), qty in lines.items():
+            current = existing.get((p_id, m_id, c_id))
+            if current is None:
+                inserts.append({
+                    "user_id": user_id, "product_id": p_id, "material_id": m_id,
+                    "component_product_id": c_id, "qty": qty
+                })
+            elif current[1] == qty:
+                unchanged += 1
+            else:
+                updates.append({"id": current[0], "qty": qty})
+
+        if updates:
+            db.execute(update(BOM), updates)
+        if inserts:
+            db.execute(insert(BOM), inserts)
+        ListingEconomicsService.mark_stale(db, user_id, product_ids=bom_products)
+
+        # Sub-assembly lines must keep the product graph acyclic; evaluating HPP walks it once
+        if any(c_id for _, _, c_id in lines):
+            try:
+                HPPService.calculate_hpp_values(db, bom_products, user_id)
+            except BOMCycleError as e:
+                raise CatalogImportError(str(e))
+        return {"created": len(inserts), "updated": len(updates), "unchanged": unchanged, "deleted": deleted}
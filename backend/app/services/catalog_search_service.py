@@ -0,0 +1,160 @@
+"""
+Catalog Search Service
+Paginated prefix/substring search on the nama and id of products and materials
+"""
+from typing import Dict, List, Tuple
+
+from sqlalchemy import case, column, func, inspect, literal_column, or_, select, table, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from ..models import Material, Product
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+# Trigram indexes only help for terms of at least this many characters
+MIN_TRIGRAM_LENGTH = 3
+
+SEARCH_MODELS = (Product, Material)
+
+# (database url, search table) -> exists; the search tables are created at startup
+_fts_available: Dict[Tuple[str, str], bool] = {}
+
+
+def _fts_name(model) -> str:
+    return f"{model.__tablename__}_search"
+
+
+def _fts_table(model):
+    return table(_fts_name(model), column("id"), column("user_id"))
+
+
+def _escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _sqlite_statements(model) -> List[str]:
+    """FTS5 trigram table with the searchable columns, kept current by triggers on the catalog table"""
+    source, fts = model.__tablename__, _fts_name(model)
+    insert_row = f"INSERT INTO {fts}(rowid, id, nama, user_id) VALUES (new.rowid, new.id, new.nama, new.user_id);"
+    delete_row = f"DELETE FROM {fts} WHERE rowid = old.rowid;"
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(id, nama, user_id UNINDEXED, tokenize='trigram')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {source} BEGIN {insert_row} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {source} BEGIN {delete_row} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF id, nama, user_id ON {source} "
+        f"BEGIN {delete_row} {insert_row} END",
+    ]
+
+
+def _postgres_statements(model) -> List[str]:
+    """pg_trgm GIN indexes, used by ILIKE '%term%' on nama and id"""
+    source = model.__tablename__
+    return [
+        f"CREATE INDEX IF NOT EXISTS ix_{source}_nama_trgm ON {source} USING gin (nama gin_trgm_ops)",
+        f"CREATE INDEX IF NOT EXISTS ix_{source}_id_trgm ON {source} USING gin (id gin_trgm_ops)",
+    ]
+
+
+class CatalogSearchService:
+    """Service untuk pencarian produk dan bahan (indeks trigram)"""
+
+    @staticmethod
+    def install(conn: Connection, rebuild: bool = False) -> None:
+        """
+        Buat indeks pencarian untuk tabel produk dan bahan (commit oleh pemanggil)
+
+        SQLite: tabel FTS5 trigram <tabel>_search + trigger, diisi dari tabel
+        katalog saat baru dibuat atau jika rebuild=True (mis. setelah VACUUM,
+        yang boleh mengubah rowid). PostgreSQL: extension pg_trgm + indeks GIN.
+        Dialect lain tidak punya indeks dan memakai LIKE biasa.
+        """
+        dialect = conn.dialect.name
+        if dialect == "postgresql":
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            for model in SEARCH_MODELS:
+                for statement in _postgres_statements(model):
+                    conn.execute(text(statement))
+        elif dialect == "sqlite":
+            for model in SEARCH_MODELS:
+                fts = _fts_name(model)
+                is_new = not inspect(conn).has_table(fts)
+                for statement in _sqlite_statements(model):
+                    conn.execute(text(statement))
+                if is_new or rebuild:
+                    conn.execute(text(f"DELETE FROM {fts}"))
+                    conn.execute(text(
+                        f"INSERT INTO {fts}(rowid, id, nama, user_id) "
+                        f"SELECT rowid, id, nama, user_id FROM {model.__tablename__}"
+                    ))
+        _fts_available.clear()
+
+    @staticmethod
+    def install_on_startup(engine: Engine) -> None:
+        """install() saat aplikasi start; gagal (mis. tanpa hak CREATE EXTENSION) berarti fallback LIKE"""
+        try:
+            with engine.begin() as conn:
+                CatalogSearchService.install(conn)
+        except Exception as e:
+            print(f"Catalog search index not installed, falling back to LIKE: {e}")
+
+    @staticmethod
+    def _uses_fts(db: Session, model) -> bool:
+        bind = db.get_bind()
+        if bind.dialect.name != "sqlite":
+            return False
+        key = (str(bind.url), _fts_name(model))
+        if key not in _fts_available:
+            _fts_available[key] = db.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": key[1]}
+            ).first() is not None
+        return _fts_available[key]
+
+    @staticmethod
+    def _match(db: Session, model, user_id: int, term: str):
+        """Kondisi: term muncul di nama atau id (tidak peka huruf besar/kecil)"""
+        if len(term) >= MIN_TRIGRAM_LENGTH and CatalogSearchService._uses_fts(db, model):
+            fts = _fts_table(model)
+            phrase = '"' + term.replace('"', '""') + '"'
+            return model.id.in_(
+                select(fts.c.id).where(literal_column(_fts_name(model)).op("MATCH")(phrase), fts.c.user_id == user_id)
+            )
+        # PostgreSQL: ILIKE '%term%' is served by the pg_trgm indexes
+        pattern = f"%{_escape_like(term)}%"
+        return or_(model.nama.ilike(pattern, escape="\\"), model.id.ilike(pattern, escape="\\"))
+
+    @staticmethod
+    def search(
+        db: Session,
+        model,
+        user_id: int,
+        q: str = "",
+        limit: int = DEFAULT_LIMIT,
+        offset: int = 0
+    ) -> Tuple[list, int]:
+        """
+        Cari produk atau bahan milik user berdasarkan nama/ID
+
+        Hasil yang diawali q (nama atau ID) lebih dulu, lalu urut nama.
+        Tanpa q semua baris dikembalikan per halaman.
+
+        Args:
+            model: Product atau Material
+            q: Kata kunci (substring)
+            limit / offset: Halaman hasil
+
+        Returns:
+            (baris model pada halaman ini, total baris yang cocok)
+        """
+        term = q.strip()
+        conditions = [model.user_id == user_id]
+        order_by = [model.nama, model.id]
+        if term:
+            conditions.append(CatalogSearchService._match(db, model, user_id, term))
+            prefix = f"{_escape_like(term)}%"
+            is_prefix = or_(model.nama.ilike(prefix, escape="\\"), model.id.ilike(prefix, escape="\\"))
+            order_by.insert(0, case((is_prefix, 0), else_=1))
+
+        total = db.scalar(select(func.count()).select_from(model).where(*conditions))
+        rows = db.scalars(select(model).where(*conditions).order_by(*order_by).limit(limit).offset(offset)).all()
+        return rows, total
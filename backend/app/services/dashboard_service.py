@@ -0,0 +1,156 @@
+"""
+Dashboard Service
+Entity counts, period sales totals and setup health from aggregate queries
+"""
+from datetime import date, timedelta
+from typing import List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from ..models import (
+    Material, Product, Store, StoreProduct, BOM, StoreProductMarketplaceCost,
+    ListingEconomics, StorePerformance
+)
+from ..schemas.dashboard import (
+    DashboardCounts, DashboardDailyPoint, DashboardIssue, DashboardSummaryResponse
+)
+
+DEFAULT_DAYS = 30
+
+
+class DashboardService:
+    """Service untuk ringkasan dashboard"""
+
+    @staticmethod
+    def summary(
+        db: Session,
+        user_id: int,
+        days: int = DEFAULT_DAYS,
+        store_id: Optional[str] = None,
+        today: Optional[date] = None
+    ) -> DashboardSummaryResponse:
+        """
+        Ringkasan dashboard dalam tiga query: jumlah entitas dan isu setup
+        (satu SELECT berisi subquery COUNT), total periode, dan seri harian
+
+        Args:
+            db: Database session
+            user_id: ID user saat ini
+            days: Panjang periode penjualan (hari terakhir, termasuk hari ini)
+            store_id: Filter toko untuk data penjualan (opsional)
+            today: Tanggal akhir periode (default hari ini)
+
+        Returns:
+            DashboardSummaryResponse
+        """
+        period_end = today or date.today()
+        period_start = period_end - timedelta(days=days)
+
+        def count(model, *criteria):
+            return select(func.count()).select_from(model).where(model.user_id == user_id, *criteria).scalar_subquery()
+
+        counts = db.execute(select(
+            count(Material).label("materials"),
+            count(Product).label("products"),
+            count(Store).label("stores"),
+            count(StoreProduct).label("listings"),
+            count(Product, ~select(BOM.id).where(
+                BOM.user_id == Product.user_id, BOM.product_id == Product.id
+            ).exists()).label("products_without_bom"),
+            count(StoreProduct, ~select(StoreProductMarketplaceCost.id).where(
+                StoreProductMarketplaceCost.user_id == StoreProduct.user_id,
+                StoreProductMarketplaceCost.store_product_id == StoreProduct.id
+            ).exists()).label("listings_without_fees"),
+            count(ListingEconomics, ListingEconomics.profit_per_order < 0).label("listings_at_loss"),
+        )).one()
+
+        conditions = [
+            StorePerformance.user_id == user_id,
+            StorePerformance.date >= period_start,
+            StorePerformance.date <= period_end,
+        ]
+        if store_id:
+            conditions.append(StorePerformance.store_id == store_id)
+
+        revenue, gross, orders, avg_conversion, performance_rows = db.execute(select(
+            func.sum(StorePerformance.revenue),
+            func.sum(func.coalesce(StorePerformance.gross_revenue, StorePerformance.revenue)),
+            func.sum(StorePerformance.orders),
+            func.avg(StorePerformance.conversion_rate),
+            func.count(StorePerformance.id),
+        ).where(*conditions)).one()
+        revenue = float(revenue or 0)
+        gross = float(gross or 0)
+
+        daily = db.execute(select(
+            StorePerformance.date,
+            func.sum(StorePerformance.revenue),
+            func.sum(StorePerformance.gross_revenue),
+            func.sum(StorePerformance.orders),
+        ).where(*conditions).group_by(StorePerformance.date).order_by(StorePerformance.date)).all()
+
+        issues = DashboardService._issues(counts, performance_rows)
+        return DashboardSummaryResponse(
+            period_start=period_start,
+            period_end=period_end,
+            counts=DashboardCounts(
+                materials=counts.materials,
+                products=counts.products,
+                stores=counts.stores,
+                listings=counts.listings
+            ),
+            revenue=revenue,
+            gross_revenue=gross,
+            orders=int(orders or 0),
+            avg_conversion=float(avg_conversion or 0),
+            cancellation_rate=1 - revenue / gross if gross > 0 else 0.0,
+            status="needs_attention" if any(i.type != "info" for i in issues) else "healthy",
+            issues=issues,
+            daily=[
+                DashboardDailyPoint(
+                    date=day,
+                    revenue=float(day_revenue or 0),
+                    gross_revenue=float(day_gross or 0),
+                    orders=int(day_orders or 0)
+                )
+                for day, day_revenue, day_gross, day_orders in daily
+            ]
+        )
+
+    @staticmethod
+    def _issues(counts, performance_rows: int) -> List[DashboardIssue]:
+        """Isu setup bisnis; 'danger' dan 'warning' membuat status needs_attention"""
+        issues = []
+        if counts.stores == 0:
+            issues.append(DashboardIssue(type="danger", msg="Belum ada toko yang terhubung", link="/marketplaces"))
+        if counts.products == 0:
+            issues.append(DashboardIssue(type="warning", msg="Belum ada produk yang didaftarkan", link="/products"))
+        if counts.listings_at_loss:
+            issues.append(DashboardIssue(
+                type="danger",
+                msg=f"{counts.listings_at_loss} produk di toko rugi per pesanan pada harga jual saat ini",
+                link="/marketplaces",
+                count=counts.listings_at_loss
+            ))
+        if counts.products_without_bom:
+            issues.append(DashboardIssue(
+                type="warning",
+                msg=f"{counts.products_without_bom} produk belum punya BOM, HPP-nya dihitung 0",
+                link="/products",
+                count=counts.products_without_bom
+            ))
+        if counts.listings_without_fees:
+            issues.append(DashboardIssue(
+                type="warning",
+                msg=f"{counts.listings_without_fees} produk di toko belum diatur biaya marketplace-nya",
+                link="/marketplaces",
+                count=counts.listings_without_fees
+            ))
+        if performance_rows == 0:
+            issues.append(DashboardIssue(
+                type="info",
+                msg="Belum ada data penjualan. Impor laporan Shopee untuk melihat analisis.",
+                link="/sales-import"
+            ))
+        return issues
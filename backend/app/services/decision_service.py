@@ -4,10 +4,13 @@ Handles product viability grading and alerts
 """
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from typing import Optional, List
-from ..models import Store, Product, StoreProduct, Ad
+from typing import Dict, Iterable, Optional, List, Tuple
+from datetime import date
+from ..models import StoreProduct, Ad
 from ..schemas.decision import DecisionResponse, Alert
+from ..schemas.pricing import PricingCalcResponse
 from .hpp_service import HPPService
+from .batching import chunked
 from .pricing_service import PricingService
 
 
@@ -22,7 +25,15 @@ class DecisionService:
     ROAS_THRESHOLD_WARNING = 2.0  # ROAS below 2 is concerning
     
     @staticmethod
-    def get_decision(db: Session, store_id: str, product_id: str, user_id: int) -> Optional[DecisionResponse]:
+    def get_decision(
+        db: Session,
+        store_id: str,
+        product_id: str,
+        user_id: int,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        as_of: Optional[date] = None
+    ) -> Optional[DecisionResponse]:
         """
         Mendapatkan keputusan/grading untuk produk di toko tertentu
         
@@ -37,35 +48,27 @@ class DecisionService:
             store_id: ID toko
             product_id: ID produk
             user_id: ID user saat ini
+            date_from / date_to: Hanya iklan yang periodenya overlap window ini
+                (opsional; default seluruh histori)
+            as_of: Tanggal harga bahan dan biaya ekstra untuk HPP (opsional;
+                default date_to jika ada, selain itu harga saat ini)
             
         Returns:
             DecisionResponse dengan grade dan alerts
         """
-        # Get store and product
-        store = db.query(Store).filter(
-            Store.id == store_id,
-            Store.user_id == user_id
-        ).first()
-        product = db.query(Product).filter(
-            Product.id == product_id,
-            Product.user_id == user_id
-        ).first()
-        
-        if not store or not product:
-            return None
-        
-        # Get store_product
-        store_product = db.query(StoreProduct).filter(
-            StoreProduct.store_id == store_id,
-            StoreProduct.product_id == product_id,
-            StoreProduct.user_id == user_id
-        ).first()
-        
-        if not store_product:
+        # Get store_product with its store and product in one query
+        listings = PricingService.load_listings(
+            db, user_id, StoreProduct.store_id == store_id, StoreProduct.product_id == product_id
+        )
+        if not listings:
             return None
+        store_product, store, product = listings[0]
         
         # Get pricing info
-        pricing = PricingService.calculate_forward_pricing(db, store_product.id, user_id)
+        # A historical window is costed with the prices in force at its end
+        if as_of is None:
+            as_of = date_to
+        pricing = PricingService.price_listings(db, listings[:1], user_id, as_of=as_of).get(store_product.id)
         if not pricing:
             return None
         
@@ -74,43 +77,27 @@ class DecisionService:
         profit_per_order = pricing.profit_per_order
         margin_percent = pricing.margin_percent
         
-        # Calculate break-even metrics
-        # Break-even ROAS = harga_jual / profit_per_order
-        # Max CPA = profit_per_order
-        break_even_roas = (harga_jual / profit_per_order) if profit_per_order > 0 else float('inf')
-        max_cpa = profit_per_order if profit_per_order > 0 else 0
-        
         # Get ads data
         ads = db.query(Ad).filter(
             Ad.store_id == store_id,
             Ad.product_id == product_id,
-            Ad.user_id == user_id
+            Ad.user_id == user_id,
+            Ad.overlapping(date_from, date_to)
         ).all()
         
         has_ads_data = len(ads) > 0
         total_ads_spend = None
         total_gmv = None
         total_orders = None
-        roas = None
-        cpa = None
-        ads_profit_total = None
-        ads_profit_per_order = None
         
         if has_ads_data:
             total_ads_spend = sum(ad.spend for ad in ads)
             total_gmv = sum(ad.gmv for ad in ads)
             total_orders = sum(ad.orders for ad in ads)
-            
-            if total_ads_spend > 0:
-                roas = total_gmv / total_ads_spend
-            if total_orders > 0:
-                cpa = total_ads_spend / total_orders
-                
-                # Calculate ads profit
-                # profit_total = gmv - (HPP * orders) - total_biaya_marketplace*orders - spend
-                total_cost_per_order = hpp + pricing.total_biaya_marketplace
-                ads_profit_total = total_gmv - (total_cost_per_order * total_orders) - total_ads_spend
-                ads_profit_per_order = ads_profit_total / total_orders
+        
+        break_even_roas, max_cpa, roas, cpa, ads_profit_total, ads_profit_per_order = DecisionService._ads_metrics(
+            pricing, total_ads_spend, total_gmv, total_orders
+        )
         
         # Determine grade
         grade, grade_reason = DecisionService._calculate_grade(
@@ -146,6 +133,102 @@ class DecisionService:
             max_cpa=round(max_cpa, 2)
         )
     
+    @staticmethod
+    def grade_pricing_batch(
+        db: Session,
+        pricings: Iterable[PricingCalcResponse],
+        user_id: int,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None
+    ) -> Dict[int, Tuple[str, str]]:
+        """
+        Grade banyak listing dari hasil forward pricing yang sudah dihitung
+        
+        Aturan sama dengan get_decision; total iklan semua listing dimuat dengan
+        satu query grouped per IN_LIST_SIZE produk.
+        
+        Args:
+            db: Database session
+            pricings: Hasil PricingService (boleh hasil simulasi, mis. HPP baru)
+            user_id: ID user saat ini
+            date_from / date_to: Hanya iklan yang periodenya overlap window ini (opsional)
+            
+        Returns:
+            Dict store_product_id -> (grade, grade_reason)
+        """
+        pricings = list(pricings)
+        totals = DecisionService.ads_totals(db, [p.product_id for p in pricings], user_id, date_from, date_to)
+        
+        grades = {}
+        for pricing in pricings:
+            break_even_roas, _, roas, _, _, ads_profit_per_order = DecisionService._ads_metrics(
+                pricing, *totals.get((pricing.store_id, pricing.product_id), (None, None, None))
+            )
+            grades[pricing.store_product_id] = DecisionService._calculate_grade(
+                pricing.profit_per_order, pricing.margin_percent, roas, break_even_roas, ads_profit_per_order
+            )
+        return grades
+    
+    @staticmethod
+    def ads_totals(
+        db: Session,
+        product_ids: Iterable[str],
+        user_id: int,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None
+    ) -> Dict[Tuple[str, str], Tuple[int, int, int]]:
+        """
+        Total spend, GMV dan orders iklan per (store_id, product_id), satu query
+        grouped per IN_LIST_SIZE produk; listing tanpa iklan tidak ada di hasil
+        """
+        product_ids = sorted(set(product_ids))
+        totals = {}
+        for chunk in chunked(product_ids):
+            for store_id, product_id, spend, gmv, orders in db.query(
+                Ad.store_id, Ad.product_id, func.sum(Ad.spend), func.sum(Ad.gmv), func.sum(Ad.orders)
+            ).filter(
+                Ad.user_id == user_id,
+                Ad.product_id.in_(chunk),
+                Ad.overlapping(date_from, date_to)
+            ).group_by(Ad.store_id, Ad.product_id):
+                totals[(store_id, product_id)] = (spend, gmv, orders)
+        return totals
+
+    @staticmethod
+    def _ads_metrics(
+        pricing: PricingCalcResponse,
+        total_ads_spend: Optional[int],
+        total_gmv: Optional[int],
+        total_orders: Optional[int]
+    ) -> tuple:
+        """Break-even ROAS, max CPA, ROAS, CPA dan profit iklan dari total iklan listing"""
+        profit_per_order = pricing.profit_per_order
+        
+        # Calculate break-even metrics
+        # Break-even ROAS = harga_jual / profit_per_order
+        # Max CPA = profit_per_order
+        break_even_roas = (pricing.harga_jual / profit_per_order) if profit_per_order > 0 else float('inf')
+        max_cpa = profit_per_order if profit_per_order > 0 else 0
+        
+        roas = None
+        cpa = None
+        ads_profit_total = None
+        ads_profit_per_order = None
+        
+        if total_ads_spend is not None:
+            if total_ads_spend > 0:
+                roas = total_gmv / total_ads_spend
+            if total_orders > 0:
+                cpa = total_ads_spend / total_orders
+                
+                # Calculate ads profit
+                # profit_total = gmv - (HPP * orders) - total_biaya_marketplace*orders - spend
+                total_cost_per_order = pricing.hpp + pricing.total_biaya_marketplace
+                ads_profit_total = total_gmv - (total_cost_per_order * total_orders) - total_ads_spend
+                ads_profit_per_order = ads_profit_total / total_orders
+        
+        return break_even_roas, max_cpa, roas, cpa, ads_profit_total, ads_profit_per_order
+    
     @staticmethod
     def _calculate_grade(
         profit_per_order: float,
@@ -0,0 +1,215 @@
+"""
+Export Service
+Streams performance, ads and pricing data as CSV or XLSX
+"""
+import csv
+import io
+import tempfile
+from datetime import date
+from typing import Iterable, Iterator, List, Optional
+
+from openpyxl import Workbook
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from ..models import Ad, Product, ProductPerformance, Store, StorePerformance, StoreProduct
+from .pricing_service import PricingService
+
+# Rows fetched per round-trip; the server-side cursor keeps memory flat regardless of table size
+YIELD_PER = 1000
+# CSV rows buffered before a chunk is sent
+CSV_CHUNK_ROWS = 500
+XLSX_CHUNK_BYTES = 64 * 1024
+
+STORE_PERFORMANCE_COLUMNS = [
+    "date", "store_id", "store_name", "visitors", "orders", "gross_revenue", "net_revenue",
+    "conversion_rate", "avg_order_value",
+]
+
+ADS_COLUMNS = [
+    "id", "store_id", "product_id", "product_name", "campaign", "start_date", "end_date",
+    "impressions", "clicks", "ctr", "spend", "gmv", "orders", "items_sold", "total_sales",
+    "roas", "acos", "cpa", "aov", "tacos",
+]
+
+PRICING_COLUMNS = [
+    "store_product_id", "store_id", "store_name", "product_id", "product_name", "harga_jual",
+    "total_diskon", "harga_setelah_diskon", "total_biaya_marketplace", "hpp", "profit_per_order",
+    "margin_percent", "break_even_roas", "max_cpa",
+]
+
+
+def _ratio(numerator, denominator, digits: int) -> Optional[float]:
+    return round(numerator / denominator, digits) if denominator else None
+
+
+class ExportService:
+    """Service untuk export data dalam jumlah besar"""
+
+    @staticmethod
+    def store_performance_rows(
+        db: Session,
+        user_id: int,
+        store_id: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> Iterator[list]:
+        """
+        Baris performa toko harian, urut per toko lalu tanggal
+
+        Args:
+            db: Database session
+            user_id: ID user saat ini
+            store_id: Filter toko (opsional)
+            start_date / end_date: Rentang tanggal inklusif (opsional)
+        """
+        stmt = select(
+            StorePerformance.date, StorePerformance.store_id, Store.name,
+            StorePerformance.visitors, StorePerformance.orders, StorePerformance.gross_revenue,
+            StorePerformance.revenue, StorePerformance.conversion_rate, StorePerformance.avg_order_value
+        ).join(
+            Store, (Store.id == StorePerformance.store_id) & (Store.user_id == StorePerformance.user_id)
+        ).where(StorePerformance.user_id == user_id)
+        if store_id:
+            stmt = stmt.where(StorePerformance.store_id == store_id)
+        if start_date:
+            stmt = stmt.where(StorePerformance.date >= start_date)
+        if end_date:
+            stmt = stmt.where(StorePerformance.date <= end_date)
+        stmt = stmt.order_by(StorePerformance.store_id, StorePerformance.date)
+
+        for row in db.execute(stmt.execution_options(yield_per=YIELD_PER)):
+            yield list(row)
+
+    @staticmethod
+    def ads_rows(
+        db: Session,
+        user_id: int,
+        store_id: Optional[str] = None,
+        product_id: Optional[str] = None
+    ) -> Iterator[list]:
+        """
+        Baris iklan dengan metrik turunan (ROAS, ACOS, CPA, AOV, TACoS)
+
+        TACoS memakai total_sales iklan, atau total revenue ProductPerformance
+        untuk produk di toko tersebut jika total_sales kosong (sama seperti GET /ads).
+        """
+        # One aggregate instead of a revenue lookup per ad
+        revenue_stmt = select(
+            ProductPerformance.store_id, ProductPerformance.product_id, func.sum(ProductPerformance.revenue)
+        ).where(ProductPerformance.user_id == user_id)
+        if store_id:
+            revenue_stmt = revenue_stmt.where(ProductPerformance.store_id == store_id)
+        if product_id:
+            revenue_stmt = revenue_stmt.where(ProductPerformance.product_id == product_id)
+        revenue = {
+            (s_id, p_id): float(total or 0)
+            for s_id, p_id, total in db.execute(
+                revenue_stmt.group_by(ProductPerformance.store_id, ProductPerformance.product_id)
+            )
+        }
+
+        stmt = select(
+            Ad.id, Ad.store_id, Ad.product_id, Product.nama, Ad.campaign, Ad.start_date, Ad.end_date,
+            Ad.impressions, Ad.clicks, Ad.ctr, Ad.spend, Ad.gmv, Ad.orders, Ad.items_sold, Ad.total_sales
+        ).outerjoin(
+            Product, (Product.id == Ad.product_id) & (Product.user_id == Ad.user_id)
+        ).where(Ad.user_id == user_id)
+        if store_id:
+            stmt = stmt.where(Ad.store_id == store_id)
+        if product_id:
+            stmt = stmt.where(Ad.product_id == product_id)
+        stmt = stmt.order_by(Ad.store_id, Ad.start_date, Ad.id)
+
+        for row in db.execute(stmt.execution_options(yield_per=YIELD_PER)):
+            (ad_id, s_id, p_id, name, campaign, start, end,
+             impressions, clicks, ctr, spend, gmv, orders, items_sold, total_sales) = row
+            total_sales = total_sales or revenue.get((s_id, p_id)) or None
+            yield [
+                ad_id, s_id, p_id, name, campaign, start, end,
+                impressions, clicks, ctr, spend, gmv, orders, items_sold, total_sales,
+                _ratio(gmv, spend, 2), _ratio(spend, gmv, 4), _ratio(spend, orders, 2),
+                _ratio(gmv, orders, 2), _ratio(spend, total_sales, 4),
+            ]
+
+    @staticmethod
+    def pricing_rows(
+        db: Session,
+        user_id: int,
+        store_id: Optional[str] = None,
+        as_of: Optional[date] = None
+    ) -> Iterator[list]:
+        """
+        Forward pricing untuk seluruh portofolio store product
+
+        Dihitung per batch dengan PricingService.calculate_forward_pricing_batch;
+        HPP tiap produk dihitung sekali untuk seluruh export, dengan harga yang
+        berlaku pada as_of jika diisi.
+        """
+        hpp_cache = {}
+
+        stmt = select(StoreProduct.id).where(StoreProduct.user_id == user_id)
+        if store_id:
+            stmt = stmt.where(StoreProduct.store_id == store_id)
+        stmt = stmt.order_by(StoreProduct.store_id, StoreProduct.id)
+
+        result = db.execute(stmt.execution_options(yield_per=YIELD_PER))
+        for batch in result.partitions():
+            sp_ids = [row[0] for row in batch]
+            priced = PricingService.calculate_forward_pricing_batch(db, sp_ids, user_id, hpp_cache, as_of=as_of)
+
+            for sp_id in sp_ids:
+                p = priced.get(sp_id)
+                if not p:
+                    continue
+                profit_per_order = p.profit_per_order
+                yield [
+                    p.store_product_id, p.store_id, p.store_name, p.product_id, p.product_name, p.harga_jual,
+                    p.total_diskon, p.harga_setelah_diskon, p.total_biaya_marketplace, p.hpp,
+                    round(profit_per_order, 2), round(p.margin_percent, 2),
+                    _ratio(p.harga_jual, profit_per_order, 2) if profit_per_order > 0 else None,
+                    round(max(profit_per_order, 0), 2),
+                ]
+
+            # Loaded listings, discounts and fees are not needed after this batch
+            db.expunge_all()
+
+    @staticmethod
+    def iter_csv(columns: List[str], rows: Iterable[list]) -> Iterator[str]:
+        """Encode rows as CSV text chunks"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        pending = 0
+        for row in rows:
+            writer.writerow(row)
+            pending += 1
+            if pending >= CSV_CHUNK_ROWS:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+                pending = 0
+        yield buffer.getvalue()
+
+    @staticmethod
+    def iter_xlsx(columns: List[str], rows: Iterable[list], sheet_title: str) -> Iterator[bytes]:
+        """
+        Encode rows as an XLSX file
+
+        Write-only workbooks spool rows to disk, so only the final file is
+        streamed from a temporary file in fixed-size chunks.
+        """
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet(title=sheet_title)
+        ws.append(columns)
+        for row in rows:
+            ws.append(row)
+
+        with tempfile.TemporaryFile() as tmp:
+            wb.save(tmp)
+            tmp.seek(0)
+            while True:
+                chunk = tmp.read(XLSX_CHUNK_BYTES)
+                if not chunk:
+                    break
+                yield chunk
@@ -0,0 +1,180 @@
+"""
+Grading Service
+Nightly re-grading of all listings into daily GradeSnapshot rows, and grade trends
+"""
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from functools import partial
+from typing import Dict, List, Optional
+
+from sqlalchemy import delete, insert
+from sqlalchemy.orm import Session
+
+from ..database import SessionLocal
+from ..models import StoreProduct, GradeSnapshot
+from .batching import chunked
+from .pricing_service import PricingService
+from .decision_service import DecisionService
+
+logger = logging.getLogger(__name__)
+
+# Worker processes for the nightly run (default: one per CPU)
+GRADING_WORKERS = int(os.getenv("GRADING_WORKERS", "0")) or os.cpu_count() or 1
+# Snapshot rows per executemany batch
+SNAPSHOT_CHUNK_SIZE = 1000
+
+
+def _grade_user_job(user_id: int, as_of: date) -> List[dict]:
+    """Process pool entry point: grade one user with its own session"""
+    db = SessionLocal()
+    try:
+        return GradingService.grade_user(db, user_id, as_of)
+    finally:
+        db.close()
+
+
+class GradingService:
+    """Service untuk re-grading terjadwal dan riwayat grade listing"""
+
+    @staticmethod
+    def grade_user(db: Session, user_id: int, as_of: Optional[date] = None) -> List[dict]:
+        """
+        Grade semua listing user dengan aturan get_decision
+
+        Args:
+            as_of: Tanggal grading (default hari ini): HPP dari harga bahan dan biaya
+                ekstra yang berlaku saat itu; untuk tanggal lampau hanya iklan yang
+                periodenya dimulai sampai tanggal ini. Harga jual, diskon dan biaya
+                marketplace tetap yang saat ini.
+
+        Returns:
+            Baris snapshot tanpa snapshot_date: store_product_id, store_id, product_id,
+            grade, margin_percent, roas, profit_per_order
+        """
+        sp_ids = [
+            sp_id for (sp_id,) in db.query(StoreProduct.id).filter(
+                StoreProduct.user_id == user_id
+            ).order_by(StoreProduct.id)
+        ]
+        as_of = as_of or date.today()
+        pricings = PricingService.calculate_forward_pricing_batch(db, sp_ids, user_id, as_of=as_of).values()
+        # Ads without a period never match a bounded window, so today keeps the unbounded totals
+        totals = DecisionService.ads_totals(
+            db, [p.product_id for p in pricings], user_id, date_to=as_of if as_of < date.today() else None
+        )
+
+        rows = []
+        for pricing in pricings:
+            break_even_roas, _, roas, _, _, ads_profit_per_order = DecisionService._ads_metrics(
+                pricing, *totals.get((pricing.store_id, pricing.product_id), (None, None, None))
+            )
+            grade, _ = DecisionService._calculate_grade(
+                pricing.profit_per_order, pricing.margin_percent, roas, break_even_roas, ads_profit_per_order
+            )
+            rows.append({
+                "store_product_id": pricing.store_product_id,
+                "store_id": pricing.store_id,
+                "product_id": pricing.product_id,
+                "grade": grade,
+                "margin_percent": round(pricing.margin_percent, 2),
+                "roas": round(roas, 2) if roas is not None else None,
+                "profit_per_order": round(pricing.profit_per_order, 2),
+            })
+        return rows
+
+    @staticmethod
+    def save_snapshots(db: Session, user_id: int, snapshot_date: date, rows: List[dict]) -> int:
+        """
+        Ganti snapshot user pada snapshot_date dengan rows (tanpa commit)
+
+        Menjalankan ulang job di hari yang sama menimpa, bukan menggandakan.
+        """
+        db.execute(delete(GradeSnapshot).where(
+            GradeSnapshot.user_id == user_id,
+            GradeSnapshot.snapshot_date == snapshot_date
+        ))
+        for batch in chunked(rows, SNAPSHOT_CHUNK_SIZE):
+            db.execute(insert(GradeSnapshot), [
+                {**row, "user_id": user_id, "snapshot_date": snapshot_date}
+                for row in batch
+            ])
+        return len(rows)
+
+    @staticmethod
+    def run_all(
+        snapshot_date: Optional[date] = None,
+        workers: Optional[int] = None,
+        user_ids: Optional[List[int]] = None
+    ) -> Dict[int, int]:
+        """
+        Re-grade semua listing semua user dan simpan snapshot harian
+
+        Grading (pricing + iklan) per user disebar ke process pool; penulisan
+        snapshot dilakukan di proses ini, satu transaksi per user, agar aman
+        juga untuk SQLite. Gagal di satu user tidak menghentikan user lain.
+
+        Args:
+            snapshot_date: Tanggal snapshot (default hari ini); listing di-grade per
+                tanggal ini (lihat grade_user), sehingga bisa dipakai untuk backfill
+            workers: Jumlah proses (default GRADING_WORKERS; 1 = tanpa pool)
+            user_ids: Hanya user ini (default semua user yang punya listing)
+
+        Returns:
+            Dict user_id -> jumlah snapshot yang ditulis
+        """
+        snapshot_date = snapshot_date or date.today()
+        workers = workers or GRADING_WORKERS
+        db = SessionLocal()
+        try:
+            if user_ids is None:
+                user_ids = [
+                    user_id for (user_id,) in db.query(StoreProduct.user_id).distinct().order_by(StoreProduct.user_id)
+                ]
+            if workers > 1 and len(user_ids) > 1:
+                # spawn: the scheduler calls this from a thread of the API process
+                with ProcessPoolExecutor(
+                    max_workers=min(workers, len(user_ids)), mp_context=multiprocessing.get_context("spawn")
+                ) as pool:
+                    jobs = [(user_id, pool.submit(_grade_user_job, user_id, snapshot_date).result) for user_id in user_ids]
+                    return GradingService._save_all(db, snapshot_date, jobs)
+            jobs = [(user_id, partial(GradingService.grade_user, db, user_id, snapshot_date)) for user_id in user_ids]
+            return GradingService._save_all(db, snapshot_date, jobs)
+        finally:
+            db.close()
+
+    @staticmethod
+    def _save_all(db: Session, snapshot_date: date, jobs: list) -> Dict[int, int]:
+        """Tulis hasil per user begitu tersedia; jobs berisi (user_id, fungsi yang mengembalikan rows)"""
+        written = {}
+        for user_id, fetch in jobs:
+            try:
+                written[user_id] = GradingService.save_snapshots(db, user_id, snapshot_date, fetch())
+                db.commit()
+            except Exception:
+                db.rollback()
+                logger.exception("Re-grading user %s gagal", user_id)
+        return written
+
+    @staticmethod
+    def trend(
+        db: Session,
+        user_id: int,
+        store_id: str,
+        product_id: str,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None
+    ) -> List[GradeSnapshot]:
+        """Snapshot grade satu listing, urut tanggal (range scan di ix_grade_snapshots_trend)"""
+        query = db.query(GradeSnapshot).filter(
+            GradeSnapshot.user_id == user_id,
+            GradeSnapshot.store_id == store_id,
+            GradeSnapshot.product_id == product_id
+        )
+        if date_from:
+            query = query.filter(GradeSnapshot.snapshot_date >= date_from)
+        if date_to:
+            query = query.filter(GradeSnapshot.snapshot_date <= date_to)
+        return query.order_by(GradeSnapshot.snapshot_date).all()
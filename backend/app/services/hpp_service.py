@@ -2,78 +2,128 @@
 HPP (Harga Pokok Penjualan) Service
 Handles cost of goods sold calculations
 """
+from collections import defaultdict
+from datetime import date
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 from ..models import Product, BOM, Material, ProductExtraCost
 from ..schemas.hpp import HPPResponse, BOMDetail
 from ..schemas.product_extra_cost import ProductExtraCostResponse
+from .batching import chunked
+from .price_history_service import PriceHistoryService
+
+
+class BOMCycleError(ValueError):
+    """Sub-assembly lines form a cycle, so HPP is undefined; message is shown to the user"""
+
+    def __init__(self, cycle: List[str]):
+        self.cycle = cycle
+        super().__init__("BOM membentuk siklus: " + " -> ".join(cycle))
 
 
 class HPPService:
     """Service untuk menghitung HPP produk"""
-    
+
     @staticmethod
-    def calculate_hpp(db: Session, product_id: str, user_id: int) -> Optional[HPPResponse]:
+    def calculate_hpp(
+        db: Session,
+        product_id: str,
+        user_id: int,
+        as_of: Optional[date] = None
+    ) -> Optional[HPPResponse]:
         """
         Menghitung HPP untuk produk tertentu
-        
+
         HPP = total_bahan + biaya_lain + sum(extra_costs)
         total_bahan = sum(qty * harga_satuan untuk setiap bahan dalam BOM)
-        
+                    + sum(qty * HPP sub-assembly untuk setiap produk komponen)
+
         Args:
             db: Database session
             product_id: ID produk
             user_id: ID user saat ini
-            
+            as_of: Pakai harga bahan dan biaya ekstra yang berlaku pada tanggal ini
+                (opsional; default harga saat ini)
+
         Returns:
             HPPResponse atau None jika produk tidak ditemukan atau bukan milik user
+
+        Raises:
+            BOMCycleError jika sub-assembly membentuk siklus
         """
-        # Get product
-        product = db.query(Product).filter(
-            Product.id == product_id,
-            Product.user_id == user_id
-        ).first()
+        # Get product (identity map first: the request may have loaded it already)
+        product = db.get(Product, (product_id, user_id))
         if not product:
             return None
-        
-        # Get BOM items with materials
-        bom_items = db.query(BOM).filter(
-            BOM.product_id == product_id,
-            BOM.user_id == user_id
-        ).all()
-        
+
+        # One DAG evaluation gives the BOM lines, resolved material prices and sub-assembly costs
+        hpp_values, lines, prices = HPPService._evaluate(db, [product_id], user_id, {}, None, as_of)
+        bom_items = lines[product_id]
+
+        material_ids = [m_id for m_id, _, _ in bom_items if m_id]
+        materials = {
+            m.id: m for m in db.query(Material).filter(
+                Material.user_id == user_id, Material.id.in_(material_ids)
+            )
+        } if material_ids else {}
+        components = HPPService._get_products(
+            db, [c_id for _, c_id, _ in bom_items if c_id], user_id
+        )
+
         bom_details = []
         total_bahan = 0.0
-        
-        for bom in bom_items:
-            material = db.query(Material).filter(
-                Material.id == bom.material_id,
-                Material.user_id == user_id
-            ).first()
-            if material:
-                biaya_bahan = bom.qty * material.harga_satuan
-                total_bahan += biaya_bahan
-                
+
+        for material_id, component_product_id, qty in bom_items:
+            if material_id:
+                material = materials.get(material_id)
+                if not material:
+                    continue
+                biaya_bahan = qty * prices[material.id]
                 bom_details.append(BOMDetail(
                     material_id=material.id,
                     material_nama=material.nama,
                     material_satuan=material.satuan,
-                    qty=bom.qty,
-                    harga_satuan=material.harga_satuan,
+                    qty=qty,
+                    harga_satuan=prices[material.id],
                     biaya_bahan=biaya_bahan
                 ))
-        
+            else:
+                component = components.get(component_product_id)
+                if not component:
+                    continue
+                unit_hpp = hpp_values.get(component.id, 0)
+                biaya_bahan = qty * unit_hpp
+                bom_details.append(BOMDetail(
+                    component_product_id=component.id,
+                    material_nama=component.nama,
+                    qty=qty,
+                    harga_satuan=unit_hpp,
+                    biaya_bahan=biaya_bahan
+                ))
+            total_bahan += biaya_bahan
+
         # Get extra costs
-        extra_costs_items = db.query(ProductExtraCost).filter(
-            ProductExtraCost.product_id == product_id,
-            ProductExtraCost.user_id == user_id
-        ).all()
-        extra_costs_responses = [ProductExtraCostResponse.from_orm(ec) for ec in extra_costs_items]
-        total_extra = sum(ec.value for ec in extra_costs_items)
-        
+        if as_of is None:
+            extra_costs_items = db.query(ProductExtraCost).filter(
+                ProductExtraCost.product_id == product_id,
+                ProductExtraCost.user_id == user_id
+            ).all()
+            extra_costs_responses = [ProductExtraCostResponse.from_orm(ec) for ec in extra_costs_items]
+        else:
+            # Costs deleted before as_of are recorded with value 0
+            extra_costs_responses = [
+                ProductExtraCostResponse(id=c_id, product_id=product_id, label=label, value=value)
+                for c_id, label, value in PriceHistoryService.extra_costs_as_of(
+                    db, [product_id], user_id, as_of
+                ).get(product_id, [])
+                if value
+            ]
+        total_extra = sum(ec.value for ec in extra_costs_responses)
+
         total_biaya_lain = total_extra
         hpp = total_bahan + total_biaya_lain
-        
+
         return HPPResponse(
             product_id=product.id,
             product_nama=product.nama,
@@ -83,19 +133,249 @@ class HPPService:
             biaya_lain=total_biaya_lain,
             hpp=hpp
         )
-    
+
     @staticmethod
-    def get_hpp_value(db: Session, product_id: str, user_id: int) -> float:
+    def get_hpp_value(db: Session, product_id: str, user_id: int, as_of: Optional[date] = None) -> float:
         """
         Get simple HPP value (number only)
-        
+
         Args:
             db: Database session
             product_id: ID produk
             user_id: ID user saat ini
-            
+            as_of: Tanggal harga yang dipakai (opsional; default harga saat ini)
+
         Returns:
             HPP value or 0 if product not found or unauthorized
         """
-        result = HPPService.calculate_hpp(db, product_id, user_id)
-        return result.hpp if result else 0
+        return HPPService.calculate_hpp_values(db, [product_id], user_id, as_of=as_of).get(product_id, 0)
+
+    @staticmethod
+    def calculate_hpp_values(
+        db: Session,
+        product_ids: Iterable[str],
+        user_id: int,
+        cache: Optional[Dict[str, float]] = None,
+        material_prices: Optional[Dict[str, float]] = None,
+        as_of: Optional[date] = None
+    ) -> Dict[str, float]:
+        """
+        HPP banyak produk sekaligus lewat evaluasi topologis DAG produk
+
+        Baris BOM dimuat per level (satu query per level sub-assembly), harga bahan
+        dan biaya ekstra dengan satu query masing-masing. Tiap node dievaluasi
+        sekali dan disimpan di cache, sehingga sub-assembly yang dipakai banyak
+        produk tidak dihitung ulang.
+
+        Args:
+            db: Database session
+            product_ids: ID produk yang dihitung
+            user_id: ID user saat ini
+            cache: Dict product_id -> HPP yang dipakai ulang dan diisi (opsional);
+                berisi juga HPP semua sub-assembly yang dievaluasi
+            material_prices: Dict material_id -> harga_satuan pengganti untuk simulasi
+                (opsional); jangan dicampur dengan cache berisi harga asli
+            as_of: Pakai harga bahan dan biaya ekstra yang berlaku pada tanggal ini
+                (opsional); cache hanya boleh dipakai ulang untuk as_of yang sama
+
+        Returns:
+            Dict product_id -> HPP (cache yang sama jika diberikan)
+
+        Raises:
+            BOMCycleError jika sub-assembly membentuk siklus
+        """
+        if cache is None:
+            cache = {}
+        return HPPService._evaluate(db, product_ids, user_id, cache, material_prices, as_of)[0]
+
+    @staticmethod
+    def _evaluate(
+        db: Session,
+        product_ids: Iterable[str],
+        user_id: int,
+        cache: Dict[str, float],
+        material_prices: Optional[Dict[str, float]],
+        as_of: Optional[date]
+    ) -> Tuple[Dict[str, float], Dict[str, list], Dict[str, float]]:
+        """
+        Isi calculate_hpp_values; juga mengembalikan baris BOM yang dimuat
+        (product_id -> [(material_id, component_product_id, qty)], urut BOM.id)
+        dan harga satuan bahan yang dipakai
+        """
+        lines = defaultdict(list)
+        material_cost = {}
+        targets = [p_id for p_id in dict.fromkeys(product_ids) if p_id not in cache]
+        if not targets:
+            return cache, lines, material_cost
+
+        # Load the sub-graph reachable from the targets, one level at a time;
+        # material prices come with the lines instead of a separate lookup
+        loaded = set()
+        frontier = set(targets)
+        while frontier:
+            loaded |= frontier
+            for chunk in chunked(sorted(frontier)):
+                for p_id, m_id, c_id, qty, harga_satuan in db.query(
+                    BOM.product_id, BOM.material_id, BOM.component_product_id, BOM.qty, Material.harga_satuan
+                ).outerjoin(
+                    Material, (Material.id == BOM.material_id) & (Material.user_id == BOM.user_id)
+                ).filter(BOM.user_id == user_id, BOM.product_id.in_(chunk)).order_by(BOM.id):
+                    lines[p_id].append((m_id, c_id, qty))
+                    if harga_satuan is not None:
+                        material_cost[m_id] = harga_satuan
+            frontier = {
+                c_id for p_id in frontier for _, c_id, _ in lines[p_id]
+                if c_id and c_id not in loaded and c_id not in cache
+            }
+
+        material_ids = sorted({m_id for node in lines.values() for m_id, _, _ in node if m_id})
+        if as_of is not None:
+            material_cost.update(PriceHistoryService.material_prices_as_of(db, material_ids, user_id, as_of))
+        if material_prices:
+            material_cost.update(material_prices)
+
+        extra_cost = {}
+        if as_of is not None:
+            for p_id, costs in PriceHistoryService.extra_costs_as_of(db, loaded, user_id, as_of).items():
+                extra_cost[p_id] = sum(value for _, _, value in costs)
+        else:
+            for chunk in chunked(sorted(loaded)):
+                extra_cost.update(db.query(ProductExtraCost.product_id, func.sum(ProductExtraCost.value)).filter(
+                    ProductExtraCost.user_id == user_id, ProductExtraCost.product_id.in_(chunk)
+                ).group_by(ProductExtraCost.product_id))
+
+        # Iterative post-order DFS: a node is costed after all of its components
+        visiting = set()
+        for root in targets:
+            if root in cache:
+                continue
+            path, pending = [root], [iter(lines[root])]
+            visiting.add(root)
+            while path:
+                descended = False
+                for _, c_id, _ in pending[-1]:
+                    if not c_id or c_id in cache:
+                        continue
+                    if c_id in visiting:
+                        raise BOMCycleError(path[path.index(c_id):] + [c_id])
+                    visiting.add(c_id)
+                    path.append(c_id)
+                    pending.append(iter(lines[c_id]))
+                    descended = True
+                    break
+                if descended:
+                    continue
+
+                node = path.pop()
+                pending.pop()
+                visiting.discard(node)
+                cache[node] = float(extra_cost.get(node) or 0) + sum(
+                    qty * (material_cost.get(m_id, 0) if m_id else cache[c_id])
+                    for m_id, c_id, qty in lines[node]
+                )
+        return cache, lines, material_cost
+
+    @staticmethod
+    def _get_products(db: Session, product_ids: List[str], user_id: int) -> Dict[str, Product]:
+        """
+        Produk per id lewat identity map session; hanya yang belum dimuat
+        di request ini yang diambil dengan satu query
+        """
+        found = {}
+        missing = []
+        for p_id in dict.fromkeys(product_ids):
+            product = db.identity_map.get(db.identity_key(Product, (p_id, user_id)))
+            if product is not None:
+                found[p_id] = product
+            else:
+                missing.append(p_id)
+        for chunk in chunked(missing):
+            found.update((p.id, p) for p in db.query(Product).filter(
+                Product.user_id == user_id, Product.id.in_(chunk)
+            ))
+        return found
+
+    @staticmethod
+    def check_bom_cycle(db: Session, product_id: str, component_product_id: str, user_id: int) -> Optional[List[str]]:
+        """
+        Cek apakah menambah component_product_id ke BOM product_id akan membentuk siklus
+
+        Returns:
+            Jalur siklus (product_id -> ... -> product_id) atau None jika aman
+        """
+        if component_product_id == product_id:
+            return [product_id, product_id]
+        # A cycle appears iff product_id is already reachable from the component
+        parents = {component_product_id: None}
+        frontier = [component_product_id]
+        while frontier:
+            next_frontier = []
+            for chunk in chunked(frontier):
+                for p_id, c_id in db.query(BOM.product_id, BOM.component_product_id).filter(
+                    BOM.user_id == user_id,
+                    BOM.product_id.in_(chunk),
+                    BOM.component_product_id.isnot(None)
+                ):
+                    if c_id in parents:
+                        continue
+                    parents[c_id] = p_id
+                    if c_id == product_id:
+                        path = [c_id]
+                        while parents[path[-1]] is not None:
+                            path.append(parents[path[-1]])
+                        return [product_id] + path[::-1]
+                    next_frontier.append(c_id)
+            frontier = next_frontier
+        return None
+
+    @staticmethod
+    def products_using_material(db: Session, material_id: str, user_id: int) -> List[str]:
+        """
+        Reverse index bahan -> produk: semua produk yang HPP-nya bergantung pada bahan ini
+
+        Mencakup produk yang memakai bahan langsung dan, naik level per level,
+        produk yang memakai produk tersebut sebagai sub-assembly.
+
+        Returns:
+            ID produk yang terdampak (urutan per level)
+        """
+        return HPPService.dependent_products(db, user_id, material_ids=[material_id])
+
+    @staticmethod
+    def dependent_products(
+        db: Session,
+        user_id: int,
+        product_ids: Iterable[str] = (),
+        material_ids: Iterable[str] = ()
+    ) -> List[str]:
+        """
+        Semua produk yang HPP-nya bergantung pada produk atau bahan yang diberikan
+
+        Produk yang diberikan ikut di hasil; produk pemakai bahan dicari lewat
+        reverse index, lalu naik level per level lewat sub-assembly.
+
+        Returns:
+            ID produk yang terdampak (urutan per level)
+        """
+        affected = list(dict.fromkeys(product_ids))
+        seen = set(affected)
+        for chunk in chunked(sorted(set(material_ids))):
+            for (p_id,) in db.query(BOM.product_id).filter(
+                BOM.user_id == user_id, BOM.material_id.in_(chunk)
+            ).distinct():
+                if p_id not in seen:
+                    seen.add(p_id)
+                    affected.append(p_id)
+        frontier = affected
+        while frontier:
+            next_frontier = []
+            for chunk in chunked(frontier):
+                for (p_id,) in db.query(BOM.product_id).filter(
+                    BOM.user_id == user_id, BOM.component_product_id.in_(chunk)
+                ).distinct():
+                    if p_id not in seen:
+                        seen.add(p_id)
+                        next_frontier.append(p_id)
+            affected.extend(next_frontier)
+            frontier = next_frontier
+        return affected
@@ -0,0 +1,164 @@
+"""
+Import Progress
+Progress events from the import loops, streamed to the client as Server-Sent Events
+"""
+import asyncio
+import json
+import logging
+from typing import Callable, Optional, Tuple
+
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Events buffered between the importer and a slow client; row progress is
+# dropped (the next event carries the running totals) rather than blocking the import
+PROGRESS_QUEUE_SIZE = 100
+# Emit a progress event every N rows
+PROGRESS_EVERY_ROWS = 200
+# Individual skip reasons per import; the rest only count in the totals
+MAX_SKIP_EVENTS = 50
+# Seconds between keep-alive comments while the importer is busy
+KEEPALIVE_SECONDS = 10
+
+FINAL_EVENTS = ("complete", "error")
+
+
+class ImportProgress:
+    """
+    Reporter yang dipanggil dari loop import
+
+    Tanpa queue (NULL_PROGRESS) semua event dibuang, sehingga loop import
+    yang sama dipakai untuk request biasa dan request streaming. Event dari
+    thread import diserahkan ke event loop pemilik queue.
+    """
+
+    def __init__(
+        self,
+        events: Optional[asyncio.Queue] = None,
+        loop: Optional[asyncio.AbstractEventLoop] = None
+    ):
+        self._events = events
+        self._loop = loop
+        self.rows_processed = 0
+        self.rows_written = 0
+        self.rows_skipped = 0
+        self.total_rows: Optional[int] = None
+        self._skip_events = 0
+
+    def emit(self, event: str, **data):
+        """Kirim event tanpa menunggu; dibuang jika queue penuh (kecuali event akhir)"""
+        if self._events is None:
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._put, (event, data))
+        except RuntimeError:
+            pass  # loop closed: the client is gone
+
+    def _put(self, item: Tuple[str, dict]):
+        # Runs on the event loop
+        try:
+            self._events.put_nowait(item)
+        except asyncio.QueueFull:
+            if item[0] in FINAL_EVENTS:
+                # The final event replaces the oldest buffered one; only it ends the stream
+                self._events.get_nowait()
+                self._events.put_nowait(item)
+
+    def parsed(self, rows: int, filename: Optional[str] = None):
+        """File selesai dibaca: jumlah baris yang akan diproses"""
+        self.total_rows = (self.total_rows or 0) + rows
+        self.emit("parsed", filename=filename, rows=rows)
+
+    def row(self, written: bool = True, reason: Optional[str] = None, row: Optional[int] = None):
+        """Satu baris selesai diproses; reason diisi untuk baris yang dilewati"""
+        self.rows_processed += 1
+        if written:
+            self.rows_written += 1
+        else:
+            self.rows_skipped += 1
+            if reason and self._skip_events < MAX_SKIP_EVENTS:
+                self._skip_events += 1
+                self.emit("skip", row=row, reason=reason)
+        if self.rows_processed % PROGRESS_EVERY_ROWS == 0:
+            self.report()
+
+    def skipped(self, count: int, reason: str):
+        """Sejumlah baris dilewati sekaligus (mis. baris gagal parse), satu event skip"""
+        self.rows_processed += count
+        self.rows_skipped += count
+        if self._skip_events < MAX_SKIP_EVENTS:
+            self._skip_events += 1
+            self.emit("skip", row=None, reason=reason, count=count)
+
+    def report(self, **extra):
+        """Kirim total berjalan (parsed/written/skipped)"""
+        self.emit(
+            "progress",
+            rows_total=self.total_rows,
+            rows_processed=self.rows_processed,
+            rows_written=self.rows_written,
+            rows_skipped=self.rows_skipped,
+            **extra
+        )
+
+
+NULL_PROGRESS = ImportProgress()
+
+
+def _format_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def stream_import(session_factory: Callable[[], Session], job: Callable[[Session, ImportProgress], BaseModel]) -> StreamingResponse:
+    """
+    Jalankan job import di threadpool dan stream event-nya sebagai SSE
+
+    Event: parsed, progress, skip, lalu complete (berisi response JSON yang sama
+    dengan mode biasa) atau error (status_code + detail). Job memakai session
+    sendiri dan tetap selesai (commit) walaupun client menutup koneksi.
+
+    Args:
+        session_factory: Pembuat session untuk job (primary)
+        job: Fungsi (db, progress) -> response model; HTTPException menjadi event error
+    """
+
+    def run(progress: ImportProgress):
+        db = session_factory()
+        try:
+            result = job(db, progress)
+            progress.report()
+            progress.emit("complete", **result.model_dump(mode="json"))
+        except HTTPException as e:
+            db.rollback()
+            progress.emit("error", status_code=e.status_code, detail=e.detail)
+        except Exception as e:
+            db.rollback()
+            logger.exception("Import gagal")
+            progress.emit("error", status_code=500, detail=f"Import gagal: {e}")
+        finally:
+            db.close()
+
+    async def stream():
+        events: asyncio.Queue = asyncio.Queue(maxsize=PROGRESS_QUEUE_SIZE)
+        worker = asyncio.ensure_future(run_in_threadpool(run, ImportProgress(events, asyncio.get_running_loop())))
+        while True:
+            try:
+                event, data = await asyncio.wait_for(events.get(), timeout=KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            yield _format_event(event, data)
+            if event in FINAL_EVENTS:
+                break
+        await worker
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
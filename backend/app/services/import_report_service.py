@@ -0,0 +1,124 @@
+"""
+Import Report Service
+Tracks every imported report (SalesReport) and the rows it produced
+"""
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from ..models import Ad, ProductPerformance, SalesReport, StorePerformance
+
+# Tables whose rows carry report_id
+LINKED_MODELS = (StorePerformance, ProductPerformance, Ad)
+
+
+class ImportReportService:
+    """Service untuk riwayat import laporan dan baris data yang dihasilkannya"""
+
+    @staticmethod
+    def get(db: Session, user_id: int, report_type: str, file_hash: str) -> Optional[SalesReport]:
+        return db.query(SalesReport).filter(
+            SalesReport.user_id == user_id,
+            SalesReport.report_type == report_type,
+            SalesReport.file_hash == file_hash
+        ).first()
+
+    @staticmethod
+    def open(
+        db: Session,
+        user_id: int,
+        store_id: str,
+        report_type: str,
+        filename: str,
+        file_hash: str
+    ) -> tuple:
+        """
+        Ambil laporan dengan file_hash yang sama atau buat baru (flush, tanpa commit)
+
+        Periode dan total diisi oleh refresh_totals setelah baris ditulis.
+
+        Returns:
+            (SalesReport, True jika baru dibuat)
+        """
+        report = ImportReportService.get(db, user_id, report_type, file_hash)
+        if report:
+            return report, False
+        today = date.today()
+        report = SalesReport(
+            user_id=user_id,
+            store_id=store_id,
+            report_type=report_type,
+            filename=filename,
+            file_hash=file_hash,
+            period_start=today,
+            period_end=today,
+            upload_date=today
+        )
+        db.add(report)
+        db.flush()
+        return report, True
+
+    @staticmethod
+    def clear_rows(db: Session, report_id: int) -> int:
+        """
+        Hapus semua baris hasil import laporan ini (satu DELETE per tabel, tanpa commit)
+
+        Returns:
+            Jumlah baris yang dihapus
+        """
+        deleted = 0
+        for model in LINKED_MODELS:
+            result = db.execute(
+                delete(model).where(model.report_id == report_id).execution_options(synchronize_session=False)
+            )
+            deleted += result.rowcount or 0
+        return deleted
+
+    @staticmethod
+    def refresh_totals(db: Session, report: SalesReport) -> int:
+        """
+        Hitung ulang periode dan total laporan dari baris yang tertaut (tanpa commit)
+
+        Periode tidak diubah jika laporan tidak punya baris.
+
+        Returns:
+            Jumlah baris yang tertaut
+        """
+        db.flush()  # sessions are created with autoflush=False
+        if report.report_type == "shopee_ads":
+            stmt = select(
+                func.count(Ad.id), func.min(Ad.start_date), func.max(func.coalesce(Ad.end_date, Ad.start_date)),
+                func.sum(Ad.gmv), func.sum(Ad.gmv)
+            ).where(Ad.report_id == report.id)
+        elif report.report_type == "shopee_products":
+            stmt = select(
+                func.count(ProductPerformance.id), func.min(ProductPerformance.date), func.max(ProductPerformance.date),
+                func.sum(ProductPerformance.revenue), func.sum(ProductPerformance.revenue)
+            ).where(ProductPerformance.report_id == report.id)
+        else:
+            stmt = select(
+                func.count(StorePerformance.id), func.min(StorePerformance.date), func.max(StorePerformance.date),
+                func.sum(StorePerformance.gross_revenue), func.sum(StorePerformance.revenue)
+            ).where(StorePerformance.report_id == report.id)
+
+        row_count, period_start, period_end, total_gross, total_net = db.execute(stmt).one()
+        if period_start:
+            report.period_start = period_start
+            report.period_end = period_end
+        report.total_gross = float(total_gross or 0)
+        report.total_net = float(total_net or 0)
+        return row_count
+
+    @staticmethod
+    def delete(db: Session, report: SalesReport) -> int:
+        """
+        Hapus laporan beserta semua baris hasil import-nya (tanpa commit)
+
+        Returns:
+            Jumlah baris data yang dihapus
+        """
+        deleted = ImportReportService.clear_rows(db, report.id)
+        db.delete(report)
+        return deleted
@@ -0,0 +1,209 @@
+"""
+Listing Economics Service
+Keeps the listing_economics read model in step with its pricing inputs
+"""
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from ..database import SessionLocal
+from ..models import (
+    StoreProduct, Discount, StoreProductMarketplaceCost, MarketplaceCostType,
+    BOM, Material, ProductExtraCost, ListingEconomics
+)
+from ..schemas.pricing import PricingCalcResponse
+from .hpp_service import HPPService
+from .batching import chunked
+from .pricing_service import PricingService
+from .decision_service import DecisionService
+
+# session.info key: user_id -> {kind: set of ids} waiting for a refresh at commit
+STALE_KEY = "listing_economics_stale"
+STALE_KINDS = ("store_product_ids", "product_ids", "material_ids", "cost_type_ids")
+
+# Input model -> (kind, attribute holding the affected id)
+_TRACKED = {
+    StoreProduct: ("store_product_ids", "id"),
+    Discount: ("store_product_ids", "store_product_id"),
+    StoreProductMarketplaceCost: ("store_product_ids", "store_product_id"),
+    MarketplaceCostType: ("cost_type_ids", "id"),
+    BOM: ("product_ids", "product_id"),
+    ProductExtraCost: ("product_ids", "product_id"),
+    Material: ("material_ids", "id"),
+}
+
+
+class ListingEconomicsService:
+    """Service untuk read model listing_economics (profitabilitas per listing)"""
+
+    @staticmethod
+    def mark_stale(
+        db: Session,
+        user_id: int,
+        store_product_ids: Iterable[int] = (),
+        product_ids: Iterable[str] = (),
+        material_ids: Iterable[str] = (),
+        cost_type_ids: Iterable[str] = ()
+    ):
+        """
+        Tandai input yang berubah; listing terdampak dihitung ulang saat commit
+
+        Perubahan lewat ORM ditandai otomatis. Panggil ini setelah bulk
+        insert/update (db.execute) yang melewati unit of work.
+        """
+        stale = db.info.setdefault(STALE_KEY, {}).setdefault(
+            user_id, {kind: set() for kind in STALE_KINDS}
+        )
+        stale["store_product_ids"].update(store_product_ids)
+        stale["product_ids"].update(product_ids)
+        stale["material_ids"].update(material_ids)
+        stale["cost_type_ids"].update(cost_type_ids)
+
+    @staticmethod
+    def refresh(db: Session, user_id: int, store_product_ids: Iterable[int]) -> int:
+        """
+        Hitung ulang baris listing_economics untuk store product tertentu (tanpa commit)
+
+        Listing yang sudah tidak ada dihapus dari read model.
+
+        Returns:
+            Jumlah baris yang ditulis
+        """
+        ids = sorted(set(store_product_ids))
+        written = 0
+        hpp_cache: Dict[str, float] = {}
+        for chunk in chunked(ids):
+            listings = PricingService.load_listings(db, user_id, StoreProduct.id.in_(chunk))
+            priced = PricingService.price_listings(db, listings, user_id, hpp_cache)
+            existing = {
+                row.store_product_id: row for row in db.query(ListingEconomics).filter(
+                    ListingEconomics.user_id == user_id,
+                    ListingEconomics.store_product_id.in_(chunk)
+                )
+            }
+            now = datetime.now()
+            for sp_id in chunk:
+                row = existing.get(sp_id)
+                pricing = priced.get(sp_id)
+                if pricing is None:
+                    if row is not None:
+                        db.delete(row)
+                    continue
+                if row is None:
+                    row = ListingEconomics(store_product_id=sp_id, user_id=user_id)
+                    db.add(row)
+                for key, value in ListingEconomicsService._values(pricing).items():
+                    setattr(row, key, value)
+                row.updated_at = now
+                written += 1
+        return written
+
+    @staticmethod
+    def discard(db: Session, user_id: int, store_id: Optional[str] = None, product_id: Optional[str] = None) -> int:
+        """
+        Hapus baris read model milik toko atau produk yang dihapus (satu DELETE, tanpa commit)
+
+        Listing-nya ikut terhapus oleh ON DELETE CASCADE di database tanpa
+        dimuat ke session, sehingga tidak terdeteksi oleh after_flush.
+        """
+        query = db.query(ListingEconomics).filter(ListingEconomics.user_id == user_id)
+        if store_id is not None:
+            query = query.filter(ListingEconomics.store_id == store_id)
+        if product_id is not None:
+            query = query.filter(ListingEconomics.product_id == product_id)
+        return query.delete(synchronize_session=False)
+
+    @staticmethod
+    def rebuild(db: Session, user_id: int) -> int:
+        """Hitung ulang read model untuk semua listing user (tanpa commit)"""
+        db.flush()
+        ids = {sp_id for (sp_id,) in db.query(StoreProduct.id).filter(StoreProduct.user_id == user_id)}
+        ids.update(sp_id for (sp_id,) in db.query(ListingEconomics.store_product_id).filter(
+            ListingEconomics.user_id == user_id
+        ))
+        return ListingEconomicsService.refresh(db, user_id, ids)
+
+    @staticmethod
+    def affected_listings(db: Session, user_id: int, stale: Dict[str, Set]) -> Set[int]:
+        """
+        Store product yang ekonominya bergantung pada input yang ditandai
+
+        Bahan dan produk dinaikkan lewat reverse index BOM (termasuk sub-assembly)
+        ke produk terdampak, lalu ke listing-nya; cost type ke listing yang memakainya.
+        """
+        sp_ids = set(stale["store_product_ids"])
+        product_ids = []
+        if stale["product_ids"] or stale["material_ids"]:
+            product_ids = HPPService.dependent_products(
+                db, user_id, product_ids=sorted(stale["product_ids"]), material_ids=stale["material_ids"]
+            )
+        for chunk in chunked(product_ids):
+            sp_ids.update(sp_id for (sp_id,) in db.query(StoreProduct.id).filter(
+                StoreProduct.user_id == user_id, StoreProduct.product_id.in_(chunk)
+            ))
+        for chunk in chunked(sorted(stale["cost_type_ids"])):
+            sp_ids.update(sp_id for (sp_id,) in db.query(StoreProductMarketplaceCost.store_product_id).filter(
+                StoreProductMarketplaceCost.user_id == user_id,
+                StoreProductMarketplaceCost.cost_type_id.in_(chunk)
+            ).distinct())
+        return sp_ids
+
+    @staticmethod
+    def _values(pricing: PricingCalcResponse) -> dict:
+        """Kolom read model dari hasil forward pricing"""
+        break_even_roas, max_cpa = DecisionService._ads_metrics(pricing, None, None, None)[:2]
+        fee_percent = sum(
+            cost.calculated_cost for cost in pricing.biaya_marketplace_breakdown if cost.calc_type == "percent"
+        )
+        return {
+            "store_id": pricing.store_id,
+            "product_id": pricing.product_id,
+            "harga_jual": pricing.harga_jual,
+            "total_diskon": pricing.total_diskon,
+            "harga_setelah_diskon": pricing.harga_setelah_diskon,
+            "fee_percent": fee_percent,
+            "fee_fixed": pricing.total_biaya_marketplace - fee_percent,
+            "total_biaya_marketplace": pricing.total_biaya_marketplace,
+            "hpp": pricing.hpp,
+            "profit_per_order": round(pricing.profit_per_order, 2),
+            "margin_percent": round(pricing.margin_percent, 2),
+            "break_even_roas": None if break_even_roas == float("inf") else round(break_even_roas, 2),
+            "max_cpa": round(max_cpa, 2),
+        }
+
+
+def _history_values(obj, attr: str) -> List:
+    """Nilai atribut saat ini dan sebelum diubah di flush ini"""
+    history = inspect(obj).attrs[attr].history
+    values = list(history.added) + list(history.deleted) + list(history.unchanged)
+    return [value for value in values if value is not None]
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _track_changes(session, flush_context):
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        tracked = _TRACKED.get(type(obj))
+        if tracked is None or obj.user_id is None:
+            continue
+        kind, attr = tracked
+        ListingEconomicsService.mark_stale(session, obj.user_id, **{kind: _history_values(obj, attr)})
+
+
+@event.listens_for(SessionLocal, "before_commit")
+def _refresh_stale(session):
+    # Pending ORM changes are only marked once flushed
+    session.flush()
+    while session.info.get(STALE_KEY):
+        stale = session.info.pop(STALE_KEY)
+        for user_id, keys in stale.items():
+            ListingEconomicsService.refresh(
+                session, user_id, ListingEconomicsService.affected_listings(session, user_id, keys)
+            )
+        session.flush()
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _discard_stale(session):
+    session.info.pop(STALE_KEY, None)
@@ -0,0 +1,180 @@
+"""
+Material Impact Service
+Simulates a material price change on HPP, profit, margin and grade
+"""
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..models import BOM, Material, Product, StoreProduct
+from ..schemas.material import MaterialPriceImpactResponse, MaterialUsage, ProductHPPImpact, ListingPriceImpact
+from .batching import chunked
+from .hpp_service import HPPService
+from .pricing_service import PricingService
+from .decision_service import DecisionService
+
+
+class MaterialImpactService:
+    """Service untuk analisis dampak perubahan harga bahan"""
+
+    @staticmethod
+    def usage_counts(db: Session, material_ids: Iterable[str], user_id: int) -> Dict[str, int]:
+        """
+        Jumlah produk yang memakai tiap bahan langsung di BOM (satu COUNT grouped
+        per batch lewat ix_bom_material_id); bahan yang belum dipakai tidak ada di hasil
+        """
+        counts = {}
+        for chunk in chunked(sorted(set(material_ids))):
+            counts.update(db.query(BOM.material_id, func.count(func.distinct(BOM.product_id))).filter(
+                BOM.user_id == user_id, BOM.material_id.in_(chunk)
+            ).group_by(BOM.material_id).all())
+        return counts
+
+    @staticmethod
+    def usage(db: Session, material: Material, user_id: int) -> List[MaterialUsage]:
+        """
+        Produk yang memakai bahan langsung di BOM beserta porsi bahan di HPP-nya
+
+        Returns:
+            MaterialUsage per produk, porsi terbesar dulu
+        """
+        qty = {}
+        for product_id, line_qty in db.query(BOM.product_id, BOM.qty).filter(
+            BOM.user_id == user_id, BOM.material_id == material.id
+        ):
+            qty[product_id] = qty.get(product_id, 0) + line_qty
+        hpp = HPPService.calculate_hpp_values(db, list(qty), user_id)
+        names = {}
+        for chunk in chunked(sorted(qty)):
+            names.update(db.query(Product.id, Product.nama).filter(
+                Product.user_id == user_id, Product.id.in_(chunk)
+            ))
+
+        rows = []
+        for product_id, total_qty in qty.items():
+            biaya_bahan = total_qty * material.harga_satuan
+            product_hpp = hpp.get(product_id, 0)
+            rows.append(MaterialUsage(
+                product_id=product_id,
+                product_name=names.get(product_id, product_id),
+                qty=total_qty,
+                biaya_bahan=round(biaya_bahan, 2),
+                hpp=round(product_hpp, 2),
+                contribution_percent=round(biaya_bahan / product_hpp * 100, 2) if product_hpp > 0 else 0
+            ))
+        rows.sort(key=lambda row: (-row.contribution_percent, row.product_name))
+        return rows
+
+    @staticmethod
+    def price_impact(
+        db: Session,
+        material: Material,
+        user_id: int,
+        harga_total: Optional[int] = None,
+        jumlah_unit: Optional[float] = None
+    ) -> MaterialPriceImpactResponse:
+        """
+        Hitung dampak harga bahan baru ke semua produk dan listing tanpa menyimpan apa pun
+
+        Produk terdampak dicari lewat reverse index bahan -> produk (termasuk
+        sub-assembly), lalu listing-nya. HPP lama dan baru dihitung dengan
+        evaluasi DAG batch; harga baru hanya diterapkan sebagai override di
+        perhitungan, bukan ke database. Biaya marketplace tidak bergantung pada
+        HPP, sehingga profit baru = profit lama - selisih HPP.
+
+        Args:
+            db: Database session
+            material: Bahan yang disimulasikan
+            user_id: ID user saat ini
+            harga_total / jumlah_unit: Nilai baru (default nilai saat ini)
+
+        Returns:
+            MaterialPriceImpactResponse per produk dan per listing
+        """
+        new_total = material.harga_total if harga_total is None else harga_total
+        new_unit = material.jumlah_unit if jumlah_unit is None else jumlah_unit
+        harga_satuan_after = new_total / new_unit
+
+        product_ids = HPPService.products_using_material(db, material.id, user_id)
+        hpp_before = HPPService.calculate_hpp_values(db, product_ids, user_id)
+        hpp_after = HPPService.calculate_hpp_values(
+            db, product_ids, user_id, material_prices={material.id: harga_satuan_after}
+        )
+
+        names = {}
+        store_product_ids = []
+        for chunk in chunked(product_ids):
+            names.update(db.query(Product.id, Product.nama).filter(
+                Product.user_id == user_id, Product.id.in_(chunk)
+            ))
+            store_product_ids += [
+                sp_id for (sp_id,) in db.query(StoreProduct.id).filter(
+                    StoreProduct.user_id == user_id, StoreProduct.product_id.in_(chunk)
+                ).order_by(StoreProduct.id)
+            ]
+
+        before = PricingService.calculate_forward_pricing_batch(db, store_product_ids, user_id, dict(hpp_before))
+        after = {}
+        for sp_id, pricing in before.items():
+            hpp = hpp_after[pricing.product_id]
+            profit = pricing.profit_per_order - (hpp - pricing.hpp)
+            after[sp_id] = pricing.model_copy(update={
+                "hpp": hpp,
+                "profit_per_order": profit,
+                "margin_percent": (profit / pricing.harga_jual * 100) if pricing.harga_jual > 0 else 0
+            })
+        grades_before = DecisionService.grade_pricing_batch(db, before.values(), user_id)
+        grades_after = DecisionService.grade_pricing_batch(db, after.values(), user_id)
+
+        products = [
+            ProductHPPImpact(
+                product_id=p_id,
+                product_name=names.get(p_id, p_id),
+                hpp_before=hpp_before[p_id],
+                hpp_after=hpp_after[p_id],
+                hpp_delta=hpp_after[p_id] - hpp_before[p_id]
+            )
+            for p_id in product_ids
+        ]
+
+        listings = []
+        for sp_id, old in before.items():
+            new = after[sp_id]
+            grade_before = grades_before[sp_id][0]
+            grade_after = grades_after[sp_id][0]
+            listings.append(ListingPriceImpact(
+                store_product_id=sp_id,
+                store_id=old.store_id,
+                store_name=old.store_name,
+                product_id=old.product_id,
+                product_name=old.product_name,
+                harga_jual=old.harga_jual,
+                hpp_before=old.hpp,
+                hpp_after=new.hpp,
+                hpp_delta=new.hpp - old.hpp,
+                profit_before=old.profit_per_order,
+                profit_after=new.profit_per_order,
+                profit_delta=new.profit_per_order - old.profit_per_order,
+                margin_before=old.margin_percent,
+                margin_after=new.margin_percent,
+                margin_delta=new.margin_percent - old.margin_percent,
+                grade_before=grade_before,
+                grade_after=grade_after,
+                grade_changed=grade_before != grade_after
+            ))
+
+        grade_changes = sum(1 for listing in listings if listing.grade_changed)
+        return MaterialPriceImpactResponse(
+            material_id=material.id,
+            material_nama=material.nama,
+            harga_satuan_before=material.harga_satuan,
+            harga_satuan_after=harga_satuan_after,
+            products=products,
+            listings=listings,
+            grade_changes=grade_changes,
+            summary=(
+                f"Harga '{material.nama}' memengaruhi {len(products)} produk dan {len(listings)} listing"
+                f"; {grade_changes} listing berubah grade."
+            )
+        )
@@ -0,0 +1,212 @@
+"""
+Price History Service
+Records effective-dated material prices and extra costs and resolves the values in force on a date
+"""
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session, aliased
+
+from ..models import Material, MaterialPriceHistory, ProductExtraCost, ProductExtraCostHistory
+from .batching import chunked
+
+
+class PriceHistoryService:
+    """Service untuk riwayat harga bahan dan biaya ekstra (effective-dated)"""
+
+    @staticmethod
+    def record_material(db: Session, material: Material, effective_from: Optional[date] = None):
+        """
+        Catat harga bahan saat ini, berlaku mulai effective_from (default hari ini; tanpa commit)
+
+        Baris riwayat bertanggal setelah effective_from digantikan (dihapus), sehingga
+        harga yang berlaku hari ini selalu sama dengan harga bahan saat ini.
+        """
+        effective_from = effective_from or date.today()
+        db.query(MaterialPriceHistory).filter(
+            MaterialPriceHistory.user_id == material.user_id,
+            MaterialPriceHistory.material_id == material.id,
+            MaterialPriceHistory.effective_from > effective_from
+        ).delete(synchronize_session=False)
+        db.add(MaterialPriceHistory(
+            user_id=material.user_id,
+            material_id=material.id,
+            harga_total=material.harga_total,
+            jumlah_unit=material.jumlah_unit,
+            harga_satuan=material.harga_satuan,
+            effective_from=effective_from,
+            recorded_at=datetime.now()
+        ))
+
+    @staticmethod
+    def record_materials(db: Session, rows: List[dict], effective_from: Optional[date] = None):
+        """
+        Catat banyak harga bahan dengan satu bulk INSERT (tanpa commit)
+
+        Args:
+            rows: Dict dengan id, user_id, harga_total, jumlah_unit, harga_satuan
+        """
+        if not rows:
+            return
+        effective_from = effective_from or date.today()
+        recorded_at = datetime.now()
+        db.execute(insert(MaterialPriceHistory), [
+            {
+                "user_id": row["user_id"],
+                "material_id": row["id"],
+                "harga_total": row["harga_total"],
+                "jumlah_unit": row["jumlah_unit"],
+                "harga_satuan": row["harga_satuan"],
+                "effective_from": effective_from,
+                "recorded_at": recorded_at,
+            }
+            for row in rows
+        ])
+
+    @staticmethod
+    def record_extra_cost(
+        db: Session,
+        extra_cost: ProductExtraCost,
+        effective_from: Optional[date] = None,
+        deleted: bool = False
+    ):
+        """
+        Catat nilai biaya ekstra saat ini (tanpa commit); biaya yang dihapus dicatat bernilai 0
+
+        extra_cost harus sudah punya id (flush dulu untuk baris baru). Seperti harga
+        bahan, baris riwayat bertanggal setelah effective_from digantikan (dihapus).
+        """
+        effective_from = effective_from or date.today()
+        db.query(ProductExtraCostHistory).filter(
+            ProductExtraCostHistory.user_id == extra_cost.user_id,
+            ProductExtraCostHistory.extra_cost_id == extra_cost.id,
+            ProductExtraCostHistory.effective_from > effective_from
+        ).delete(synchronize_session=False)
+        db.add(ProductExtraCostHistory(
+            user_id=extra_cost.user_id,
+            product_id=extra_cost.product_id,
+            extra_cost_id=extra_cost.id,
+            label=extra_cost.label,
+            value=0 if deleted else extra_cost.value,
+            effective_from=effective_from,
+            recorded_at=datetime.now()
+        ))
+
+    @staticmethod
+    def material_prices_as_of(
+        db: Session,
+        material_ids: Iterable[str],
+        user_id: int,
+        as_of: date
+    ) -> Dict[str, float]:
+        """
+        Harga satuan bahan yang berlaku pada tanggal as_of
+
+        Tiap bahan diambil dari baris riwayat dengan effective_from terakhir <= as_of
+        (range lookup di index (user_id, material_id, effective_from)). Jika tanggal
+        lebih awal dari riwayat pertama, harga tercatat pertama yang dipakai.
+        Bahan tanpa riwayat tidak ada di hasil (pakai harga saat ini).
+
+        Returns:
+            Dict material_id -> harga_satuan
+        """
+        prices = {}
+        for chunk in chunked(sorted(set(material_ids))):
+            prices.update(PriceHistoryService._resolve(
+                db, MaterialPriceHistory, MaterialPriceHistory.material_id, chunk, user_id,
+                (MaterialPriceHistory.material_id, MaterialPriceHistory.harga_satuan), as_of
+            ))
+            missing = [m_id for m_id in chunk if m_id not in prices]
+            if missing:
+                prices.update(PriceHistoryService._resolve(
+                    db, MaterialPriceHistory, MaterialPriceHistory.material_id, missing, user_id,
+                    (MaterialPriceHistory.material_id, MaterialPriceHistory.harga_satuan), None
+                ))
+        return prices
+
+    @staticmethod
+    def extra_costs_as_of(
+        db: Session,
+        product_ids: Iterable[str],
+        user_id: int,
+        as_of: date
+    ) -> Dict[str, List[Tuple[int, str, float]]]:
+        """
+        Biaya ekstra tiap produk yang berlaku pada tanggal as_of
+
+        Biaya yang punya riwayat memakai baris dengan effective_from terakhir <= as_of
+        dan tidak dihitung jika belum berlaku. Jika tanggal lebih awal dari riwayat
+        pertama produk, biaya yang tercatat pada tanggal pertama itu yang dipakai
+        (sama seperti harga bahan). Biaya tanpa riwayat memakai nilai saat ini.
+
+        Returns:
+            Dict product_id -> [(extra_cost_id, label, value)]
+        """
+        costs: Dict[str, List[Tuple[int, str, float]]] = {}
+        for chunk in chunked(sorted(set(product_ids))):
+            historized = {
+                c_id for (c_id,) in db.query(ProductExtraCostHistory.extra_cost_id).filter(
+                    ProductExtraCostHistory.user_id == user_id,
+                    ProductExtraCostHistory.product_id.in_(chunk)
+                ).distinct()
+            }
+            first_dates = dict(db.query(
+                ProductExtraCostHistory.product_id, func.min(ProductExtraCostHistory.effective_from)
+            ).filter(
+                ProductExtraCostHistory.user_id == user_id,
+                ProductExtraCostHistory.product_id.in_(chunk)
+            ).group_by(ProductExtraCostHistory.product_id).all())
+            # Dates before a product's history resolve as of its first recorded date
+            by_date: Dict[date, List[str]] = {}
+            for p_id in chunk:
+                first = first_dates.get(p_id)
+                by_date.setdefault(first if first and as_of < first else as_of, []).append(p_id)
+            for resolve_date, p_ids in by_date.items():
+                for c_id, p_id, label, value in PriceHistoryService._resolve(
+                    db, ProductExtraCostHistory, ProductExtraCostHistory.product_id, p_ids, user_id,
+                    (
+                        ProductExtraCostHistory.extra_cost_id, ProductExtraCostHistory.product_id,
+                        ProductExtraCostHistory.label, ProductExtraCostHistory.value
+                    ),
+                    resolve_date, partition=(ProductExtraCostHistory.product_id, ProductExtraCostHistory.extra_cost_id)
+                ):
+                    costs.setdefault(p_id, []).append((c_id, label, value))
+            for ec in db.query(ProductExtraCost).filter(
+                ProductExtraCost.user_id == user_id,
+                ProductExtraCost.product_id.in_(chunk)
+            ):
+                if ec.id not in historized:
+                    costs.setdefault(ec.product_id, []).append((ec.id, ec.label, ec.value))
+        return costs
+
+    @staticmethod
+    def _resolve(
+        db: Session,
+        model,
+        key_column,
+        keys: list,
+        user_id: int,
+        columns: tuple,
+        as_of: Optional[date],
+        partition: tuple = ()
+    ) -> list:
+        """
+        Satu baris riwayat per partition (default key_column): effective_from terakhir
+        <= as_of, atau baris paling awal jika as_of None
+        """
+        inner = aliased(model)
+        conditions = [inner.user_id == user_id] + [
+            getattr(inner, column.key) == column for column in (partition or (key_column,))
+        ]
+        if as_of is None:
+            order = (inner.effective_from.asc(), inner.id.asc())
+        else:
+            conditions.append(inner.effective_from <= as_of)
+            order = (inner.effective_from.desc(), inner.id.desc())
+        in_force = select(inner.id).where(*conditions).order_by(*order).limit(1).correlate(model).scalar_subquery()
+        return db.query(*columns).filter(
+            model.user_id == user_id,
+            key_column.in_(keys),
+            model.id == in_force
+        ).all()
@@ -2,13 +2,16 @@
 Pricing Service
 Handles forward and reverse pricing calculations
 """
+from collections import defaultdict
+from datetime import date
 from sqlalchemy.orm import Session
-from typing import Optional, List
+from typing import Dict, Iterable, Optional, List, Tuple
 from ..models import StoreProduct, Store, Product, Discount, StoreProductMarketplaceCost, MarketplaceCostType
 from ..schemas.pricing import (
     PricingCalcResponse, CostBreakdown,
     ReversePricingRequest, ReversePricingResponse
 )
+from .batching import chunked
 from .hpp_service import HPPService
 
 
@@ -16,7 +19,12 @@ class PricingService:
     """Service untuk kalkulasi pricing"""
     
     @staticmethod
-    def calculate_forward_pricing(db: Session, store_product_id: int, user_id: int) -> Optional[PricingCalcResponse]:
+    def calculate_forward_pricing(
+        db: Session,
+        store_product_id: int,
+        user_id: int,
+        as_of: Optional[date] = None
+    ) -> Optional[PricingCalcResponse]:
         """
         Menghitung forward pricing untuk store_product
         
@@ -31,37 +39,140 @@ class PricingService:
             db: Database session
             store_product_id: ID store_product
             user_id: ID user saat ini
+            as_of: HPP dari harga yang berlaku pada tanggal ini (opsional; default saat ini)
             
         Returns:
             PricingCalcResponse atau None jika tidak ditemukan atau unauthorized
         """
-        # Get store_product with relationships
-        store_product = db.query(StoreProduct).filter(
-            StoreProduct.id == store_product_id,
-            StoreProduct.user_id == user_id
-        ).first()
-        if not store_product:
-            return None
-        
-        store = db.query(Store).filter(
-            Store.id == store_product.store_id,
-            Store.user_id == user_id
-        ).first()
-        product = db.query(Product).filter(
-            Product.id == store_product.product_id,
-            Product.user_id == user_id
-        ).first()
-        
-        if not store or not product:
-            return None
-        
+        results = PricingService.calculate_forward_pricing_batch(db, [store_product_id], user_id, as_of=as_of)
+        return results.get(store_product_id)
+
+    @staticmethod
+    def calculate_forward_pricing_batch(
+        db: Session,
+        store_product_ids: Iterable[int],
+        user_id: int,
+        hpp_cache: Optional[Dict[str, float]] = None,
+        as_of: Optional[date] = None
+    ) -> Dict[int, PricingCalcResponse]:
+        """
+        Forward pricing untuk banyak store_product sekaligus
+
+        Perhitungan sama dengan calculate_forward_pricing, tetapi store product,
+        diskon dan biaya marketplace dimuat dengan satu query per tabel (per
+        IN_LIST_SIZE id) dan HPP semua produknya dihitung dengan satu
+        evaluasi DAG (HPPService.calculate_hpp_values).
+
+        Args:
+            db: Database session
+            store_product_ids: ID store_product
+            user_id: ID user saat ini
+            hpp_cache: Dict product_id -> HPP yang dipakai ulang antar panggilan (opsional)
+            as_of: HPP dari harga yang berlaku pada tanggal ini (opsional); hpp_cache
+                hanya boleh dipakai ulang untuk as_of yang sama
+
+        Returns:
+            Dict store_product_id -> PricingCalcResponse; id yang tidak ditemukan tidak ada di dict
+        """
+        ids = list(dict.fromkeys(store_product_ids))
+        listings = []
+        for chunk in chunked(ids):
+            listings += PricingService.load_listings(db, user_id, StoreProduct.id.in_(chunk))
+        return PricingService.price_listings(db, listings, user_id, hpp_cache, as_of)
+
+    @staticmethod
+    def load_listings(db: Session, user_id: int, *criteria) -> List[Tuple[StoreProduct, Store, Product]]:
+        """
+        Muat listing beserta toko dan produknya dengan satu query join
+
+        Objek yang dimuat masuk identity map session, sehingga lookup Store/Product
+        berikutnya di request yang sama (db.get) tidak perlu query lagi.
+
+        Args:
+            criteria: Filter tambahan untuk query (mis. StoreProduct.id.in_(...))
+        """
+        return db.query(StoreProduct, Store, Product).join(
+            Store, (Store.id == StoreProduct.store_id) & (Store.user_id == StoreProduct.user_id)
+        ).join(
+            Product, (Product.id == StoreProduct.product_id) & (Product.user_id == StoreProduct.user_id)
+        ).filter(StoreProduct.user_id == user_id, *criteria).all()
+
+    @staticmethod
+    def price_listings(
+        db: Session,
+        listings: List[Tuple[StoreProduct, Store, Product]],
+        user_id: int,
+        hpp_cache: Optional[Dict[str, float]] = None,
+        as_of: Optional[date] = None
+    ) -> Dict[int, PricingCalcResponse]:
+        """
+        Forward pricing untuk listing yang sudah dimuat (lihat load_listings)
+
+        Args:
+            db: Database session
+            listings: Tuple (StoreProduct, Store, Product)
+            user_id: ID user saat ini
+            hpp_cache: Dict product_id -> HPP yang dipakai ulang antar panggilan (opsional)
+            as_of: HPP dari harga yang berlaku pada tanggal ini (opsional)
+
+        Returns:
+            Dict store_product_id -> PricingCalcResponse
+        """
+        if hpp_cache is None:
+            hpp_cache = {}
+
+        results = {}
+        for batch in chunked(listings):
+            chunk = [store_product.id for store_product, _, _ in batch]
+
+            discounts = defaultdict(list)
+            for disc in db.query(Discount).filter(
+                Discount.user_id == user_id, Discount.store_product_id.in_(chunk)
+            ).order_by(Discount.id):
+                discounts[disc.store_product_id].append(disc)
+
+            # Cost types come with the fees; only the types in use are needed
+            sp_costs = defaultdict(list)
+            cost_types = {}
+            for sc, cost_type in db.query(StoreProductMarketplaceCost, MarketplaceCostType).outerjoin(
+                MarketplaceCostType,
+                (MarketplaceCostType.id == StoreProductMarketplaceCost.cost_type_id)
+                & (MarketplaceCostType.user_id == StoreProductMarketplaceCost.user_id)
+            ).filter(
+                StoreProductMarketplaceCost.user_id == user_id,
+                StoreProductMarketplaceCost.store_product_id.in_(chunk)
+            ).order_by(StoreProductMarketplaceCost.id):
+                sp_costs[sc.store_product_id].append(sc)
+                if cost_type is not None:
+                    cost_types[cost_type.id] = cost_type
+
+            # One DAG evaluation for all products of this chunk not costed yet
+            HPPService.calculate_hpp_values(
+                db, [product.id for _, _, product in batch], user_id, hpp_cache, as_of=as_of
+            )
+
+            for store_product, store, product in batch:
+                results[store_product.id] = PricingService._forward_pricing(
+                    store_product, store, product,
+                    discounts[store_product.id], sp_costs[store_product.id],
+                    cost_types, hpp_cache[product.id]
+                )
+        return results
+
+    @staticmethod
+    def _forward_pricing(
+        store_product: StoreProduct,
+        store: Store,
+        product: Product,
+        discounts: List[Discount],
+        sp_costs: List[StoreProductMarketplaceCost],
+        cost_types: Dict[str, MarketplaceCostType],
+        hpp: float
+    ) -> PricingCalcResponse:
+        """Forward pricing satu store_product dari data yang sudah dimuat"""
         harga_jual = store_product.harga_jual
         
         # Calculate discounts
-        discounts = db.query(Discount).filter(
-            Discount.store_product_id == store_product_id,
-            Discount.user_id == user_id
-        ).all()
         total_diskon = 0.0
         for disc in discounts:
             if disc.discount_type == "percent":
@@ -72,28 +183,13 @@ class PricingService:
         harga_setelah_diskon = harga_jual - total_diskon
         
         # Calculate marketplace costs (per product)
-        sp_costs = db.query(StoreProductMarketplaceCost).filter(
-            StoreProductMarketplaceCost.store_product_id == store_product_id,
-            StoreProductMarketplaceCost.user_id == user_id
-        ).all()
-        
         cost_breakdown = []
         total_biaya_marketplace = 0.0
         
         for sc in sp_costs:
-            cost_type = db.query(MarketplaceCostType).filter(
-                MarketplaceCostType.id == sc.cost_type_id,
-                MarketplaceCostType.user_id == user_id
-            ).first()
+            cost_type = cost_types.get(sc.cost_type_id)
             if cost_type:
-                if cost_type.calc_type == "percent":
-                    if cost_type.apply_to == "price":
-                        calculated = harga_jual * sc.value
-                    else:  # after_discount
-                        calculated = harga_setelah_diskon * sc.value
-                else:  # fixed
-                    calculated = sc.value
-                
+                calculated = PricingService.fee_amount(cost_type, sc.value, harga_jual, harga_setelah_diskon)
                 total_biaya_marketplace += calculated
                 
                 cost_breakdown.append(CostBreakdown(
@@ -105,15 +201,12 @@ class PricingService:
                     calculated_cost=calculated
                 ))
         
-        # Get HPP
-        hpp = HPPService.get_hpp_value(db, product.id, user_id)
-        
         # Calculate profit
         profit_per_order = harga_setelah_diskon - total_biaya_marketplace - hpp
         margin_percent = (profit_per_order / harga_jual * 100) if harga_jual > 0 else 0
         
         return PricingCalcResponse(
-            store_product_id=store_product_id,
+            store_product_id=store_product.id,
             store_id=store.id,
             store_name=store.name,
             product_id=product.id,
@@ -127,6 +220,15 @@ class PricingService:
             profit_per_order=profit_per_order,
             margin_percent=margin_percent
         )
+
+    @staticmethod
+    def fee_amount(cost_type: MarketplaceCostType, value: float, harga_jual: float, harga_setelah_diskon: float) -> float:
+        """Nominal satu biaya marketplace per order"""
+        if cost_type.calc_type == "percent":
+            if cost_type.apply_to == "price":
+                return harga_jual * value
+            return harga_setelah_diskon * value  # after_discount
+        return value  # fixed
     
     @staticmethod
     def calculate_reverse_pricing(db: Session, request: ReversePricingRequest, user_id: int) -> Optional[ReversePricingResponse]:
@@ -136,52 +238,43 @@ class PricingService:
         Args:
             db: Database session
             request: ReversePricingRequest dengan store_id, product_id, target_type, target_value
+                (as_of opsional untuk HPP historis)
             user_id: ID user saat ini
             
         Returns:
             ReversePricingResponse dengan recommended_price
         """
-        # Validate store and product exist
-        store = db.query(Store).filter(
-            Store.id == request.store_id,
-            Store.user_id == user_id
-        ).first()
-        product = db.query(Product).filter(
-            Product.id == request.product_id,
-            Product.user_id == user_id
-        ).first()
+        # Validate store and product exist (identity map first)
+        store = db.get(Store, (request.store_id, user_id))
+        product = db.get(Product, (request.product_id, user_id))
         
         if not store or not product:
             return None
         
         # Get HPP
-        hpp = HPPService.get_hpp_value(db, product.id, user_id)
+        hpp = HPPService.get_hpp_value(db, product.id, user_id, as_of=request.as_of)
         
-        # Get marketplace costs for this specific product in this store
-        # First find the store_product record
-        store_product = db.query(StoreProduct).filter(
+        # Get marketplace costs for this specific product in this store,
+        # with their cost types in the same query
+        cost_types = {}
+        for sc, cost_type in db.query(StoreProductMarketplaceCost, MarketplaceCostType).join(
+            StoreProduct,
+            (StoreProduct.id == StoreProductMarketplaceCost.store_product_id)
+            & (StoreProduct.user_id == StoreProductMarketplaceCost.user_id)
+        ).join(
+            MarketplaceCostType,
+            (MarketplaceCostType.id == StoreProductMarketplaceCost.cost_type_id)
+            & (MarketplaceCostType.user_id == StoreProductMarketplaceCost.user_id)
+        ).filter(
             StoreProduct.store_id == request.store_id,
             StoreProduct.product_id == request.product_id,
             StoreProduct.user_id == user_id
-        ).first()
-        
-        cost_types = {}
-        if store_product:
-            sp_costs = db.query(StoreProductMarketplaceCost).filter(
-                StoreProductMarketplaceCost.store_product_id == store_product.id,
-                StoreProductMarketplaceCost.user_id == user_id
-            ).all()
-            for sc in sp_costs:
-                cost_type = db.query(MarketplaceCostType).filter(
-                    MarketplaceCostType.id == sc.cost_type_id,
-                    MarketplaceCostType.user_id == user_id
-                ).first()
-                if cost_type:
-                    cost_types[sc.cost_type_id] = {
-                        "calc_type": cost_type.calc_type,
-                        "apply_to": cost_type.apply_to,
-                        "value": sc.value
-                    }
+        ):
+            cost_types[sc.cost_type_id] = {
+                "calc_type": cost_type.calc_type,
+                "apply_to": cost_type.apply_to,
+                "value": sc.value
+            }
         
         # Algebraic Calculation
         # P = X(1 - Cp) - Cf - HPP
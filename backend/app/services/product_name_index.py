@@ -0,0 +1,181 @@
+"""
+Product Name Index
+Maps product names from marketplace reports to catalog products
+"""
+import math
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Iterable, Optional, Tuple
+
+# Variant suffixes Shopee appends to ad/product names, e.g. "... [2]" or "... (3)"
+_VARIANT_SUFFIX = re.compile(r"\s*[\[\(]\s*\d+\s*[\]\)]\s*$")
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+class ProductNameIndex:
+    """
+    Normalized-name index untuk mencocokkan nama produk dari laporan ke katalog
+
+    Lookup:
+    1. Exact match pada nama yang dinormalisasi (lowercase, tanpa tanda baca,
+       spasi dirapikan, suffix varian seperti "[2]" dibuang)
+    2. Fuzzy fallback berbasis token: token dianggap sama jika identik atau beda
+       1 huruf (typo), dicari lewat index trigram atas kosakata token.
+       score = token cocok / max(token query, token kandidat), minimal `threshold`.
+       Token angka dan token pendek (ukuran seperti "l", "xl") harus sama persis
+       agar varian berbeda tidak tergabung.
+
+    Dibangun sekali per import. Index fuzzy baru dibangun saat lookup pertama yang
+    tidak exact, dan hasilnya di-cache karena nama yang sama berulang di banyak baris.
+    """
+
+    FUZZY_THRESHOLD = 0.9
+    SHORT_TOKEN = 2  # tokens this long or shorter must match exactly
+
+    def __init__(self, threshold: float = FUZZY_THRESHOLD):
+        self.threshold = threshold
+        self._exact = {}                          # normalized name -> product_id
+        self._indexed_keys = 0                    # exact keys already in the fuzzy index
+        self._entries = []                        # (product_id, token set, strict signature)
+        self._token_postings = defaultdict(list)  # token -> entry indexes
+        self._token_grams = defaultdict(set)      # trigram -> tokens in the vocabulary
+        self._variants = {}                       # query token -> vocabulary tokens it matches
+        self._cache = {}                          # normalized query -> product_id or None
+
+    @classmethod
+    def from_products(cls, products: Iterable, threshold: float = FUZZY_THRESHOLD) -> "ProductNameIndex":
+        """Build index from Product rows (anything with .id and .nama)"""
+        index = cls(threshold)
+        for p in products:
+            index.add(p.id, p.nama)
+        return index
+
+    @staticmethod
+    def normalize(name: str) -> str:
+        """Normalize a product name for matching"""
+        if not name:
+            return ""
+        text = unicodedata.normalize("NFKD", str(name)).encode("ascii", "ignore").decode("ascii")
+        text = _VARIANT_SUFFIX.sub("", text.strip().lower())
+        return _NON_ALNUM.sub(" ", text).strip()
+
+    @classmethod
+    def _is_strict(cls, token: str) -> bool:
+        return len(token) <= cls.SHORT_TOKEN or any(c.isdigit() for c in token)
+
+    @classmethod
+    def _signature(cls, tokens) -> Tuple[str, ...]:
+        return tuple(sorted(t for t in tokens if cls._is_strict(t)))
+
+    @staticmethod
+    def _grams(token: str) -> set:
+        padded = f"  {token} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+    @staticmethod
+    def _within_one_edit(a: str, b: str) -> bool:
+        """True if a and b differ by at most one insert, delete or substitution"""
+        if a == b:
+            return True
+        la, lb = len(a), len(b)
+        if abs(la - lb) > 1:
+            return False
+        if la > lb:
+            a, b, la, lb = b, a, lb, la
+        i = 0
+        while i < la and a[i] == b[i]:
+            i += 1
+        if la == lb:
+            return a[i + 1:] == b[i + 1:]
+        return a[i:] == b[i + 1:]
+
+    def add(self, product_id: str, name: str) -> None:
+        """Add a product; the first product registered for a normalized name wins"""
+        key = self.normalize(name)
+        if not key or key in self._exact:
+            return
+        self._exact[key] = product_id
+        # A new product may be a better answer for earlier misses
+        self._cache.clear()
+        self._variants.clear()
+
+    def lookup(self, name: str) -> Optional[str]:
+        """Return matching product_id or None"""
+        key = self.normalize(name)
+        if not key:
+            return None
+        product_id = self._exact.get(key)
+        if product_id is not None:
+            return product_id
+        if key not in self._cache:
+            self._cache[key] = self._fuzzy(key)
+        return self._cache[key]
+
+    def _build_fuzzy(self) -> None:
+        """Index exact keys added since the last fuzzy lookup (dicts keep insertion order)"""
+        if self._indexed_keys == len(self._exact):
+            return
+        pending = list(self._exact.items())[self._indexed_keys:]
+        for key, product_id in pending:
+            tokens = set(key.split())
+            entry_idx = len(self._entries)
+            self._entries.append((product_id, tokens, self._signature(tokens)))
+            for token in tokens:
+                postings = self._token_postings[token]
+                if not postings and not self._is_strict(token):
+                    for gram in self._grams(token):
+                        self._token_grams[gram].add(token)
+                postings.append(entry_idx)
+        self._indexed_keys = len(self._exact)
+
+    def _token_variants(self, token: str) -> set:
+        """Vocabulary tokens that count as the same word as `token`"""
+        variants = self._variants.get(token)
+        if variants is not None:
+            return variants
+        variants = {token} if token in self._token_postings else set()
+        if not self._is_strict(token):
+            # One edit changes at most 3 trigrams, so a typo variant shares all but 3
+            grams = self._grams(token)
+            counts = defaultdict(int)
+            for gram in grams:
+                for cand in self._token_grams.get(gram, ()):
+                    counts[cand] += 1
+            needed = len(grams) - 3
+            for cand, shared in counts.items():
+                if shared >= needed and self._within_one_edit(token, cand):
+                    variants.add(cand)
+        self._variants[token] = variants
+        return variants
+
+    def _fuzzy(self, key: str) -> Optional[str]:
+        self._build_fuzzy()
+        tokens = set(key.split())
+        signature = self._signature(tokens)
+        variants = {t: self._token_variants(t) for t in tokens}
+
+        # Prefix filter: a match needs ceil(threshold * |q|) matching tokens, so it
+        # must contain one of the |q| - ceil(threshold * |q|) + 1 rarest query tokens.
+        def rarity(t):
+            return sum(len(self._token_postings[v]) for v in variants[t])
+
+        min_matched = math.ceil(self.threshold * len(tokens))
+        candidates = set()
+        for token in sorted(tokens, key=rarity)[:len(tokens) - min_matched + 1]:
+            for v in variants[token]:
+                candidates.update(self._token_postings[v])
+
+        best_id, best_score = None, 0.0
+        for idx in candidates:
+            product_id, cand_tokens, cand_signature = self._entries[idx]
+            if cand_signature != signature:
+                continue
+            matched = sum(1 for t in tokens if variants[t] & cand_tokens)
+            score = matched / max(len(tokens), len(cand_tokens))
+            if score >= self.threshold and score > best_score:
+                best_id, best_score = product_id, score
+        return best_id
+
+    def __len__(self) -> int:
+        return len(self._exact)
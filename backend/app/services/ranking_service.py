@@ -0,0 +1,262 @@
+"""
+Ranking Service
+Top-N products, listings and keywords computed with GROUP BY / ORDER BY ... LIMIT
+"""
+from datetime import date
+from typing import List, Optional
+
+from sqlalchemy import Float, and_, cast, func, select
+from sqlalchemy.orm import Session
+
+from ..models import Ad, AdKeywordFact, AdTerm, ListingEconomics, Product
+from ..schemas.ranking import AdsProductRank, KeywordRank, ListingRank
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+
+def _ratio(numerator, denominator):
+    """numerator / denominator as float in SQL; NULL when the denominator is 0"""
+    return cast(numerator, Float) / func.nullif(denominator, 0)
+
+
+def _sorted(expr, order: str, null_is_high: bool):
+    """
+    ORDER BY expr with a fixed place for NULL: ratios are NULL when their
+    denominator is 0 (infinite ACOS/ROAS), so they sort as the highest value;
+    other NULLs (unknown) always go last
+    """
+    if order == "desc":
+        return expr.desc().nulls_first() if null_is_high else expr.desc().nulls_last()
+    return expr.asc().nulls_last()
+
+
+def _value(value) -> Optional[float]:
+    return float(value) if value is not None else None
+
+
+class RankingService:
+    """Service untuk peringkat (top-N) produk iklan, listing dan keyword"""
+
+    # metric -> urutan default (yang terburuk lebih dulu)
+    ADS_PRODUCT_ORDER = {"ads_loss": "asc", "ads_profit": "desc", "spend": "desc", "roas": "asc", "acos": "desc"}
+    LISTING_ORDER = {"margin": "asc", "profit": "asc", "break_even_roas": "desc"}
+    KEYWORD_ORDER = {"acos": "desc", "spend": "desc", "roas": "asc", "orders": "desc"}
+
+    @staticmethod
+    def ads_products(
+        db: Session,
+        user_id: int,
+        metric: str = "ads_loss",
+        order: Optional[str] = None,
+        limit: int = DEFAULT_LIMIT,
+        store_id: Optional[str] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None
+    ) -> List[AdsProductRank]:
+        """
+        Peringkat produk iklan per toko dari total iklan (GROUP BY store, produk)
+
+        Profit iklan memakai HPP dan biaya marketplace dari read model
+        listing_economics: gmv - (hpp + biaya) * orders - spend.
+        Metric ads_loss hanya memuat produk yang profit iklannya negatif.
+
+        Args:
+            db: Database session
+            user_id: ID user saat ini
+            metric: ads_loss, ads_profit, spend, roas atau acos
+            order: asc/desc (default: terburuk lebih dulu)
+            limit: Jumlah baris
+            store_id: Filter toko (opsional)
+            date_from / date_to: Hanya iklan yang periodenya overlap (opsional)
+        """
+        conditions = [Ad.user_id == user_id, Ad.overlapping(date_from, date_to)]
+        if store_id:
+            conditions.append(Ad.store_id == store_id)
+        totals = select(
+            Ad.store_id,
+            Ad.product_id,
+            func.sum(Ad.spend).label("spend"),
+            func.sum(Ad.gmv).label("gmv"),
+            func.sum(Ad.orders).label("orders"),
+        ).where(*conditions).group_by(Ad.store_id, Ad.product_id).subquery()
+
+        ads_profit = (
+            totals.c.gmv
+            - (ListingEconomics.hpp + ListingEconomics.total_biaya_marketplace) * totals.c.orders
+            - totals.c.spend
+        )
+        sort_keys = {
+            "ads_loss": (ads_profit, False),
+            "ads_profit": (ads_profit, False),
+            "spend": (totals.c.spend, False),
+            "roas": (_ratio(totals.c.gmv, totals.c.spend), True),
+            "acos": (_ratio(totals.c.spend, totals.c.gmv), True),
+        }
+        sort_expr, null_is_high = sort_keys[metric]
+
+        stmt = select(
+            totals, Product.nama, ads_profit.label("ads_profit")
+        ).outerjoin(ListingEconomics, and_(
+            ListingEconomics.user_id == user_id,
+            ListingEconomics.store_id == totals.c.store_id,
+            ListingEconomics.product_id == totals.c.product_id
+        )).outerjoin(Product, and_(
+            Product.user_id == user_id,
+            Product.id == totals.c.product_id
+        ))
+        if metric == "ads_loss":
+            stmt = stmt.where(ads_profit < 0)
+        stmt = stmt.order_by(
+            _sorted(sort_expr, order or RankingService.ADS_PRODUCT_ORDER[metric], null_is_high),
+            totals.c.store_id, totals.c.product_id
+        ).limit(limit)
+
+        ranks = []
+        for row in db.execute(stmt):
+            spend, gmv, orders = float(row.spend or 0), float(row.gmv or 0), int(row.orders or 0)
+            ranks.append(AdsProductRank(
+                store_id=row.store_id,
+                product_id=row.product_id,
+                product_name=row.nama,
+                spend=spend,
+                gmv=gmv,
+                orders=orders,
+                roas=gmv / spend if spend else None,
+                acos=spend / gmv if gmv else None,
+                cpa=spend / orders if orders else None,
+                ads_profit=_value(row.ads_profit),
+                ads_profit_per_order=float(row.ads_profit) / orders if row.ads_profit is not None and orders else None
+            ))
+        return ranks
+
+    @staticmethod
+    def listings(
+        db: Session,
+        user_id: int,
+        metric: str = "margin",
+        order: Optional[str] = None,
+        limit: int = DEFAULT_LIMIT,
+        store_id: Optional[str] = None
+    ) -> List[ListingRank]:
+        """
+        Peringkat listing dari read model listing_economics (index (user_id, metric))
+
+        Args:
+            metric: margin, profit (per order) atau break_even_roas
+            order: asc/desc (default: terburuk lebih dulu)
+        """
+        sort_keys = {
+            "margin": (ListingEconomics.margin_percent, False),
+            "profit": (ListingEconomics.profit_per_order, False),
+            # NULL = not profitable at any ROAS
+            "break_even_roas": (ListingEconomics.break_even_roas, True),
+        }
+        sort_expr, null_is_high = sort_keys[metric]
+
+        stmt = select(ListingEconomics, Product.nama).outerjoin(Product, and_(
+            Product.user_id == ListingEconomics.user_id,
+            Product.id == ListingEconomics.product_id
+        )).where(ListingEconomics.user_id == user_id)
+        if store_id:
+            stmt = stmt.where(ListingEconomics.store_id == store_id)
+        stmt = stmt.order_by(
+            _sorted(sort_expr, order or RankingService.LISTING_ORDER[metric], null_is_high),
+            ListingEconomics.store_product_id
+        ).limit(limit)
+
+        return [
+            ListingRank(
+                store_product_id=row.store_product_id,
+                store_id=row.store_id,
+                product_id=row.product_id,
+                product_name=nama,
+                harga_jual=row.harga_jual,
+                hpp=row.hpp,
+                total_biaya_marketplace=row.total_biaya_marketplace,
+                profit_per_order=row.profit_per_order,
+                margin_percent=row.margin_percent,
+                break_even_roas=row.break_even_roas
+            )
+            for row, nama in db.execute(stmt)
+        ]
+
+    @staticmethod
+    def keywords(
+        db: Session,
+        user_id: int,
+        metric: str = "acos",
+        order: Optional[str] = None,
+        limit: int = DEFAULT_LIMIT,
+        store_id: Optional[str] = None,
+        product_id: Optional[str] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        min_spend: float = 0
+    ) -> List[KeywordRank]:
+        """
+        Peringkat keyword/penempatan iklan lintas periode
+
+        Dihitung dari ad_keyword_facts: GROUP BY keyword_id (integer, index
+        covering), teks keyword diambil dari kamus ad_terms per grup.
+        Hanya laporan iklan satu produk yang punya baris keyword.
+
+        Args:
+            metric: acos, spend, roas atau orders
+            order: asc/desc (default: terburuk lebih dulu)
+            min_spend: Abaikan keyword dengan total spend di bawah ini (noise)
+        """
+        fact = AdKeywordFact
+        conditions = [fact.user_id == user_id, fact.overlapping(date_from, date_to)]
+        if store_id:
+            conditions.append(fact.store_id == store_id)
+        if product_id:
+            conditions.append(fact.product_id == product_id)
+
+        spend = func.sum(fact.spend)
+        totals = select(
+            fact.keyword_id,
+            spend.label("spend"),
+            func.sum(fact.gmv).label("gmv"),
+            func.sum(fact.orders).label("orders"),
+            func.sum(fact.impressions).label("impressions"),
+            func.sum(fact.clicks).label("clicks"),
+            func.sum(fact.direct_gmv).label("direct_gmv"),
+            func.count(func.distinct(fact.product_id)).label("products"),
+        ).where(*conditions).group_by(fact.keyword_id)
+        if min_spend:
+            totals = totals.having(spend >= min_spend)
+        totals = totals.subquery()
+
+        sort_keys = {
+            "acos": (_ratio(totals.c.spend, totals.c.gmv), True),
+            "spend": (totals.c.spend, False),
+            "roas": (_ratio(totals.c.gmv, totals.c.spend), True),
+            "orders": (totals.c.orders, False),
+        }
+        sort_expr, null_is_high = sort_keys[metric]
+
+        stmt = select(totals, AdTerm.value).join(AdTerm, AdTerm.id == totals.c.keyword_id).order_by(
+            _sorted(sort_expr, order or RankingService.KEYWORD_ORDER[metric], null_is_high),
+            AdTerm.value
+        ).limit(limit)
+
+        ranks = []
+        for row in db.execute(stmt):
+            row_spend, row_gmv = float(row.spend or 0), float(row.gmv or 0)
+            impressions, clicks = int(row.impressions or 0), int(row.clicks or 0)
+            ranks.append(KeywordRank(
+                keyword_id=row.keyword_id,
+                keyword=row.value,
+                spend=row_spend,
+                gmv=row_gmv,
+                direct_gmv=_value(row.direct_gmv),
+                orders=int(row.orders or 0),
+                impressions=impressions,
+                clicks=clicks,
+                products=row.products,
+                ctr=clicks / impressions if impressions else None,
+                roas=row_gmv / row_spend if row_spend else None,
+                acos=row_spend / row_gmv if row_gmv else None
+            ))
+        return ranks
@@ -0,0 +1,170 @@
+"""
+Report Archive Service
+Keeps the raw table of every uploaded report as a compressed Parquet file
+"""
+import json
+import os
+from datetime import datetime
+from typing import Optional, Tuple
+
+import pandas as pd
+from sqlalchemy.orm import Session
+
+from ..models import ReportArchive
+
+# Root directory for archived reports; files live at <dir>/<user_id>/<report_type>/<file_hash>.parquet
+REPORT_ARCHIVE_DIR = os.getenv("REPORT_ARCHIVE_DIR", "./report_archive")
+PARQUET_COMPRESSION = "zstd"
+
+REPORT_TYPES = ("shopee_ads", "shopee_sales", "shopee_products")
+
+
+def archive_path(user_id: int, report_type: str, file_hash: str) -> str:
+    """Path of an archived report relative to REPORT_ARCHIVE_DIR"""
+    return os.path.join(str(user_id), report_type, f"{file_hash}.parquet")
+
+
+def write_frame(relative_path: str, df: pd.DataFrame) -> Tuple[int, int]:
+    """
+    Write a raw report table as Parquet
+
+    Shopee exports mix numbers and formatted text ("4,74%", "-") in one column,
+    so text columns are stored as strings with missing values kept as nulls.
+    Pure file operation: safe to call from a process pool worker.
+
+    Returns:
+        (row_count, size_bytes)
+    """
+    frame = df.copy()
+    columns, seen = [], {}
+    for col in frame.columns:
+        name = str(col).strip() or "unnamed"
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        columns.append(name)
+    frame.columns = columns
+    for col in frame.columns:
+        if frame[col].dtype == object:
+            frame[col] = frame[col].map(lambda v: None if pd.isna(v) else str(v))
+
+    full_path = os.path.join(REPORT_ARCHIVE_DIR, relative_path)
+    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+    tmp_path = f"{full_path}.tmp"
+    frame.to_parquet(tmp_path, compression=PARQUET_COMPRESSION, index=False)
+    os.replace(tmp_path, full_path)
+    return len(frame), os.path.getsize(full_path)
+
+
+class ReportArchiveService:
+    """Service untuk arsip laporan mentah (Parquet) dan katalognya"""
+
+    @staticmethod
+    def get(db: Session, user_id: int, report_type: str, file_hash: str) -> Optional[ReportArchive]:
+        return db.query(ReportArchive).filter(
+            ReportArchive.user_id == user_id,
+            ReportArchive.report_type == report_type,
+            ReportArchive.file_hash == file_hash
+        ).first()
+
+    @staticmethod
+    def register(
+        db: Session,
+        user_id: int,
+        store_id: str,
+        report_type: str,
+        file_hash: str,
+        filename: str,
+        row_count: int,
+        column_count: int,
+        size_bytes: int,
+        metadata: Optional[dict] = None
+    ) -> ReportArchive:
+        """
+        Catat file Parquet yang sudah ditulis ke katalog (tanpa commit)
+
+        Jika file_hash yang sama sudah ada, entri lama diperbarui.
+        """
+        archive = ReportArchiveService.get(db, user_id, report_type, file_hash)
+        if not archive:
+            archive = ReportArchive(user_id=user_id, report_type=report_type, file_hash=file_hash)
+            db.add(archive)
+        archive.store_id = store_id
+        archive.filename = filename
+        archive.path = archive_path(user_id, report_type, file_hash)
+        archive.row_count = row_count
+        archive.column_count = column_count
+        archive.size_bytes = size_bytes
+        archive.report_metadata = json.dumps(metadata, default=str) if metadata else None
+        archive.archived_at = datetime.now()
+        return archive
+
+    @staticmethod
+    def archive(
+        db: Session,
+        user_id: int,
+        store_id: str,
+        report_type: str,
+        file_hash: str,
+        filename: str,
+        df: pd.DataFrame,
+        metadata: Optional[dict] = None
+    ) -> Optional[ReportArchive]:
+        """
+        Tulis tabel laporan ke Parquet dan catat di katalog (tanpa commit)
+
+        Arsip bersifat pelengkap: kegagalan menulis file tidak boleh
+        menggagalkan import, sehingga error hanya dicetak dan None dikembalikan.
+        """
+        relative_path = archive_path(user_id, report_type, file_hash)
+        try:
+            row_count, size_bytes = write_frame(relative_path, df)
+        except Exception as e:
+            print(f"Report archive error ({filename}): {e}")
+            return None
+        return ReportArchiveService.register(
+            db, user_id, store_id, report_type, file_hash, filename,
+            row_count, len(df.columns), size_bytes, metadata
+        )
+
+    @staticmethod
+    def load(archive: ReportArchive) -> Tuple[pd.DataFrame, dict]:
+        """
+        Baca tabel mentah dari arsip
+
+        Returns:
+            (DataFrame dengan kolom asli laporan, metadata)
+
+        Raises:
+            FileNotFoundError jika file Parquet sudah tidak ada
+        """
+        df = pd.read_parquet(os.path.join(REPORT_ARCHIVE_DIR, archive.path))
+        # Parsers expect pandas' NaN for empty cells, as in a freshly read CSV/Excel file
+        for col in df.columns:
+            if df[col].dtype == object:
+                df[col] = df[col].map(lambda v: float("nan") if v is None else v)
+        metadata = json.loads(archive.report_metadata) if archive.report_metadata else {}
+        return df, metadata
+
+    @staticmethod
+    def delete(db: Session, archive: ReportArchive) -> str:
+        """
+        Hapus entri katalog arsip (tanpa commit)
+
+        File Parquet-nya tidak ikut dihapus: panggil remove_file dengan path
+        yang dikembalikan setelah commit berhasil.
+
+        Returns:
+            Path file arsip relatif terhadap REPORT_ARCHIVE_DIR
+        """
+        db.delete(archive)
+        return archive.path
+
+    @staticmethod
+    def remove_file(relative_path: str) -> None:
+        """Hapus file arsip (jika masih ada)"""
+        full_path = os.path.join(REPORT_ARCHIVE_DIR, relative_path)
+        if os.path.exists(full_path):
+            os.remove(full_path)
@@ -0,0 +1,3 @@
+"""
+Benchmark suite for the HPP, pricing and decision services
+"""
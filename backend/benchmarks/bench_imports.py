@@ -0,0 +1,225 @@
+"""
+Import Load Test
+Drives synthetic Shopee ads, sales and product reports through the /imports/*
+endpoints in-process with TestClient, several uploads at a time, while a probe
+thread measures the latency of unrelated endpoints.
+
+Reports rows/sec per upload, peak RSS and p95 probe latency.
+
+Usage (from backend/):
+    python -m benchmarks.bench_imports --sizes 1000,10000 --formats csv,xlsx --concurrency 4
+    python -m benchmarks.bench_imports --sizes 1000000 --kinds ads --formats csv --output imports.json
+"""
+import argparse
+import json
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from .shopee_reports import build_report, product_names
+
+ENDPOINTS = {
+    "ads": "/imports/shopee-ads",
+    "sales": "/imports/shopee-sales",
+    "products": "/imports/shopee-products",
+}
+
+PROBE_PATHS = ["/health", "/stores", "/materials"]
+
+
+def _rss_mb() -> float:
+    """Current resident set size in MB (Linux), falls back to peak RSS"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class Probe(threading.Thread):
+    """Hits unrelated endpoints in a loop and records latency and RSS"""
+
+    def __init__(self, client, headers, interval=0.05):
+        super().__init__(daemon=True)
+        self.client = client
+        self.headers = headers
+        self.interval = interval
+        self.latencies = []
+        self.peak_rss_mb = _rss_mb()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        i = 0
+        while not self._stop_event.is_set():
+            path = PROBE_PATHS[i % len(PROBE_PATHS)]
+            start = time.perf_counter()
+            self.client.get(path, headers=self.headers)
+            self.latencies.append((time.perf_counter() - start) * 1000)
+            self.peak_rss_mb = max(self.peak_rss_mb, _rss_mb())
+            i += 1
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def _percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[max(0, int(len(ordered) * pct) - 1)], 2)
+
+
+def _setup_tenant(client, n_stores, n_products):
+    """Register a user, a Shopee marketplace, stores and the catalog used by product reports"""
+    from app.database import SessionLocal
+    from app.models import Product, User
+    from sqlalchemy import insert
+
+    client.post("/auth/register", json={"email": "importload@example.com", "password": "loadtest123",
+                                        "full_name": "Import Load"})
+    token = client.post("/auth/token", data={"username": "importload@example.com",
+                                             "password": "loadtest123"}).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    client.post("/marketplaces", json={"id": "shopee", "name": "Shopee"}, headers=headers)
+    for i in range(n_stores):
+        client.post("/stores", json={"id": f"toko-{i}", "marketplace_id": "shopee", "name": f"Toko {i}"},
+                    headers=headers)
+
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.email == "importload@example.com").first()
+        db.execute(insert(Product), [
+            {"id": f"p-{i}", "user_id": user.id, "nama": name} for i, name in enumerate(product_names(n_products))
+        ])
+        db.commit()
+    finally:
+        db.close()
+    return headers
+
+
+def run_load_test(kinds, formats, sizes, concurrency, n_products):
+    """Run every (kind, format, size) case and return the result dict"""
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    cases = [(k, f, s) for s in sizes for k in kinds for f in formats]
+
+    print(f"Generating {len(cases)} reports...")
+    reports = {}
+    for kind, fmt, size in cases:
+        start = time.perf_counter()
+        reports[(kind, fmt, size)] = build_report(kind, fmt, size, n_products=n_products)
+        print(f"  {kind:8s} {fmt:4s} {size:>9,} rows  "
+              f"{len(reports[(kind, fmt, size)][1]) / 1024 / 1024:7.1f} MB  ({time.perf_counter() - start:.1f}s)")
+
+    results = []
+    with TestClient(app) as client:
+        # One store per case so duplicate-period checks never collide
+        headers = _setup_tenant(client, len(cases), n_products)
+        baseline_rss = _rss_mb()
+        probe = Probe(client, headers)
+        probe.start()
+
+        def upload(idx_case):
+            idx, (kind, fmt, size) = idx_case
+            filename, payload = reports[(kind, fmt, size)]
+            start = time.perf_counter()
+            resp = client.post(
+                ENDPOINTS[kind],
+                data={"store_id": f"toko-{idx}"},
+                files={"file": (filename, payload)},
+                headers=headers,
+            )
+            seconds = time.perf_counter() - start
+            body = resp.json() if resp.headers.get("content-type", "").startswith("application/json") else {}
+            return {
+                "kind": kind, "format": fmt, "rows": size, "status": resp.status_code,
+                "seconds": round(seconds, 3), "rows_per_sec": round(size / seconds, 1) if seconds else None,
+                "rows_imported": body.get("rows_imported"),
+                "detail": body.get("detail") if resp.status_code >= 400 else None,
+            }
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for result in pool.map(upload, enumerate(cases)):
+                results.append(result)
+                print(f"  {result['kind']:8s} {result['format']:4s} {result['rows']:>9,} rows  "
+                      f"HTTP {result['status']}  {result['seconds']:8.2f}s  {result['rows_per_sec'] or 0:>10,.0f} rows/s")
+        wall_seconds = time.perf_counter() - started
+        probe.stop()
+
+    return {
+        "meta": {
+            "kinds": kinds, "formats": formats, "sizes": sizes, "concurrency": concurrency,
+            "n_products": n_products, "created_at": datetime.now().isoformat(timespec="seconds"),
+        },
+        "imports": results,
+        "summary": {
+            "wall_seconds": round(wall_seconds, 2),
+            "total_rows": sum(size for _, _, size in cases),
+            "baseline_rss_mb": round(baseline_rss, 1),
+            "peak_rss_mb": round(max(probe.peak_rss_mb, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024), 1),
+            "probe_requests": len(probe.latencies),
+            "probe_p50_ms": _percentile(probe.latencies, 0.50),
+            "probe_p95_ms": _percentile(probe.latencies, 0.95),
+            "probe_max_ms": round(max(probe.latencies), 2) if probe.latencies else None,
+            "probe_mean_ms": round(statistics.fmean(probe.latencies), 2) if probe.latencies else None,
+        },
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Load test the Shopee import endpoints")
+    parser.add_argument("--kinds", default="ads,sales,products", help="Comma-separated: ads,sales,products")
+    parser.add_argument("--formats", default="csv,xlsx", help="Comma-separated: csv,xlsx")
+    parser.add_argument("--sizes", default="1000,10000", help="Comma-separated row counts (1000 up to 1000000)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Uploads in flight at once")
+    parser.add_argument("--products", type=int, default=1000, help="Product names shared by the reports")
+    parser.add_argument("--output", help="Write JSON results to this file")
+    parser.add_argument("--db", help="SQLite file to use (default: temporary file)")
+    args = parser.parse_args(argv)
+
+    kinds = [k.strip() for k in args.kinds.split(",") if k.strip()]
+    formats = [f.strip() for f in args.formats.split(",") if f.strip()]
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+
+    tmp = None
+    if args.db:
+        if os.path.exists(args.db):
+            os.remove(args.db)
+        db_path = args.db
+    else:
+        tmp = tempfile.TemporaryDirectory()
+        db_path = os.path.join(tmp.name, "imports.db")
+    # app.database reads DATABASE_URL at import time, so set it before the app is loaded
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+
+    try:
+        result = run_load_test(kinds, formats, sizes, args.concurrency, args.products)
+    finally:
+        if tmp:
+            tmp.cleanup()
+
+    summary = result["summary"]
+    print(f"Wall time {summary['wall_seconds']}s, peak RSS {summary['peak_rss_mb']} MB "
+          f"(baseline {summary['baseline_rss_mb']} MB)")
+    print(f"Unrelated endpoints during imports: {summary['probe_requests']} requests, "
+          f"p50 {summary['probe_p50_ms']} ms, p95 {summary['probe_p95_ms']} ms, max {summary['probe_max_ms']} ms")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"Results written to {args.output}")
+    return 0 if all(r["status"] < 400 for r in result["imports"]) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
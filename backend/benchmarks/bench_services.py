@@ -0,0 +1,179 @@
+"""
+Service Benchmarks
+Times HPPService, PricingService and DecisionService against a synthetic
+tenant in SQLite and writes JSON results that can be compared to a baseline.
+
+Usage (from backend/):
+    python -m benchmarks.bench_services --scale small --output bench.json
+    python -m benchmarks.bench_services --scale small --baseline bench.json --threshold 0.2
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import sqlalchemy
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.schemas.pricing import ReversePricingRequest
+from app.services import HPPService, PricingService, DecisionService
+from .synthetic import SCALES, seed_tenant
+
+
+def _time_calls(Session, fn, args_list, repeat):
+    """
+    Run fn(db, *args) for every args tuple, `repeat` times, and return per-call stats in ms.
+    Every call gets a fresh session, so the identity map never serves a repeat from memory.
+    """
+    samples = []
+    for _ in range(repeat):
+        for args in args_list:
+            with Session() as db:
+                start = time.perf_counter()
+                fn(db, *args)
+                samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "calls": len(samples),
+        "mean_ms": round(statistics.fmean(samples), 4),
+        "median_ms": round(statistics.median(samples), 4),
+        "p95_ms": round(samples[int(len(samples) * 0.95) - 1] if len(samples) > 1 else samples[0], 4),
+        "min_ms": round(samples[0], 4),
+    }
+
+
+def run_benchmarks(scale_name: str, sample: int, repeat: int, db_path: str) -> dict:
+    """Seed a fresh SQLite database and time every service entry point"""
+    scale = SCALES[scale_name]
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    seed_start = time.perf_counter()
+    with Session() as db:
+        tenant = seed_tenant(db, scale)
+    seed_seconds = time.perf_counter() - seed_start
+
+    rng = random.Random(7)
+    user_id = tenant["user_id"]
+    product_ids = rng.sample(tenant["product_ids"], min(sample, len(tenant["product_ids"])))
+    sp_ids = rng.sample(tenant["store_product_ids"], min(sample, len(tenant["store_product_ids"])))
+    listings = rng.sample(tenant["listings"], min(sample, len(tenant["listings"])))
+    reverse_requests = [
+        ReversePricingRequest(store_id=s, product_id=p, target_type="percent", target_value=0.2)
+        for s, p in listings
+    ]
+
+    results = {}
+    results["hpp.calculate_hpp"] = _time_calls(
+        Session, lambda db, pid: HPPService.calculate_hpp(db, pid, user_id),
+        [(pid,) for pid in product_ids], repeat
+    )
+    results["hpp.calculate_hpp_values"] = _time_calls(
+        Session, lambda db, ids: HPPService.calculate_hpp_values(db, ids, user_id),
+        [(tenant["product_ids"],)], repeat
+    )
+    results["pricing.calculate_forward_pricing"] = _time_calls(
+        Session, lambda db, sp_id: PricingService.calculate_forward_pricing(db, sp_id, user_id),
+        [(sp_id,) for sp_id in sp_ids], repeat
+    )
+    results["pricing.calculate_forward_pricing_batch"] = _time_calls(
+        Session, lambda db, ids: PricingService.calculate_forward_pricing_batch(db, ids, user_id),
+        [(sp_ids,)], repeat
+    )
+    results["pricing.calculate_reverse_pricing"] = _time_calls(
+        Session, lambda db, req: PricingService.calculate_reverse_pricing(db, req, user_id),
+        [(req,) for req in reverse_requests], repeat
+    )
+    results["decision.get_decision"] = _time_calls(
+        Session, lambda db, s, p: DecisionService.get_decision(db, s, p, user_id),
+        listings, repeat
+    )
+
+    engine.dispose()
+    return {
+        "meta": {
+            "scale": scale_name,
+            "scale_params": scale,
+            "sample": sample,
+            "repeat": repeat,
+            "seed_seconds": round(seed_seconds, 2),
+            "python": platform.python_version(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+        },
+        "results": results,
+    }
+
+
+def compare_results(current: dict, baseline: dict, threshold: float) -> list:
+    """
+    Compare median timings with a baseline run
+
+    Returns:
+        List of (name, baseline_ms, current_ms, ratio, regressed) tuples
+    """
+    rows = []
+    for name, stats in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base:
+            continue
+        ratio = stats["median_ms"] / base["median_ms"] if base["median_ms"] > 0 else 1.0
+        rows.append((name, base["median_ms"], stats["median_ms"], ratio, ratio > 1 + threshold))
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark HPP, pricing and decision services")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--sample", type=int, default=50, help="Entities timed per case")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes over the sample")
+    parser.add_argument("--output", help="Write JSON results to this file")
+    parser.add_argument("--baseline", help="Baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed median slowdown (0.2 = 20%%)")
+    parser.add_argument("--db", help="SQLite file to use (default: temporary file)")
+    args = parser.parse_args(argv)
+
+    if args.db:
+        if os.path.exists(args.db):
+            os.remove(args.db)
+        current = run_benchmarks(args.scale, args.sample, args.repeat, args.db)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            current = run_benchmarks(args.scale, args.sample, args.repeat, os.path.join(tmp, "bench.db"))
+
+    print(f"Scale: {args.scale} (seeded in {current['meta']['seed_seconds']}s)")
+    for name, stats in current["results"].items():
+        print(f"  {name:40s} median {stats['median_ms']:9.3f} ms  p95 {stats['p95_ms']:9.3f} ms")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("meta", {}).get("scale") != args.scale:
+            print("Warning: baseline was recorded at a different scale")
+        regressed = False
+        print("Comparison with baseline (median):")
+        for name, base_ms, cur_ms, ratio, is_regressed in compare_results(current, baseline, args.threshold):
+            flag = "REGRESSION" if is_regressed else "ok"
+            print(f"  {name:40s} {base_ms:9.3f} -> {cur_ms:9.3f} ms  x{ratio:.2f}  {flag}")
+            regressed = regressed or is_regressed
+        if regressed:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
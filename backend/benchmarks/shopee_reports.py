@@ -0,0 +1,137 @@
+"""
+Synthetic Shopee Reports
+Builds scaled variants of the Shopee ads, sales overview and product performance
+exports in the layout of contoh_file/Data-Iklan-Produk-*.csv, as CSV or XLSX bytes.
+"""
+import csv
+import io
+import random
+from datetime import date, timedelta
+
+from openpyxl import Workbook
+
+ADS_COLUMNS = [
+    "Urutan", "Nama Iklan", "Kata Pencarian/Penempatan", "Tipe Pencocokan", "Hasil Pencarian", "Mode Bidding",
+    "Penempatan Iklan", "Dilihat", "Jumlah Klik", "Persentase Klik", "Konversi", "Konversi Langsung",
+    "Tingkat konversi", "Tingkat Konversi Langsung", "Biaya per Konversi", "Biaya per Konversi Langsung",
+    "Produk Terjual", "Terjual Langsung", "Omzet Penjualan", "Penjualan Langsung (GMV Langsung)", "Biaya",
+    "Rata-rata Peringkat Iklan", "Efektifitas Iklan", "Efektivitas Langsung",
+    "Persentase Biaya Iklan terhadap Penjualan dari Iklan (ACOS)",
+    "Persentase Biaya Iklan terhadap Penjualan dari Iklan Langsung (ACOS Langsung)",
+]
+
+SALES_COLUMNS = [
+    "Tanggal", "Penjualan (Pesanan Dibuat) (IDR)", "Penjualan (Pesanan Siap Dikirim) (IDR)",
+    "Total Pengunjung (Kunjungan)", "Pesanan (COD Dibuat + non-COD Dibayar)", "Tingkat Konversi",
+]
+
+PRODUCT_COLUMNS = ["Kode Produk", "Nama Produk", "Pengunjung", "Pesanan", "Penjualan"]
+
+KEYWORDS = ["Pilih Otomatis", "rak helm", "gantungan helm", "rak dinding", "Halaman Rekomendasi",
+            "Halaman Pencarian", "Produk Serupa", "rak serbaguna", "tempat helm kayu"]
+
+
+def product_names(n: int) -> list:
+    """Product names shared by the ads and product reports so rows map to one catalog"""
+    return [f"Rak helm gantung susun kayu varian {i}" for i in range(n)]
+
+
+def _ads_metadata(period_start: date, period_end: date) -> list:
+    return [
+        ["Laporan-Iklan-Produk - Shopee Indonesia"],
+        ["Username", "loadtest"],
+        ["Nama Toko", "tokoloadtest"],
+        ["ID Toko", "73046353"],
+        ["", ""],
+        ["Waktu Laporan Dibuat", period_end.strftime("%d/%m/%Y") + " 22:08"],
+        ["Periode", f"{period_start.strftime('%d/%m/%Y')} - {period_end.strftime('%d/%m/%Y')}"],
+        [],
+        [],
+        ["Bidding Otomatis"],
+    ]
+
+
+def ads_rows(rows: int, n_products: int, rng: random.Random):
+    names = product_names(n_products)
+    for i in range(rows):
+        impressions = rng.randint(100, 50000)
+        clicks = int(impressions * rng.uniform(0.005, 0.05))
+        conv = int(clicks * rng.uniform(0, 0.08))
+        spend = clicks * rng.randint(200, 900)
+        gmv = conv * rng.randrange(25000, 300000, 500)
+        yield [
+            i + 1, names[i % n_products], rng.choice(KEYWORDS), "-", "-", "GMV Max ROAS", "Semua Penempatan",
+            impressions, clicks, f"{clicks / impressions * 100:.2f}%", conv, conv,
+            f"{conv / clicks * 100 if clicks else 0:.2f}%", f"{conv / clicks * 100 if clicks else 0:.2f}%",
+            round(spend / conv, 2) if conv else 0, round(spend / conv, 2) if conv else 0,
+            conv, conv, gmv, gmv, spend, rng.randint(1, 20),
+            round(gmv / spend, 2) if spend else 0, round(gmv / spend, 2) if spend else 0,
+            f"{spend / gmv * 100 if gmv else 0:.2f}%", f"{spend / gmv * 100 if gmv else 0:.2f}%",
+        ]
+
+
+def sales_rows(rows: int, rng: random.Random, first_day: date = date(1900, 1, 1)):
+    for i in range(rows):
+        visitors = rng.randint(100, 5000)
+        orders = int(visitors * rng.uniform(0.005, 0.05))
+        net = orders * rng.randint(40000, 200000)
+        yield [
+            (first_day + timedelta(days=i)).strftime("%d-%m-%Y"), int(net * 1.05), net,
+            visitors, orders, f"{orders / visitors * 100:.2f}",
+        ]
+
+
+def product_rows(rows: int, n_products: int, rng: random.Random):
+    names = product_names(n_products)
+    for i in range(rows):
+        visitors = rng.randint(0, 3000)
+        orders = int(visitors * rng.uniform(0, 0.06))
+        yield [f"SKU-{i}", names[i % n_products], visitors, orders, orders * rng.randint(25000, 300000)]
+
+
+def build_report(kind: str, fmt: str, rows: int, n_products: int = 1000, seed: int = 42) -> tuple:
+    """
+    Build one synthetic report
+
+    Args:
+        kind: 'ads', 'sales' or 'products'
+        fmt: 'csv' or 'xlsx'
+        rows: Number of data rows
+        n_products: Size of the product name pool (ads/products reports)
+
+    Returns:
+        (filename, bytes)
+    """
+    rng = random.Random(seed)
+    if kind == "ads":
+        preamble = _ads_metadata(date(2025, 12, 19), date(2026, 1, 19))
+        header, body = ADS_COLUMNS, ads_rows(rows, n_products, rng)
+    elif kind == "sales":
+        preamble = [["Ringkasan Performa Toko - Shopee Indonesia"], []]
+        header, body = SALES_COLUMNS, sales_rows(rows, rng)
+    elif kind == "products":
+        preamble = [["Performa Produk - Shopee Indonesia"], []]
+        header, body = PRODUCT_COLUMNS, product_rows(rows, n_products, rng)
+    else:
+        raise ValueError(f"Unknown report kind: {kind}")
+
+    filename = f"loadtest-{kind}-{rows}.{fmt}"
+    if fmt == "csv":
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        writer.writerows(preamble)
+        writer.writerow(header)
+        writer.writerows(body)
+        return filename, buf.getvalue().encode("utf-8-sig")
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    # Excel readers drop fully empty leading rows; keep one filler cell so offsets match the CSV
+    for row in preamble:
+        ws.append(row or [""])
+    ws.append(header)
+    for row in body:
+        ws.append(row)
+    out = io.BytesIO()
+    wb.save(out)
+    return filename, out.getvalue()
@@ -0,0 +1,159 @@
+"""
+Synthetic tenant for benchmarks
+Seeds one user with materials, products (5-50 BOM lines each, some using
+up to 3 earlier products as sub-assemblies), stores,
+listings with fees and discounts, and ads into a fresh database.
+"""
+import random
+from datetime import date, timedelta
+
+from sqlalchemy.orm import Session
+
+from app import models
+
+
+# Named presets so results stay comparable between runs
+SCALES = {
+    "small": {"materials": 200, "products": 100, "stores": 2, "listing_ratio": 0.8, "ads_per_listing": 4},
+    "medium": {"materials": 1000, "products": 1000, "stores": 4, "listing_ratio": 0.7, "ads_per_listing": 8},
+    "large": {"materials": 5000, "products": 10000, "stores": 8, "listing_ratio": 0.6, "ads_per_listing": 12},
+}
+
+BOM_LINES_MIN = 5
+BOM_LINES_MAX = 50
+# Share of products that also use earlier products as sub-assemblies
+SUBASSEMBLY_RATIO = 0.3
+SUBASSEMBLY_MAX = 3
+
+COST_TYPES = [
+    ("fee-admin", "Biaya Admin", "percent", "price", (0.04, 0.08)),
+    ("fee-layanan", "Biaya Layanan", "percent", "after_discount", (0.02, 0.05)),
+    ("fee-proses", "Biaya Proses Pesanan", "fixed", "after_discount", (1000, 1250)),
+]
+
+
+def seed_tenant(db: Session, scale: dict, seed: int = 42) -> dict:
+    """
+    Seed a synthetic tenant and return the generated keys
+
+    Args:
+        db: Database session (empty database)
+        scale: Dict with materials, products, stores, listing_ratio, ads_per_listing
+        seed: Random seed so every run builds the same tenant
+
+    Returns:
+        Dict with user_id, product_ids, store_ids and store_product_ids
+    """
+    rng = random.Random(seed)
+
+    user = models.User(email="bench@example.com", hashed_password="-", full_name="Benchmark")
+    db.add(user)
+    db.flush()
+    user_id = user.id
+
+    db.add(models.Marketplace(id="shopee", user_id=user_id, name="Shopee"))
+    for ct_id, name, calc_type, apply_to, _ in COST_TYPES:
+        db.add(models.MarketplaceCostType(
+            id=ct_id, user_id=user_id, name=name, calc_type=calc_type, apply_to=apply_to
+        ))
+
+    material_ids = [f"mat-{i:06d}" for i in range(scale["materials"])]
+    db.add_all([
+        _material(mid, user_id, rng) for mid in material_ids
+    ])
+
+    product_ids = [f"prd-{i:06d}" for i in range(scale["products"])]
+    db.add_all([
+        models.Product(id=pid, user_id=user_id, nama=f"Produk Sintetis {pid}") for pid in product_ids
+    ])
+    db.flush()
+
+    bom_rows = []
+    extra_rows = []
+    for pid in product_ids:
+        lines = rng.randint(BOM_LINES_MIN, min(BOM_LINES_MAX, len(material_ids)))
+        for mid in rng.sample(material_ids, lines):
+            bom_rows.append(models.BOM(
+                user_id=user_id, product_id=pid, material_id=mid, qty=round(rng.uniform(0.1, 10), 2)
+            ))
+        extra_rows.append(models.ProductExtraCost(
+            user_id=user_id, product_id=pid, label="Packing", value=rng.choice([1000, 1500, 2000])
+        ))
+    # Separate stream so the material lines above stay identical to older runs;
+    # components always come from earlier products, which keeps the graph acyclic
+    sub_rng = random.Random(seed + 1)
+    for i, pid in enumerate(product_ids[1:], start=1):
+        if sub_rng.random() < SUBASSEMBLY_RATIO:
+            for cid in sub_rng.sample(product_ids[:i], min(i, sub_rng.randint(1, SUBASSEMBLY_MAX))):
+                bom_rows.append(models.BOM(
+                    user_id=user_id, product_id=pid, component_product_id=cid, qty=sub_rng.randint(1, 4)
+                ))
+    db.add_all(bom_rows)
+    db.add_all(extra_rows)
+
+    store_ids = [f"store-{i:03d}" for i in range(scale["stores"])]
+    db.add_all([
+        models.Store(id=sid, user_id=user_id, marketplace_id="shopee", name=f"Toko {sid}") for sid in store_ids
+    ])
+    db.flush()
+
+    listings = []
+    for sid in store_ids:
+        listed = rng.sample(product_ids, int(len(product_ids) * scale["listing_ratio"]))
+        for pid in listed:
+            listings.append(models.StoreProduct(
+                user_id=user_id, store_id=sid, product_id=pid, harga_jual=rng.randrange(25000, 500000, 500)
+            ))
+    db.add_all(listings)
+    db.flush()
+
+    period_end = date(2026, 1, 19)
+    child_rows = []
+    for sp in listings:
+        for ct_id, _, _, _, (low, high) in COST_TYPES:
+            value = rng.uniform(low, high) if isinstance(low, float) else rng.randint(low, high)
+            child_rows.append(models.StoreProductMarketplaceCost(
+                user_id=user_id, store_product_id=sp.id, cost_type_id=ct_id, value=value
+            ))
+        if rng.random() < 0.5:
+            child_rows.append(models.Discount(
+                user_id=user_id, store_product_id=sp.id, discount_type="percent", value=rng.choice([0.05, 0.1, 0.15])
+            ))
+        if rng.random() < 0.2:
+            child_rows.append(models.Discount(
+                user_id=user_id, store_product_id=sp.id, discount_type="fixed", value=rng.choice([2000, 5000])
+            ))
+        for n in range(scale["ads_per_listing"]):
+            start = period_end - timedelta(days=30 * (n + 1))
+            spend = rng.randint(10000, 700000)
+            orders = rng.randint(0, 60)
+            child_rows.append(models.Ad(
+                user_id=user_id, store_id=sp.store_id, product_id=sp.product_id,
+                campaign=f"Kata Kunci {n}", spend=spend, gmv=orders * sp.harga_jual, orders=orders,
+                impressions=rng.randint(1000, 50000), clicks=rng.randint(10, 1500),
+                start_date=start, end_date=start + timedelta(days=29)
+            ))
+    db.add_all(child_rows)
+    db.commit()
+
+    return {
+        "user_id": user_id,
+        "product_ids": product_ids,
+        "store_ids": store_ids,
+        "store_product_ids": [sp.id for sp in listings],
+        "listings": [(sp.store_id, sp.product_id) for sp in listings],
+    }
+
+
+def _material(material_id: str, user_id: int, rng: random.Random) -> models.Material:
+    harga_total = rng.randrange(5000, 2000000, 500)
+    jumlah_unit = float(rng.choice([1, 10, 12, 50, 100, 1000]))
+    return models.Material(
+        id=material_id,
+        user_id=user_id,
+        nama=f"Bahan {material_id}",
+        harga_total=harga_total,
+        jumlah_unit=jumlah_unit,
+        harga_satuan=harga_total / jumlah_unit,
+        satuan=rng.choice(["pcs", "meter", "gram", "cm"]),
+    )
@@ -0,0 +1,38 @@
+"""
+Re-grade all listings and store GradeSnapshot rows for today (or a backfill date)
+
+The API runs the same job nightly (app/scheduler.py, GRADING_TIME); use this
+script for cron, a backfill date or a single user. A backfill date is graded
+with the material prices and extra costs in force then and the ads up to that
+date; selling prices, discounts and marketplace fees are the current ones.
+
+Usage:
+    python grade_listings.py
+    python grade_listings.py --date 2026-01-31 --workers 4
+    python grade_listings.py --user 3 --workers 1
+"""
+import argparse
+import time
+from datetime import date
+
+from app.database import Base, engine
+from app.services.grading_service import GradingService, GRADING_WORKERS
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-grade all listings into daily grade snapshots")
+    parser.add_argument("--date", type=date.fromisoformat, default=date.today(), help="Snapshot date (default today)")
+    parser.add_argument("--workers", type=int, default=GRADING_WORKERS, help="Worker processes (1 = no pool)")
+    parser.add_argument("--user", type=int, action="append", dest="users", help="Only this user id (repeatable)")
+    args = parser.parse_args(argv)
+
+    Base.metadata.create_all(bind=engine)
+    started = time.perf_counter()
+    written = GradingService.run_all(args.date, args.workers, args.users)
+    for user_id, n in written.items():
+        print(f"  user {user_id}: {n:,} snapshots")
+    print(f"Graded {sum(written.values()):,} listings for {len(written)} users in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
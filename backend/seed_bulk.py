@@ -0,0 +1,328 @@
+"""
+Bulk Synthetic Data Generator
+Builds on seed_db.py to fill the database with N users x M stores x K products,
+including BOMs, fee schedules, discounts, years of daily StorePerformance /
+ProductPerformance and keyword-level ads with their ad_keyword_facts. Rows are
+written with Core executemany inserts in chunks, so tens of millions of rows
+take minutes; the listing_economics read model is rebuilt per user afterwards.
+
+Usage:
+    python seed_bulk.py --users 10 --stores 3 --products 500 --days 730
+    DATABASE_URL=postgresql://... python seed_bulk.py --users 50 --analyze
+"""
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import func, insert, select, text
+
+from app.database import Base, SessionLocal, engine
+from app import models, auth
+from app.services.listing_economics_service import ListingEconomicsService
+
+LOADTEST_PASSWORD = "loadtest123"
+
+COST_TYPES = [
+    {"id": "fee-admin", "name": "Biaya Admin", "calc_type": "percent", "apply_to": "price", "range": (0.04, 0.08)},
+    {"id": "fee-layanan", "name": "Biaya Layanan", "calc_type": "percent", "apply_to": "after_discount", "range": (0.02, 0.05)},
+    {"id": "fee-proses", "name": "Biaya Proses Pesanan", "calc_type": "fixed", "apply_to": "after_discount", "range": (1000, 1250)},
+]
+
+MATERIAL_NAMES = ["Kain Katun", "Kain Flanel", "Kancing", "Benang", "Resleting", "Papan Kayu", "Sekrup", "Cat Kayu",
+                  "Plastik Packing", "Kardus", "Label", "Lem", "Busa", "Tali", "Besi Siku", "Engsel"]
+PRODUCT_NAMES = ["Kemeja", "Kaos", "Rak Helm", "Gantungan", "Tas", "Dompet", "Rak Buku", "Meja Lipat", "Jaket", "Celana"]
+KEYWORDS = ["Pilih Otomatis", "rak helm", "gantungan helm", "rak dinding", "kemeja pria", "kaos polos", "tas wanita",
+            "dompet kulit", "rak buku kayu", "meja lipat", "jaket hoodie", "celana chino", "Halaman Rekomendasi",
+            "Halaman Pencarian", "Produk Serupa", "rak serbaguna", "kaos oversize", "kemeja flanel"]
+
+
+def _chunks(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _bulk_insert(conn, model, rows, chunk_size, counts):
+    """Insert an iterable of dict rows in executemany chunks"""
+    table = model.__table__
+    stmt = insert(table)
+    total = 0
+    start = time.perf_counter()
+    for batch in _chunks(rows, chunk_size):
+        conn.execute(stmt, batch)
+        total += len(batch)
+    counts[table.name] = counts.get(table.name, 0) + total
+    counts.setdefault("_seconds", {})
+    counts["_seconds"][table.name] = counts["_seconds"].get(table.name, 0) + time.perf_counter() - start
+    return total
+
+
+def _create_users(n_users, offset):
+    """Create load-test users through the ORM (few rows, needs generated ids)"""
+    db = SessionLocal()
+    try:
+        hashed = auth.get_password_hash(LOADTEST_PASSWORD)  # bcrypt is slow, hash once
+        users = [
+            models.User(email=f"loadtest{offset + i}@example.com", hashed_password=hashed, full_name=f"Load Test {offset + i}")
+            for i in range(n_users)
+        ]
+        db.add_all(users)
+        db.commit()
+        return [u.id for u in users]
+    finally:
+        db.close()
+
+
+def _rebuild_economics(user_id, counts):
+    """Fill listing_economics for one user's listings (Core inserts bypass the commit hooks)"""
+    start = time.perf_counter()
+    db = SessionLocal()
+    try:
+        written = ListingEconomicsService.rebuild(db, user_id)
+        db.commit()
+    finally:
+        db.close()
+    counts["listing_economics"] = counts.get("listing_economics", 0) + written
+    counts.setdefault("_seconds", {})
+    counts["_seconds"]["listing_economics"] = counts["_seconds"].get("listing_economics", 0) + time.perf_counter() - start
+
+
+def generate_user(conn, user_id, args, rng, next_sp_id, next_ad_id, counts):
+    """Generate the full catalog, listings and history for one user. Returns next free store_product and ad ids."""
+    n_materials, n_products, n_stores = args.materials, args.products, args.stores
+
+    _bulk_insert(conn, models.Marketplace, [{"id": "shopee", "user_id": user_id, "name": "Shopee"}], args.chunk, counts)
+    _bulk_insert(conn, models.MarketplaceCostType, (
+        {k: ct[k] for k in ("id", "name", "calc_type", "apply_to")} | {"user_id": user_id} for ct in COST_TYPES
+    ), args.chunk, counts)
+
+    material_ids = [f"mat-{i:05d}" for i in range(n_materials)]
+
+    def material_rows():
+        for i, mid in enumerate(material_ids):
+            harga_total = rng.randrange(5000, 2000000, 500)
+            jumlah_unit = float(rng.choice([1, 10, 12, 50, 100, 1000]))
+            yield {
+                "id": mid, "user_id": user_id, "nama": f"{rng.choice(MATERIAL_NAMES)} {i}",
+                "harga_total": harga_total, "jumlah_unit": jumlah_unit,
+                "harga_satuan": harga_total / jumlah_unit, "satuan": rng.choice(["pcs", "meter", "gram", "cm"]),
+            }
+
+    _bulk_insert(conn, models.Material, material_rows(), args.chunk, counts)
+
+    product_ids = [f"prd-{i:05d}" for i in range(n_products)]
+    _bulk_insert(conn, models.Product, (
+        {"id": pid, "user_id": user_id, "nama": f"{rng.choice(PRODUCT_NAMES)} Varian {i}"}
+        for i, pid in enumerate(product_ids)
+    ), args.chunk, counts)
+
+    def bom_rows():
+        for pid in product_ids:
+            lines = rng.randint(args.bom_min, min(args.bom_max, n_materials))
+            for mid in rng.sample(material_ids, lines):
+                yield {"user_id": user_id, "product_id": pid, "material_id": mid, "qty": round(rng.uniform(0.1, 10), 2)}
+
+    _bulk_insert(conn, models.BOM, bom_rows(), args.chunk, counts)
+    _bulk_insert(conn, models.ProductExtraCost, (
+        {"user_id": user_id, "product_id": pid, "label": "Packing", "value": rng.choice([1000, 1500, 2000])}
+        for pid in product_ids
+    ), args.chunk, counts)
+
+    store_ids = [f"toko-{i:02d}" for i in range(n_stores)]
+    _bulk_insert(conn, models.Store, (
+        {"id": sid, "user_id": user_id, "marketplace_id": "shopee", "name": f"Toko {user_id}-{i}"}
+        for i, sid in enumerate(store_ids)
+    ), args.chunk, counts)
+
+    # Store product ids are assigned here so child rows can reference them without RETURNING
+    listings = []
+    for sid in store_ids:
+        for pid in product_ids:
+            listings.append((next_sp_id, sid, pid, rng.randrange(25000, 500000, 500)))
+            next_sp_id += 1
+
+    _bulk_insert(conn, models.StoreProduct, (
+        {"id": sp_id, "user_id": user_id, "store_id": sid, "product_id": pid, "harga_jual": price}
+        for sp_id, sid, pid, price in listings
+    ), args.chunk, counts)
+
+    def fee_rows():
+        for sp_id, _, _, _ in listings:
+            for ct in COST_TYPES:
+                low, high = ct["range"]
+                value = rng.uniform(low, high) if isinstance(low, float) else rng.randint(low, high)
+                yield {"user_id": user_id, "store_product_id": sp_id, "cost_type_id": ct["id"], "value": value}
+
+    def discount_rows():
+        for sp_id, _, _, _ in listings:
+            if rng.random() < 0.5:
+                yield {"user_id": user_id, "store_product_id": sp_id, "discount_type": "percent",
+                       "value": rng.choice([0.05, 0.1, 0.15])}
+            if rng.random() < 0.2:
+                yield {"user_id": user_id, "store_product_id": sp_id, "discount_type": "fixed",
+                       "value": rng.choice([2000, 5000])}
+
+    _bulk_insert(conn, models.StoreProductMarketplaceCost, fee_rows(), args.chunk, counts)
+    _bulk_insert(conn, models.Discount, discount_rows(), args.chunk, counts)
+
+    start_day = args.end_date - timedelta(days=args.days - 1)
+    days = [start_day + timedelta(days=d) for d in range(args.days)]
+
+    def store_perf_rows():
+        for sid in store_ids:
+            base_visitors = rng.randint(200, 5000)
+            for day in days:
+                visitors = max(0, int(rng.gauss(base_visitors, base_visitors * 0.2)))
+                conv = rng.uniform(0.005, 0.05)
+                orders = int(visitors * conv)
+                aov = rng.uniform(40000, 200000)
+                revenue = orders * aov
+                yield {
+                    "user_id": user_id, "store_id": sid, "date": day, "visitors": visitors, "orders": orders,
+                    "revenue": revenue, "gross_revenue": revenue / (1 - rng.uniform(0, 0.08)),
+                    "conversion_rate": conv, "avg_order_value": aov,
+                }
+
+    _bulk_insert(conn, models.StorePerformance, store_perf_rows(), args.chunk, counts)
+
+    perf_listings = listings[:max(1, int(len(listings) * args.product_perf_ratio))] if args.product_perf_ratio > 0 else []
+
+    def product_perf_rows():
+        for _, sid, pid, price in perf_listings:
+            for day in days:
+                visitors = rng.randint(0, 300)
+                orders = int(visitors * rng.uniform(0, 0.06))
+                yield {
+                    "user_id": user_id, "product_id": pid, "store_id": sid, "date": day, "visitors": visitors,
+                    "orders": orders, "revenue": float(orders * price),
+                    "conversion_rate": orders / visitors if visitors else 0.0,
+                }
+
+    _bulk_insert(conn, models.ProductPerformance, product_perf_rows(), args.chunk, counts)
+
+    ad_listings = listings[:int(len(listings) * args.ads_ratio)]
+    periods = []
+    period_end = args.end_date
+    while period_end >= start_day:
+        period_start = max(start_day, period_end - timedelta(days=args.ads_period_days - 1))
+        periods.append((period_start, period_end))
+        period_end = period_start - timedelta(days=1)
+
+    _bulk_insert(conn, models.AdTerm, (
+        {"user_id": user_id, "kind": "keyword", "value": kw} for kw in KEYWORDS
+    ), args.chunk, counts)
+    keyword_ids = dict(conn.execute(select(models.AdTerm.value, models.AdTerm.id).where(
+        models.AdTerm.user_id == user_id, models.AdTerm.kind == "keyword"
+    )).all())
+
+    def ad_rows():
+        """(Ad row, AdKeywordFact row) pairs; ad ids are assigned here like store product ids"""
+        nonlocal next_ad_id
+        for _, sid, pid, price in ad_listings:
+            keywords = rng.sample(KEYWORDS, min(args.keywords, len(KEYWORDS)))
+            for period_start, period_end in periods:
+                for position, kw in enumerate(keywords, 1):
+                    impressions = rng.randint(100, 50000)
+                    clicks = int(impressions * rng.uniform(0.005, 0.05))
+                    orders = int(clicks * rng.uniform(0, 0.08))
+                    direct_orders = int(orders * rng.uniform(0.5, 1))
+                    ad = {
+                        "id": next_ad_id, "user_id": user_id, "store_id": sid, "product_id": pid, "campaign": kw,
+                        "spend": clicks * rng.randint(200, 900), "gmv": orders * price, "orders": orders,
+                        "impressions": impressions, "clicks": clicks,
+                        "ctr": clicks / impressions if impressions else 0.0,
+                        "direct_conversions": direct_orders, "items_sold": orders, "total_sales": 0,
+                        "start_date": period_start, "end_date": period_end,
+                    }
+                    fact = {
+                        "ad_id": next_ad_id, "user_id": user_id, "keyword_id": keyword_ids[kw],
+                        "match_type": rng.choice(["Broad Match", "Exact Match"]), "bidding_mode": "Manual",
+                        "position": position, "avg_rank": round(rng.uniform(1, 30), 1),
+                        "direct_orders": direct_orders, "direct_items_sold": direct_orders,
+                        "direct_gmv": direct_orders * price,
+                    }
+                    fact.update({k: ad[k] for k in (
+                        "store_id", "product_id", "start_date", "end_date",
+                        "impressions", "clicks", "orders", "items_sold", "gmv", "spend"
+                    )})
+                    next_ad_id += 1
+                    yield ad, fact
+
+    for batch in _chunks(ad_rows(), args.chunk):
+        _bulk_insert(conn, models.Ad, (ad for ad, _ in batch), args.chunk, counts)
+        _bulk_insert(conn, models.AdKeywordFact, (fact for _, fact in batch), args.chunk, counts)
+    return next_sp_id, next_ad_id
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate bulk synthetic data for load testing and index tuning")
+    parser.add_argument("--users", type=int, default=1)
+    parser.add_argument("--stores", type=int, default=2, help="Stores per user")
+    parser.add_argument("--products", type=int, default=200, help="Products per user (listed in every store)")
+    parser.add_argument("--materials", type=int, default=300, help="Materials per user")
+    parser.add_argument("--bom-min", type=int, default=5)
+    parser.add_argument("--bom-max", type=int, default=50)
+    parser.add_argument("--days", type=int, default=365, help="Days of daily performance history")
+    parser.add_argument("--end-date", type=date.fromisoformat, default=date.today())
+    parser.add_argument("--product-perf-ratio", type=float, default=1.0, help="Share of listings with daily ProductPerformance")
+    parser.add_argument("--ads-ratio", type=float, default=0.5, help="Share of listings with ads")
+    parser.add_argument("--ads-period-days", type=int, default=30, help="Length of one ads report period")
+    parser.add_argument("--keywords", type=int, default=6, help="Keyword rows per ads report")
+    parser.add_argument("--chunk", type=int, default=10000, help="Rows per executemany batch")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--analyze", action="store_true", help="Run ANALYZE after loading (for index tuning)")
+    args = parser.parse_args(argv)
+
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(args.seed)
+    is_sqlite = engine.dialect.name == "sqlite"
+
+    with engine.connect() as conn:
+        existing = conn.execute(select(func.count()).select_from(models.User.__table__).where(
+            models.User.email.like("loadtest%@example.com"))).scalar()
+        next_sp_id = (conn.execute(select(func.max(models.StoreProduct.id))).scalar() or 0) + 1
+        next_ad_id = (conn.execute(select(func.max(models.Ad.id))).scalar() or 0) + 1
+
+    print(f"Creating {args.users} load-test users (password: {LOADTEST_PASSWORD})...")
+    user_ids = _create_users(args.users, existing)
+
+    counts = {}
+    started = time.perf_counter()
+    for n, user_id in enumerate(user_ids, 1):
+        with engine.begin() as conn:
+            if is_sqlite:
+                conn.exec_driver_sql("PRAGMA synchronous = OFF")
+            next_sp_id, next_ad_id = generate_user(conn, user_id, args, rng, next_sp_id, next_ad_id, counts)
+        _rebuild_economics(user_id, counts)
+        elapsed = time.perf_counter() - started
+        total = sum(v for k, v in counts.items() if not k.startswith("_"))
+        print(f"  user {n}/{len(user_ids)} (id={user_id}) done: {total:,} rows, {total / elapsed:,.0f} rows/s")
+
+    with engine.begin() as conn:
+        if engine.dialect.name == "postgresql":
+            # Ids were assigned client-side; move the sequence past them
+            for table in ("store_products", "ads"):
+                conn.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT MAX(id) FROM {table}))"
+                ))
+        if args.analyze:
+            print("Running ANALYZE...")
+            conn.execute(text("ANALYZE"))
+
+    print("Rows generated:")
+    for table, n in counts.items():
+        if table.startswith("_"):
+            continue
+        secs = counts["_seconds"][table]
+        print(f"  {table:35s} {n:>12,}  ({n / secs if secs else 0:,.0f} rows/s)")
+    print(f"Total time: {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
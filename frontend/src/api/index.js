@@ -38,14 +38,18 @@ export const authApi = {
 
 export const materialsApi = {
   getAll: () => api.get("/materials"),
+  search: (params) => api.get("/materials/search", { params }),
   getById: (id) => api.get(`/materials/${id}`),
   create: (data) => api.post("/materials", data),
   update: (id, data) => api.put(`/materials/${id}`, data),
   delete: (id) => api.delete(`/materials/${id}`),
+  priceImpact: (id, data) => api.post(`/materials/${id}/price-impact`, data),
+  usage: (id) => api.get(`/materials/${id}/usage`),
 };
 
 export const productsApi = {
   getAll: () => api.get("/products"),
+  search: (params) => api.get("/products/search", { params }),
   getById: (id) => api.get(`/products/${id}`),
   create: (data) => api.post("/products", data),
   update: (id, data) => api.put(`/products/${id}`, data),
@@ -118,6 +122,7 @@ export const storeProductMarketplaceCostsApi = {
     }),
   create: (data) => api.post("/store-product-marketplace-costs", data),
   update: (id, data) => api.put(`/store-product-marketplace-costs/${id}`, data),
+  bulkUpdate: (data) => api.put("/store-product-marketplace-costs/bulk", data),
   delete: (id) => api.delete(`/store-product-marketplace-costs/${id}`),
 };
 
@@ -130,36 +135,130 @@ export const discountsApi = {
 
 export const decisionApi = {
   get: (storeId, productId) => api.get(`/decision/${storeId}/${productId}`),
+  trend: (storeId, productId, params) =>
+    api.get(`/decision/${storeId}/${productId}/trend`, { params }),
+};
+
+// Import dengan progres: membaca Server-Sent Events dari endpoint import (?stream=true).
+// Hasil akhir sama dengan axios: resolve { data }, reject { response: { status, data: { detail } } }
+const streamImport = async (path, formData, onProgress) => {
+  const token = localStorage.getItem("token");
+  const resp = await fetch(`${api.defaults.baseURL}${path}?stream=true`, {
+    method: "POST",
+    body: formData,
+    headers: token ? { Authorization: `Bearer ${token}` } : {},
+  });
+  if (!resp.ok) {
+    const data = await resp.json().catch(() => ({}));
+    throw { response: { status: resp.status, data } };
+  }
+
+  const reader = resp.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+    let end;
+    while ((end = buffer.indexOf("\n\n")) !== -1) {
+      const block = buffer.slice(0, end);
+      buffer = buffer.slice(end + 2);
+      let event = "message";
+      let data = "";
+      for (const line of block.split("\n")) {
+        if (line.startsWith("event: ")) event = line.slice(7);
+        else if (line.startsWith("data: ")) data += line.slice(6);
+      }
+      if (!data) continue; // keep-alive
+      const payload = JSON.parse(data);
+      if (event === "complete") return { data: payload };
+      if (event === "error") {
+        throw { response: { status: payload.status_code, data: { detail: payload.detail } } };
+      }
+      onProgress({ event, ...payload });
+    }
+  }
+  throw { response: { data: { detail: "Koneksi terputus sebelum import selesai." } } };
 };
 
 export const importsApi = {
-  importShopeeSales: (storeId, file) => {
+  importShopeeSales: (storeId, file, onProgress) => {
     const formData = new FormData();
     formData.append("store_id", storeId);
     formData.append("file", file);
+    if (onProgress) return streamImport("/imports/shopee-sales", formData, onProgress);
     return api.post("/imports/shopee-sales", formData, {
       headers: { "Content-Type": "multipart/form-data" },
     });
   },
-  importShopeeProductSales: (storeId, file) => {
+  importShopeeProductSales: (storeId, file, onProgress) => {
     const formData = new FormData();
     formData.append("store_id", storeId);
     formData.append("file", file);
+    if (onProgress) return streamImport("/imports/shopee-products", formData, onProgress);
     return api.post("/imports/shopee-products", formData, {
       headers: { "Content-Type": "multipart/form-data" },
     });
   },
-  importShopeeAds: (storeId, file) => {
+  importShopeeAds: (storeId, file, onProgress) => {
     const formData = new FormData();
     formData.append("store_id", storeId);
     formData.append("file", file);
+    if (onProgress) return streamImport("/imports/shopee-ads", formData, onProgress);
     return api.post("/imports/shopee-ads", formData, {
       headers: { "Content-Type": "multipart/form-data" },
     });
   },
+  importShopeeAdsBatch: (storeId, files, onProgress) => {
+    const formData = new FormData();
+    formData.append("store_id", storeId);
+    for (const file of files) {
+      formData.append("files", file);
+    }
+    if (onProgress) return streamImport("/imports/shopee-ads/batch", formData, onProgress);
+    return api.post("/imports/shopee-ads/batch", formData, {
+      headers: { "Content-Type": "multipart/form-data" },
+    });
+  },
+  importCatalog: ({ file, materialsFile, productsFile, bomFile, replaceBom = false, dryRun = false }) => {
+    const formData = new FormData();
+    if (file) formData.append("file", file);
+    if (materialsFile) formData.append("materials_file", materialsFile);
+    if (productsFile) formData.append("products_file", productsFile);
+    if (bomFile) formData.append("bom_file", bomFile);
+    formData.append("replace_bom", replaceBom);
+    formData.append("dry_run", dryRun);
+    return api.post("/imports/catalog", formData, {
+      headers: { "Content-Type": "multipart/form-data" },
+    });
+  },
   getPerformance: (params) => api.get("/imports/performance", { params }),
   getReports: (params) => api.get("/imports/reports", { params }),
   deleteReport: (id) => api.delete(`/imports/reports/${id}`),
+  reimportReport: (id) => api.post(`/imports/reports/${id}/reimport`),
+};
+
+export const analyticsApi = {
+  getStoreRolling: (params) => api.get("/analytics/store-performance/rolling", { params }),
+  getAdsRolling: (params) => api.get("/analytics/ads/rolling", { params }),
+};
+
+export const dashboardApi = {
+  getSummary: (params) => api.get("/dashboard/summary", { params }),
+};
+
+export const rankingsApi = {
+  adsProducts: (params) => api.get("/rankings/ads-products", { params }),
+  listings: (params) => api.get("/rankings/listings", { params }),
+  keywords: (params) => api.get("/rankings/keywords", { params }),
+};
+
+export const exportsApi = {
+  storePerformance: (params) =>
+    api.get("/exports/store-performance", { params, responseType: "blob" }),
+  ads: (params) => api.get("/exports/ads", { params, responseType: "blob" }),
+  pricing: (params) => api.get("/exports/pricing", { params, responseType: "blob" }),
 };
 
 export default api;
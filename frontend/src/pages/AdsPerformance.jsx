@@ -22,7 +22,7 @@ import {
   Upload,
   Loader
 } from 'lucide-react';
-import { storesApi, productsApi, adsApi, decisionApi, pricingApi, importsApi } from '../api';
+import { storesApi, productsApi, adsApi, decisionApi, pricingApi, importsApi, rankingsApi } from '../api';
 import { formatCurrency, formatNumber, formatRawPercent, formatDecimalPercent } from '../utils/formatters';
 
 const AdsPerformance = () => {
@@ -32,6 +32,7 @@ const AdsPerformance = () => {
   const [selectedProductId, setSelectedProductId] = useState('');
   
   const [adsData, setAdsData] = useState([]);
+  const [worstAds, setWorstAds] = useState([]); // Top produk iklan paling rugi (semua toko)
   const [decision, setDecision] = useState(null);
   const [loading, setLoading] = useState(false);
   
@@ -50,6 +51,7 @@ const AdsPerformance = () => {
   const [importStoreId, setImportStoreId] = useState('');
   const [importResult, setImportResult] = useState(null);
   const [importLoading, setImportLoading] = useState(false);
+  const [importProgress, setImportProgress] = useState(null);
 
   useEffect(() => {
     fetchInit();
@@ -58,8 +60,11 @@ const AdsPerformance = () => {
   const handleImportSubmit = async () => {
     if (!importFile || !importStoreId) return;
     setImportLoading(true);
+    setImportProgress(null);
     try {
-      const res = await importsApi.importShopeeAds(importStoreId, importFile);
+      const res = await importsApi.importShopeeAds(importStoreId, importFile, (ev) => {
+        if (ev.event === 'progress') setImportProgress({ total: ev.rows_total, processed: ev.rows_processed });
+      });
       setImportResult(res.data);
       // Refresh data if current view matches import store
       if (selectedStoreId === importStoreId) {
@@ -70,14 +75,20 @@ const AdsPerformance = () => {
       alert(error.response?.data?.detail || "Gagal mengimport file. Pastikan format sesuai.");
     } finally {
       setImportLoading(false);
+      setImportProgress(null);
     }
   };
 
   const fetchInit = async () => {
     try {
-      const [sData, pData] = await Promise.all([storesApi.getAll(), productsApi.getAll()]);
+      const [sData, pData, rData] = await Promise.all([
+        storesApi.getAll(),
+        productsApi.getAll(),
+        rankingsApi.adsProducts({ metric: 'ads_loss', limit: 10 })
+      ]);
       setStores(sData.data);
       setProducts(pData.data);
+      setWorstAds(rData.data);
     } catch (error) { console.error(error); }
   };
 
@@ -250,6 +261,43 @@ const AdsPerformance = () => {
           </div>
         </div>
 
+        {!decision && worstAds.length > 0 && (
+          <div className="glass-card" style={{ padding: '2rem', marginBottom: '2rem' }}>
+            <h3 style={{ marginBottom: '1.5rem', display: 'flex', alignItems: 'center', gap: '0.5rem' }}>
+              <ArrowDownRight size={20} color="#ef4444" />
+              Produk Iklan Paling Rugi
+            </h3>
+            <div className="table-container">
+              <table>
+                <thead>
+                  <tr>
+                    <th>Produk</th>
+                    <th>Toko</th>
+                    <th>Biaya Iklan</th>
+                    <th>Hasil (GMV)</th>
+                    <th>ROAS</th>
+                    <th>Rugi Iklan</th>
+                  </tr>
+                </thead>
+                <tbody>
+                  {worstAds.map(row => (
+                    <tr key={`${row.store_id}-${row.product_id}`} style={{ cursor: 'pointer' }}
+                      onClick={() => { setSelectedStoreId(row.store_id); setSelectedProductId(row.product_id); }}>
+                      <td style={{ fontWeight: '500' }}>{row.product_name || row.product_id}</td>
+                      <td>{stores.find(s => s.id === row.store_id)?.name || row.store_id}</td>
+                      <td>{formatCurrency(row.spend)}</td>
+                      <td>{formatCurrency(row.gmv)}</td>
+                      <td>{row.roas != null ? `${formatNumber(row.roas)}x` : '-'}</td>
+                      <td style={{ color: '#ef4444', fontWeight: '600' }}>{formatCurrency(row.ads_profit)}</td>
+                    </tr>
+                  ))}
+                </tbody>
+              </table>
+            </div>
+            <p style={{ fontSize: '0.8rem', color: '#94a3b8', marginTop: '1rem' }}>Klik baris untuk memilih produk, lalu jalankan Analisis Kelayakan.</p>
+          </div>
+        )}
+
         {decision && (
           <motion.div initial={{ opacity: 0, y: 20 }} animate={{ opacity: 1, y: 0 }}>
             {/* Main Decision Banner */}
@@ -664,7 +712,9 @@ const AdsPerformance = () => {
                 <button type="button" className="btn btn-secondary" style={{ flex: 1 }} onClick={() => setShowImportModal(false)}>tutup</button>
                 <button type="button" className="btn btn-primary" style={{ flex: 1, background: '#22c55e', borderColor: '#22c55e' }} onClick={handleImportSubmit} disabled={importLoading || !importFile || !importStoreId}>
                   {importLoading ? <Loader className="animate-spin" size={18} /> : <Upload size={18} />} 
-                  {importLoading ? ' Mengupload...' : ' Mulai Import'}
+                  {importLoading
+                    ? (importProgress?.total ? ` Memproses ${importProgress.processed}/${importProgress.total}...` : ' Mengupload...')
+                    : ' Mulai Import'}
                 </button>
               </div>
             </motion.div>
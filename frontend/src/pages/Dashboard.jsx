@@ -16,7 +16,7 @@ import {
   Zap,
   DollarSign
 } from 'lucide-react';
-import { materialsApi, productsApi, storesApi, importsApi } from '../api';
+import { dashboardApi } from '../api';
 import { formatCurrency, formatNumber, formatRawPercent, formatDecimalPercent } from '../utils/formatters';
 import { useNavigate } from 'react-router-dom';
 import { 
@@ -33,6 +33,7 @@ const Dashboard = () => {
   const navigate = useNavigate();
   const [stats, setStats] = useState({ materials: 0, products: 0, stores: 0 });
   const [performance, setPerformance] = useState([]);
+  const [summary, setSummary] = useState(null);
   const [health, setHealth] = useState({ status: 'loading', riskCount: 0, goodCount: 0 });
   const [loading, setLoading] = useState(true);
   
@@ -49,56 +50,16 @@ const Dashboard = () => {
 
   const fetchDashboardData = async () => {
     try {
-      // Parallel lighter fetch
-      const [mRes, pRes, sRes, perfRes] = await Promise.all([
-        materialsApi.getAll(),
-        productsApi.getAll(),
-        storesApi.getAll(),
-        importsApi.getPerformance({ 
-          start_date: new Date(Date.now() - 30 * 24 * 60 * 60 * 1000).toISOString().split('T')[0] 
-        })
-      ]);
+      // Counts, 30-day totals and setup issues in one request
+      const { data } = await dashboardApi.getSummary({ days: 30 });
 
-      setStats({
-        materials: mRes.data.length,
-        products: pRes.data.length,
-        stores: sRes.data.length
-      });
-
-      setPerformance(perfRes.data);
-
-      // Simple explicit rule-based check on loaded data
-      let risks = 0;
-      let good = 0;
-      const issues = [];
-
-      // Check Store Setup
-      if (sRes.data.length === 0) {
-        issues.push({ type: 'danger', msg: "Belum ada toko yang terhubung", link: '/marketplaces' });
-        risks++;
-      } else {
-        good++;
-      }
-
-      // Check for performance data
-      if (perfRes.data.length === 0) {
-        issues.push({ type: 'info', msg: "Belum ada data penjualan. Impor laporan Shopee untuk melihat analisis.", link: '/sales-import' });
-      }
-
-      // Check Products Setup (Approximation)
-      if (pRes.data.length === 0) {
-        issues.push({ type: 'warning', msg: "Belum ada produk yang didaftarkan", link: '/products' });
-        risks++;
-      } else {
-        good++;
-      }
-      
-      // Basic Health Logic
+      setStats(data.counts);
+      setSummary(data);
+      setPerformance(data.daily);
       setHealth({
-        status: risks > 0 ? 'needs_attention' : 'healthy',
-        riskCount: risks,
-        analysis: issues,
-        goodCount: good
+        status: data.status,
+        riskCount: data.issues.filter((issue) => issue.type !== 'info').length,
+        analysis: data.issues
       });
 
     } catch (error) {
@@ -108,14 +69,11 @@ const Dashboard = () => {
     }
   };
 
-  const totalRevenue = performance.reduce((acc, curr) => acc + curr.revenue, 0); // Net
-  const totalGross = performance.reduce((acc, curr) => acc + (curr.gross_revenue || curr.revenue), 0);
-  const totalOrders = performance.reduce((acc, curr) => acc + curr.orders, 0);
-  const avgConv = performance.length > 0 
-    ? performance.reduce((acc, curr) => acc + curr.conversion_rate, 0) / performance.length 
-    : 0;
-  
-  const cancelRate = totalGross > 0 ? (1 - (totalRevenue / totalGross)) : 0;
+  const totalRevenue = summary?.revenue ?? 0; // Net
+  const totalGross = summary?.gross_revenue ?? 0;
+  const totalOrders = summary?.orders ?? 0;
+  const avgConv = summary?.avg_conversion ?? 0;
+  const cancelRate = summary?.cancellation_rate ?? 0;
 
   const calculateQuickProfit = () => {
     const price = parseFloat(calcForm.price) || 0;
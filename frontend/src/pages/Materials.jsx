@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 // eslint-disable-next-line no-unused-vars
 import { motion, AnimatePresence } from 'framer-motion';
 import { 
@@ -14,12 +14,19 @@ import {
   Package,
   Info
 } from 'lucide-react';
-import { materialsApi, productsApi } from '../api';
+import { materialsApi } from '../api';
 import { formatCurrency, formatNumber } from '../utils/formatters';
 
+const PAGE_SIZE = 50;
+const SEARCH_DELAY_MS = 300;
+
 const Materials = () => {
-  const [materials, setMaterials] = useState([]);
+  // One page of search results
+  const [results, setResults] = useState({ items: [], total: 0 });
+  const searchRequest = useRef(0);
+  // Usage details per material, loaded when its usage badge is opened
   const [materialUsage, setMaterialUsage] = useState({});
+  const [openUsageId, setOpenUsageId] = useState(null);
   const [loading, setLoading] = useState(true);
   const [showModal, setShowModal] = useState(false);
   const [searchTerm, setSearchTerm] = useState('');
@@ -35,77 +42,52 @@ const Materials = () => {
   const [editingId, setEditingId] = useState(null);
 
   useEffect(() => {
-    fetchMaterials();
-  }, []);
+    const timer = setTimeout(() => fetchPage(0), SEARCH_DELAY_MS);
+    return () => clearTimeout(timer);
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [searchTerm]);
 
-  const fetchMaterials = async () => {
+  const fetchPage = async (offset) => {
+    // Responses of older searches are ignored
+    const request = ++searchRequest.current;
+    setLoading(true);
     try {
-      const [materialsRes, productsRes] = await Promise.all([
-        materialsApi.getAll(),
-        productsApi.getAll()
-      ]);
-      
-      setMaterials(materialsRes.data);
-      
-      // Build material usage map
-      const usageMap = {};
-      
-      console.log('Products data:', productsRes.data); // Debug log
-      
-      productsRes.data.forEach(product => {
-        // Check if product has bom_items (relationship) or bom (array)
-        const bomItems = product.bom_items || product.bom || [];
-        
-        console.log(`Product ${product.nama} BOM:`, bomItems); // Debug log
-        
-        if (Array.isArray(bomItems) && bomItems.length > 0) {
-          bomItems.forEach(bomItem => {
-            const materialId = bomItem.material_id;
-            
-            console.log(`  BOM Item:`, bomItem, `Material ID: ${materialId}`); // Detailed log
-            
-            if (!materialId) return; // Skip if no material_id
-            
-            if (!usageMap[materialId]) {
-              usageMap[materialId] = {
-                products: [],
-                avgContribution: 0,
-                totalContribution: 0,
-                count: 0
-              };
-            }
-            
-            usageMap[materialId].products.push({
-              name: product.nama,
-              contribution: 0
-            });
-            
-            // Calculate contribution if HPP exists
-            if (product.hpp && product.hpp > 0 && bomItem.biaya_bahan) {
-              const contribution = (bomItem.biaya_bahan / product.hpp) * 100;
-              usageMap[materialId].totalContribution += contribution;
-              usageMap[materialId].count += 1;
-              usageMap[materialId].products[usageMap[materialId].products.length - 1].contribution = contribution;
-            }
-          });
-        }
-      });
-      
-      // Calculate average contribution
-      Object.keys(usageMap).forEach(materialId => {
-        if (usageMap[materialId].count > 0) {
-          usageMap[materialId].avgContribution = usageMap[materialId].totalContribution / usageMap[materialId].count;
-        }
-      });
-      
-      console.log('Material usage map:', usageMap); // Debug log
-      console.log('Material usage map keys:', Object.keys(usageMap)); // Show all keys
-      
-      setMaterialUsage(usageMap);
+      const resp = await materialsApi.search({ q: searchTerm, limit: PAGE_SIZE, offset });
+      if (request !== searchRequest.current) return;
+      setResults(prev => ({
+        items: offset > 0 ? [...prev.items, ...resp.data.items] : resp.data.items,
+        total: resp.data.total
+      }));
     } catch (error) {
       console.error("Failed to fetch materials", error);
     } finally {
-      setLoading(false);
+      if (request === searchRequest.current) setLoading(false);
+    }
+  };
+
+  const fetchMaterials = () => {
+    // Usage details are reloaded when opened again
+    setMaterialUsage({});
+    setOpenUsageId(null);
+    return fetchPage(0);
+  };
+
+  const toggleUsage = async (materialId) => {
+    if (openUsageId === materialId) {
+      setOpenUsageId(null);
+      return;
+    }
+    setOpenUsageId(materialId);
+    if (materialUsage[materialId]) return;
+    try {
+      const resp = await materialsApi.usage(materialId);
+      const products = resp.data;
+      const avgContribution = products.length
+        ? products.reduce((sum, p) => sum + p.contribution_percent, 0) / products.length
+        : 0;
+      setMaterialUsage(prev => ({ ...prev, [materialId]: { products, avgContribution } }));
+    } catch (error) {
+      console.error("Failed to fetch material usage", error);
     }
   };
 
@@ -165,11 +147,6 @@ const Materials = () => {
     }
   };
 
-  const filteredMaterials = materials.filter(m => 
-    m.nama.toLowerCase().includes(searchTerm.toLowerCase()) || 
-    m.id.toLowerCase().includes(searchTerm.toLowerCase())
-  );
-
   return (
     <>
       <div className="animate-fade-in">
@@ -215,93 +192,124 @@ const Materials = () => {
               </tr>
             </thead>
             <tbody>
-              {loading ? (
+              {loading && results.items.length === 0 ? (
                 <tr><td colSpan="8" style={{ textAlign: 'center', padding: '3rem' }}>Memuat bahan baku...</td></tr>
-              ) : filteredMaterials.length === 0 ? (
+              ) : results.items.length === 0 ? (
                 <tr><td colSpan="8" style={{ textAlign: 'center', padding: '3rem' }}>Tidak ada bahan baku ditemukan.</td></tr>
-              ) : filteredMaterials.map(material => {
+              ) : results.items.map(material => {
                 const usage = materialUsage[material.id];
                 const isHighImpact = usage && usage.avgContribution > 20;
                 
-                // Debug log for each material
-                console.log(`Checking material ${material.id}:`, usage);
-                
                 return (
-                  <tr key={material.id}>
-                    <td style={{ fontWeight: '600', color: '#6366f1' }}>{material.id}</td>
-                    <td>
-                      <div style={{ display: 'flex', alignItems: 'center', gap: '0.5rem' }}>
-                        {isHighImpact && (
-                          <span title="Bahan ini berkontribusi signifikan terhadap HPP produk">
-                            <AlertTriangle size={16} color="#f59e0b" />
-                          </span>
-                        )}
-                        <span style={{ fontWeight: '500' }}>{material.nama}</span>
-                      </div>
-                    </td>
-                    <td title={material.harga_total}>{formatCurrency(material.harga_total)}</td>
-                    <td title={material.jumlah_unit}>{formatNumber(material.jumlah_unit)}</td>
-                    <td><span className="badge badge-info">{material.satuan}</span></td>
-                    <td style={{ fontWeight: '600' }}>
-                      <div style={{ display: 'flex', alignItems: 'center', gap: '0.5rem' }}>
-                        <span title={material.harga_satuan}>{formatCurrency(material.harga_satuan)}</span>
-                        {usage && usage.avgContribution > 0 && (
-                          <span 
-                            title={`Rata-rata menyumbang ${usage.avgContribution.toFixed(1)}% dari HPP produk`}
-                            style={{ cursor: 'help' }}
+                  <React.Fragment key={material.id}>
+                    <tr>
+                      <td style={{ fontWeight: '600', color: '#6366f1' }}>{material.id}</td>
+                      <td>
+                        <div style={{ display: 'flex', alignItems: 'center', gap: '0.5rem' }}>
+                          {isHighImpact && (
+                            <span title="Bahan ini berkontribusi signifikan terhadap HPP produk">
+                              <AlertTriangle size={16} color="#f59e0b" />
+                            </span>
+                          )}
+                          <span style={{ fontWeight: '500' }}>{material.nama}</span>
+                        </div>
+                      </td>
+                      <td title={material.harga_total}>{formatCurrency(material.harga_total)}</td>
+                      <td title={material.jumlah_unit}>{formatNumber(material.jumlah_unit)}</td>
+                      <td><span className="badge badge-info">{material.satuan}</span></td>
+                      <td style={{ fontWeight: '600' }}>
+                        <div style={{ display: 'flex', alignItems: 'center', gap: '0.5rem' }}>
+                          <span title={material.harga_satuan}>{formatCurrency(material.harga_satuan)}</span>
+                          {usage && usage.avgContribution > 0 && (
+                            <span 
+                              title={`Rata-rata menyumbang ${usage.avgContribution.toFixed(1)}% dari HPP produk`}
+                              style={{ cursor: 'help' }}
+                            >
+                              <Info size={14} color="#94a3b8" />
+                            </span>
+                          )}
+                        </div>
+                      </td>
+                      <td>
+                        {material.product_count > 0 ? (
+                          <button 
+                            type="button"
+                            onClick={() => toggleUsage(material.id)}
+                            title={usage ? `Dipakai di: ${usage.products.map(p => p.product_name).join(', ')}` : 'Lihat produk yang memakai bahan ini'}
+                            style={{ 
+                              display: 'inline-flex', 
+                              alignItems: 'center', 
+                              gap: '0.25rem',
+                              padding: '0.25rem 0.5rem',
+                              background: 'rgba(99, 102, 241, 0.1)',
+                              border: 'none',
+                              borderRadius: '6px',
+                              cursor: 'pointer'
+                            }}
                           >
-                            <Info size={14} color="#94a3b8" />
-                          </span>
+                            <Package size={14} color="#6366f1" />
+                            <span style={{ fontSize: '0.85rem', color: '#6366f1', fontWeight: '500' }}>
+                              {material.product_count} produk
+                            </span>
+                          </button>
+                        ) : (
+                          <span style={{ fontSize: '0.85rem', color: '#94a3b8' }}>Belum dipakai</span>
                         )}
-                      </div>
-                    </td>
-                    <td>
-                      {usage && usage.products.length > 0 ? (
-                        <div 
-                          title={`Dipakai di: ${usage.products.map(p => p.name).join(', ')}`}
-                          style={{ 
-                            display: 'inline-flex', 
-                            alignItems: 'center', 
-                            gap: '0.25rem',
-                            padding: '0.25rem 0.5rem',
-                            background: 'rgba(99, 102, 241, 0.1)',
-                            borderRadius: '6px',
-                            cursor: 'help'
-                          }}
-                        >
-                          <Package size={14} color="#6366f1" />
-                          <span style={{ fontSize: '0.85rem', color: '#6366f1', fontWeight: '500' }}>
-                            {usage.products.length} produk
-                          </span>
+                      </td>
+                      <td>
+                        <div style={{ display: 'flex', gap: '0.5rem' }}>
+                          <button 
+                            className="btn btn-secondary" 
+                            style={{ padding: '0.5rem' }} 
+                            onClick={() => handleDuplicate(material)}
+                            title="Duplikat bahan ini"
+                          >
+                            <Copy size={16} />
+                          </button>
+                          <button className="btn btn-secondary" style={{ padding: '0.5rem' }} onClick={() => handleOpenModal(material)}>
+                            <Edit2 size={16} />
+                          </button>
+                          <button className="btn btn-danger" style={{ padding: '0.5rem' }} onClick={() => handleDelete(material.id)}>
+                            <Trash2 size={16} />
+                          </button>
                         </div>
-                      ) : (
-                        <span style={{ fontSize: '0.85rem', color: '#94a3b8' }}>Belum dipakai</span>
-                      )}
-                    </td>
-                    <td>
-                      <div style={{ display: 'flex', gap: '0.5rem' }}>
-                        <button 
-                          className="btn btn-secondary" 
-                          style={{ padding: '0.5rem' }} 
-                          onClick={() => handleDuplicate(material)}
-                          title="Duplikat bahan ini"
-                        >
-                          <Copy size={16} />
-                        </button>
-                        <button className="btn btn-secondary" style={{ padding: '0.5rem' }} onClick={() => handleOpenModal(material)}>
-                          <Edit2 size={16} />
-                        </button>
-                        <button className="btn btn-danger" style={{ padding: '0.5rem' }} onClick={() => handleDelete(material.id)}>
-                          <Trash2 size={16} />
-                        </button>
-                      </div>
-                    </td>
-                  </tr>
+                      </td>
+                    </tr>
+                    {openUsageId === material.id && (
+                      <tr>
+                        <td colSpan="8" style={{ background: 'rgba(99, 102, 241, 0.05)', padding: '0.75rem 1.5rem' }}>
+                          {!usage ? (
+                            <span style={{ fontSize: '0.85rem', color: '#94a3b8' }}>Memuat produk...</span>
+                          ) : (
+                            <div style={{ display: 'flex', flexWrap: 'wrap', gap: '0.5rem' }}>
+                              {usage.products.map(p => (
+                                <span
+                                  key={p.product_id}
+                                  className="badge badge-info"
+                                  title={`${formatCurrency(p.biaya_bahan)} dari HPP ${formatCurrency(p.hpp)}`}
+                                >
+                                  {p.product_name} · {p.contribution_percent.toFixed(1)}% HPP
+                                </span>
+                              ))}
+                            </div>
+                          )}
+                        </td>
+                      </tr>
+                    )}
+                  </React.Fragment>
                 );
               })}
             </tbody>
           </table>
         </div>
+
+        {results.items.length < results.total && (
+          <div style={{ textAlign: 'center', marginTop: '1.5rem' }}>
+            <button className="btn btn-secondary" disabled={loading} onClick={() => fetchPage(results.items.length)}>
+              {loading ? 'Memuat...' : `Muat lebih banyak (${results.items.length} dari ${results.total})`}
+            </button>
+          </div>
+        )}
       </div>
 
       <AnimatePresence>
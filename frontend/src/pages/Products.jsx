@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 // eslint-disable-next-line no-unused-vars
 import { motion, AnimatePresence } from 'framer-motion';
 import { 
@@ -17,10 +17,18 @@ import {
 import { productsApi, bomApi, materialsApi, hppApi, extraCostsApi } from '../api';
 import { formatCurrency, formatNumber } from '../utils/formatters';
 
+const PAGE_SIZE = 50;
+const SEARCH_DELAY_MS = 300;
+
 const Products = () => {
+  // One page of search results; the full lists are only loaded for the BOM form
+  const [results, setResults] = useState({ items: [], total: 0 });
   const [products, setProducts] = useState([]);
   const [materials, setMaterials] = useState([]);
+  const [optionsLoaded, setOptionsLoaded] = useState(false);
   const [loading, setLoading] = useState(true);
+  const [editingProductId, setEditingProductId] = useState(null);
+  const searchRequest = useRef(0);
   const [showProductModal, setShowProductModal] = useState(false);
   const [showBOMModal, setShowBOMModal] = useState(false);
   const [selectedProduct, setSelectedProduct] = useState(null);
@@ -33,29 +41,52 @@ const Products = () => {
   const [hppData, setHppData] = useState(null);
 
   useEffect(() => {
-    fetchData();
-  }, []);
+    const timer = setTimeout(() => fetchPage(0), SEARCH_DELAY_MS);
+    return () => clearTimeout(timer);
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [searchTerm]);
 
-  const fetchData = async () => {
+  const fetchPage = async (offset) => {
+    // Responses of older searches are ignored
+    const request = ++searchRequest.current;
+    setLoading(true);
     try {
-      const [prods, mats] = await Promise.all([
-        productsApi.getAll(),
-        materialsApi.getAll()
-      ]);
-      setProducts(prods.data);
-      setMaterials(mats.data);
+      const resp = await productsApi.search({ q: searchTerm, limit: PAGE_SIZE, offset });
+      if (request !== searchRequest.current) return;
+      setResults(prev => ({
+        items: offset > 0 ? [...prev.items, ...resp.data.items] : resp.data.items,
+        total: resp.data.total
+      }));
     } catch (error) {
       console.error("Failed to fetch data", error);
     } finally {
-      setLoading(false);
+      if (request === searchRequest.current) setLoading(false);
     }
   };
 
+  const fetchData = async () => {
+    setOptionsLoaded(false);
+    await fetchPage(0);
+  };
+
+  const fetchOptions = async () => {
+    if (optionsLoaded) return;
+    const [prods, mats] = await Promise.all([
+      productsApi.getAll(),
+      materialsApi.getAll()
+    ]);
+    setProducts(prods.data);
+    setMaterials(mats.data);
+    setOptionsLoaded(true);
+  };
+
   const handleOpenProductModal = (product = null) => {
     if (product) {
       setProductForm({ id: product.id, nama: product.nama });
+      setEditingProductId(product.id);
     } else {
       setProductForm({ id: '', nama: '' });
+      setEditingProductId(null);
     }
     setShowProductModal(true);
   };
@@ -66,7 +97,8 @@ const Products = () => {
     try {
       const [bomResp, hppResp] = await Promise.all([
         bomApi.getByProduct(product.id),
-        hppApi.calculate(product.id)
+        hppApi.calculate(product.id),
+        fetchOptions()
       ]);
       setBomItems(bomResp.data);
       setHppData(hppResp.data);
@@ -81,8 +113,7 @@ const Products = () => {
   const handleProductSubmit = async (e) => {
     e.preventDefault();
     try {
-      const existing = products.find(p => p.id === productForm.id);
-      if (existing) {
+      if (editingProductId) {
         await productsApi.update(productForm.id, productForm);
       } else {
         await productsApi.create(productForm);
@@ -98,9 +129,14 @@ const Products = () => {
   const handleBOMSubmit = async (e) => {
     e.preventDefault();
     try {
+      // Options prefixed with "product:" are sub-assemblies (another product)
+      const [kind, componentId] = bomForm.material_id.startsWith('product:')
+        ? ['component_product_id', bomForm.material_id.slice('product:'.length)]
+        : ['material_id', bomForm.material_id];
       await bomApi.create({
         product_id: selectedProduct.id,
-        ...bomForm
+        [kind]: componentId,
+        qty: bomForm.qty
       });
       // Refresh BOM items and HPP
       const [bomResp, hppResp] = await Promise.all([
@@ -155,11 +191,6 @@ const Products = () => {
     }
   };
 
-  const filteredProducts = products.filter(p => 
-    p.nama.toLowerCase().includes(searchTerm.toLowerCase()) || 
-    p.id.toLowerCase().includes(searchTerm.toLowerCase())
-  );
-
   return (
     <>
       <div className="animate-fade-in">
@@ -191,11 +222,11 @@ const Products = () => {
         </div>
 
         <div style={{ display: 'grid', gridTemplateColumns: 'repeat(auto-fill, min_max(350px, 1fr))', gap: '1.5rem' }}>
-          {loading && products.length === 0 ? (
+          {loading && results.items.length === 0 ? (
             <div style={{ textAlign: 'center', gridColumn: '1/-1', padding: '3rem' }}>Memuat produk...</div>
-          ) : filteredProducts.length === 0 ? (
+          ) : results.items.length === 0 ? (
             <div style={{ textAlign: 'center', gridColumn: '1/-1', padding: '3rem' }}>Tidak ada produk ditemukan.</div>
-          ) : filteredProducts.map(product => (
+          ) : results.items.map(product => (
             <motion.div key={product.id} className="glass-card" style={{ padding: '1.5rem', display: 'flex', flexDirection: 'column' }}>
               <div style={{ display: 'flex', justifyContent: 'space-between', marginBottom: '1rem' }}>
                 <span className="badge badge-info">{product.id}</span>
@@ -225,6 +256,14 @@ const Products = () => {
             </motion.div>
           ))}
         </div>
+
+        {results.items.length < results.total && (
+          <div style={{ textAlign: 'center', marginTop: '1.5rem' }}>
+            <button className="btn btn-secondary" disabled={loading} onClick={() => fetchPage(results.items.length)}>
+              {loading ? 'Memuat...' : `Muat lebih banyak (${results.items.length} dari ${results.total})`}
+            </button>
+          </div>
+        )}
       </div>
 
       {/* Product Modal */}
@@ -240,7 +279,7 @@ const Products = () => {
                 <div className="form-group">
                   <label className="form-label">ID Produk (SKU Unik)</label>
                   <input type="text" className="form-control" placeholder="contoh: KAOS-O-HTM" value={productForm.id} 
-                    onChange={(e) => setProductForm({...productForm, id: e.target.value})} disabled={!!products.find(p => p.id === productForm.id) && showProductModal} required />
+                    onChange={(e) => setProductForm({...productForm, id: e.target.value})} disabled={!!editingProductId} required />
                 </div>
                 <div className="form-group">
                   <label className="form-label">Nama Produk</label>
@@ -281,9 +320,16 @@ const Products = () => {
                   <form onSubmit={handleBOMSubmit} style={{ display: 'flex', gap: '0.5rem', marginBottom: '1.5rem' }}>
                     <select className="form-control" style={{ flex: 2 }} value={bomForm.material_id} onChange={(e) => setBomForm({...bomForm, material_id: e.target.value})} required>
                       <option value="">Pilih Bahan</option>
-                      {materials.map(m => (
-                        <option key={m.id} value={m.id}>{m.nama} ({formatCurrency(m.harga_satuan)}/{m.satuan})</option>
-                      ))}
+                      <optgroup label="Bahan Baku">
+                        {materials.map(m => (
+                          <option key={m.id} value={m.id}>{m.nama} ({formatCurrency(m.harga_satuan)}/{m.satuan})</option>
+                        ))}
+                      </optgroup>
+                      <optgroup label="Sub-assembly (Produk)">
+                        {products.filter(p => p.id !== selectedProduct?.id).map(p => (
+                          <option key={p.id} value={`product:${p.id}`}>{p.nama}</option>
+                        ))}
+                      </optgroup>
                     </select>
                     <input type="number" step="0.01" className="form-control" style={{ flex: 1 }} placeholder="Qty" value={bomForm.qty} onChange={(e) => setBomForm({...bomForm, qty: e.target.value})} required />
                     <button type="submit" className="btn btn-primary" style={{ padding: '0 1rem' }}><Plus size={18} /></button>
@@ -303,8 +349,8 @@ const Products = () => {
                       <tbody>
                         {bomItems.map(item => (
                           <tr key={item.id}>
-                            <td>{item.material_nama}</td>
-                            <td>{formatNumber(item.qty)} {item.material_satuan}</td>
+                            <td>{item.material_nama || item.component_nama}</td>
+                            <td>{formatNumber(item.qty)} {item.material_satuan || 'pcs'}</td>
                             <td title={item.biaya_bahan}>{formatCurrency(item.biaya_bahan)}</td>
                             <td>
                               <button onClick={() => handleDeleteBOM(item.id)} style={{ background: 'none', border: 'none', color: '#ef4444', cursor: 'pointer' }}>
@@ -24,6 +24,7 @@ const Reports = () => {
   const [reportHistory, setReportHistory] = useState([]); // Uploaded files history
   const [loading, setLoading] = useState(false);
   const [result, setResult] = useState(null);
+  const [progress, setProgress] = useState(null); // Progres import (stream)
   const [error, setError] = useState(null);
   const [selectedReport, setSelectedReport] = useState(null);
 
@@ -53,7 +54,7 @@ const Reports = () => {
 
   const fetchReportHistory = useCallback(async () => {
     try {
-      const resp = await importsApi.getReports({ store_id: selectedStoreId });
+      const resp = await importsApi.getReports({ store_id: selectedStoreId, report_type: "shopee_sales" });
       setReportHistory(resp.data);
     } catch (err) {
        console.error("Gagal memuat histori laporan", err);
@@ -87,11 +88,17 @@ const Reports = () => {
     setLoading(true);
     setError(null);
     setResult(null);
+    setProgress(null);
+
+    const handleProgress = (ev) => {
+      if (ev.event === 'parsed') setProgress({ total: ev.rows, processed: 0 });
+      if (ev.event === 'progress') setProgress({ total: ev.rows_total, processed: ev.rows_processed });
+    };
 
     try {
       const apiCall = importMode === 'overview' 
-        ? importsApi.importShopeeSales(selectedStoreId, file)
-        : importsApi.importShopeeProductSales(selectedStoreId, file);
+        ? importsApi.importShopeeSales(selectedStoreId, file, handleProgress)
+        : importsApi.importShopeeProductSales(selectedStoreId, file, handleProgress);
         
       const resp = await apiCall;
       setResult(resp.data);
@@ -102,6 +109,7 @@ const Reports = () => {
       setError(err.response?.data?.detail || "Gagal mengimpor file. Pastikan format kolom sesuai.");
     } finally {
       setLoading(false);
+      setProgress(null);
     }
   };
 
@@ -126,7 +134,7 @@ const Reports = () => {
 
   const handleDeleteReport = async (id, e) => {
     e.stopPropagation(); // Mencegah modal terbuka
-    if (!window.confirm("Hapus histori laporan ini? Catatan: Ini hanya menghapus catatan histori upload agar file bisa di-upload ulang jika sebelumnya gagal.")) return;
+    if (!window.confirm("Hapus laporan ini? Semua data harian yang diimpor dari laporan ini ikut terhapus, dan file bisa di-upload ulang.")) return;
     
     try {
       await importsApi.deleteReport(id);
@@ -230,7 +238,9 @@ const Reports = () => {
               disabled={loading || !file}
             >
               {loading ? <RefreshCw className="animate-spin" /> : <CheckCircle2 size={18} />} 
-              {loading ? 'Sedang Memproses...' : 'Upload & Analisis'}
+              {loading
+                ? (progress?.total ? `Memproses ${progress.processed}/${progress.total} baris...` : 'Sedang Memproses...')
+                : 'Upload & Analisis'}
             </button>
           </form>
 